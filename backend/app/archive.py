@@ -0,0 +1,100 @@
+"""
+Cold archive for notifications and activity_history
+
+Rows older than the retention window are moved out of the hot collections
+by jobs/archive_cold_data into the archives collection. Each archive
+document holds a chunk of one user's rows for one month, BSON-encoded and
+zlib-compressed:
+
+    _id:        "<collection>:<_id of the first row in the chunk>"
+    collection: source collection name
+    user_id:    user id string
+    month:      "YYYY-MM" of the rows' timestamps
+    count:      number of rows in the chunk
+    data:       BSON binary, zlib(bson({"rows": [...]}))
+
+Rows keep their original _id, so reading a month back merges chunks and
+drops duplicates left by an interrupted archiver run.
+
+Retention (days) is configured with NOTIFICATION_READ_TTL_DAYS (read
+notifications, TTL index on read_at), NOTIFICATION_ARCHIVE_DAYS and
+ACTIVITY_HISTORY_ARCHIVE_DAYS.
+"""
+import os
+import zlib
+from datetime import datetime
+from typing import Dict, List
+
+import bson
+from bson import Binary
+
+from app.database import ARCHIVES_COLLECTION, NOTIFICATIONS_COLLECTION, ACTIVITY_HISTORY_COLLECTION
+
+NOTIFICATION_READ_TTL_DAYS = int(os.getenv("NOTIFICATION_READ_TTL_DAYS", 30))
+NOTIFICATION_ARCHIVE_DAYS = int(os.getenv("NOTIFICATION_ARCHIVE_DAYS", 90))
+ACTIVITY_HISTORY_ARCHIVE_DAYS = int(os.getenv("ACTIVITY_HISTORY_ARCHIVE_DAYS", 180))
+
+# Archived collection -> (timestamp field, retention in days)
+ARCHIVED_COLLECTIONS: Dict[str, tuple] = {
+    NOTIFICATIONS_COLLECTION: ("created_at", NOTIFICATION_ARCHIVE_DAYS),
+    ACTIVITY_HISTORY_COLLECTION: ("timestamp", ACTIVITY_HISTORY_ARCHIVE_DAYS),
+}
+
+COMPRESSION_LEVEL = 6
+
+
+def month_key(timestamp: datetime) -> str:
+    """Archive month for a row timestamp"""
+    return timestamp.strftime("%Y-%m")
+
+
+def pack_rows(rows: List[dict]) -> Binary:
+    """Compress rows into an archive payload"""
+    return Binary(zlib.compress(bson.encode({"rows": rows}), COMPRESSION_LEVEL))
+
+
+def unpack_rows(data: bytes) -> List[dict]:
+    """Decompress an archive payload produced by pack_rows"""
+    return bson.decode(zlib.decompress(data))["rows"]
+
+
+def archive_document(collection: str, user_id: str, month: str, rows: List[dict]) -> dict:
+    """Build one archive chunk for a user's rows within one month"""
+    return {
+        "_id": f"{collection}:{rows[0]['_id']}",
+        "collection": collection,
+        "user_id": user_id,
+        "month": month,
+        "count": len(rows),
+        "data": pack_rows(rows),
+        "archived_at": datetime.utcnow()
+    }
+
+
+async def load_archived(db, collection: str, user_id: str, month: str) -> List[dict]:
+    """
+    Read back a user's archived rows for one month
+
+    Returns:
+        Rows sorted newest first by their timestamp field
+    """
+    time_field = ARCHIVED_COLLECTIONS[collection][0]
+    chunks = await db[ARCHIVES_COLLECTION].find(
+        {"collection": collection, "user_id": user_id, "month": month},
+        {"data": 1}
+    ).to_list(length=None)
+
+    rows = {}
+    for chunk in chunks:
+        for row in unpack_rows(chunk["data"]):
+            rows[row["_id"]] = row
+    return sorted(rows.values(), key=lambda row: (row[time_field], row["_id"]), reverse=True)
+
+
+async def archived_months(db, collection: str, user_id: str) -> List[str]:
+    """Months with archived rows for a user, newest first"""
+    months = await db[ARCHIVES_COLLECTION].distinct(
+        "month",
+        {"collection": collection, "user_id": user_id}
+    )
+    return sorted(months, reverse=True)
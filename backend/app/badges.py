@@ -0,0 +1,202 @@
+"""
+Event-driven badge engine
+
+Routes report domain events (log saved, community joined/created,
+recommendation completed) instead of scanning history. Each user has one
+small badge_progress document with counters and streak state; an event
+reads it, applies the change, evaluates the badge rules against the new
+state and writes it back with an optimistic version check, so every event
+costs O(1) regardless of history size.
+
+Newly earned badges are written as one batch: a user_badges insert_many,
+a single users $addToSet, and notifications queued on the batched writer.
+
+"Eco Champion", "Energy Saver" and "Zero Waste Hero" depend on period
+comparisons and are not evaluated here.
+"""
+import asyncio
+import time
+from datetime import date as date_type, datetime
+from enum import Enum
+from typing import Callable, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+from app.database import (
+    BADGES_COLLECTION,
+    BADGE_PROGRESS_COLLECTION,
+    USER_BADGES_COLLECTION,
+    USERS_COLLECTION
+)
+from app.notifier import notification_writer
+
+MAX_RETRIES = 5
+BADGE_CACHE_SECONDS = 300
+
+PUBLIC_TRANSPORT_MODES = {"Bus", "Train", "Subway/Metro"}
+
+
+class BadgeEvent(str, Enum):
+    log_saved = "log_saved"
+    community_joined = "community_joined"
+    community_created = "community_created"
+    recommendation_completed = "recommendation_completed"
+
+
+BADGE_RULES: Dict[str, Callable[[dict], bool]] = {
+    "First Steps": lambda p: p.get("logged_days", 0) >= 1,
+    "Week Warrior": lambda p: p.get("current_streak", 0) >= 7,
+    "100-Day Streak": lambda p: p.get("current_streak", 0) >= 100,
+    "Green Commuter": lambda p: p.get("public_transport_trips", 0) >= 10,
+    "Team Player": lambda p: p.get("communities_joined", 0) >= 3,
+    "Community Founder": lambda p: p.get("communities_created", 0) >= 1,
+}
+
+
+def _apply_log_saved(progress: dict, data: dict) -> None:
+    log_date = date_type.fromisoformat(data["date"])
+    last = progress.get("last_log_date")
+
+    progress["logged_days"] = progress.get("logged_days", 0) + 1
+    progress["public_transport_trips"] = progress.get("public_transport_trips", 0) + sum(
+        1 for mode in data.get("transport_modes", []) if mode in PUBLIC_TRANSPORT_MODES
+    )
+
+    if last is None:
+        progress["current_streak"] = 1
+    else:
+        gap = (log_date - date_type.fromisoformat(last)).days
+        if gap == 1:
+            progress["current_streak"] = progress.get("current_streak", 0) + 1
+        elif gap > 1:
+            progress["current_streak"] = 1
+        else:
+            # Backfilled or same-day log: streak state is anchored on the latest date
+            return
+
+    progress["last_log_date"] = log_date.isoformat()
+    progress["longest_streak"] = max(progress.get("longest_streak", 0), progress["current_streak"])
+
+
+def apply_event(progress: dict, event: BadgeEvent, data: dict) -> dict:
+    """Return the progress document after applying one event"""
+    progress = dict(progress)
+
+    if event == BadgeEvent.log_saved:
+        _apply_log_saved(progress, data)
+    elif event == BadgeEvent.community_joined:
+        progress["communities_joined"] = progress.get("communities_joined", 0) + 1
+    elif event == BadgeEvent.community_created:
+        progress["communities_created"] = progress.get("communities_created", 0) + 1
+    elif event == BadgeEvent.recommendation_completed:
+        progress["recommendations_completed"] = progress.get("recommendations_completed", 0) + 1
+
+    return progress
+
+
+class BadgeCatalogue:
+    """
+    Cached badge name -> id mapping (badges are seeded by init_db.py)
+
+    An empty result is not cached, so badges seeded after the first event
+    are picked up; a loaded mapping is re-read every CACHE_SECONDS.
+    """
+
+    def __init__(self):
+        self._ids: Optional[Dict[str, str]] = None
+        self._loaded_at = 0.0
+
+    async def ids(self, db) -> Dict[str, str]:
+        if self._ids is None or time.monotonic() - self._loaded_at >= BADGE_CACHE_SECONDS:
+            badges = await db[BADGES_COLLECTION].find({}, {"name": 1}).to_list(length=None)
+            ids = {badge["name"]: str(badge["_id"]) for badge in badges}
+            if not ids:
+                return ids
+            self._ids = ids
+            self._loaded_at = time.monotonic()
+        return self._ids
+
+
+badge_catalogue = BadgeCatalogue()
+
+
+async def _award(db, user_id: str, badge_names: List[str]) -> None:
+    """Write awards, the users.badges update and notifications in one batch"""
+    ids = await badge_catalogue.ids(db)
+    awarded = [(name, ids[name]) for name in badge_names if name in ids]
+    if not awarded:
+        return
+
+    now = datetime.utcnow()
+    notification_writer.send_many(
+        {
+            "user_id": user_id,
+            "type": "achievement",
+            "title": "New Badge Earned!",
+            "message": f"You earned the {name} badge!",
+            "read": False,
+            "created_at": now
+        }
+        for name, _ in awarded
+    )
+    await asyncio.gather(
+        db[USER_BADGES_COLLECTION].insert_many(
+            [{"user_id": user_id, "badge_id": badge_id, "earned_at": now} for _, badge_id in awarded],
+            ordered=False
+        ),
+        db[USERS_COLLECTION].update_one(
+            {"_id": ObjectId(user_id)},
+            {"$addToSet": {"badges": {"$each": [badge_id for _, badge_id in awarded]}}}
+        )
+    )
+
+
+async def _previously_awarded(db, user_id: str) -> List[str]:
+    """Badge names already on the user document, for users without a progress document yet"""
+    user = await db[USERS_COLLECTION].find_one({"_id": ObjectId(user_id)}, {"badges": 1})
+    if not user or not user.get("badges"):
+        return []
+    names = {badge_id: name for name, badge_id in (await badge_catalogue.ids(db)).items()}
+    return [names[badge_id] for badge_id in user["badges"] if badge_id in names]
+
+
+async def handle_event(db, user_id: str, event: BadgeEvent, **data) -> List[str]:
+    """
+    Apply a domain event to the user's badge progress and award new badges
+
+    Returns:
+        Names of badges earned by this event
+    """
+    for _ in range(MAX_RETRIES):
+        current = await db[BADGE_PROGRESS_COLLECTION].find_one({"_id": user_id})
+        version = current.get("version", 0) if current else 0
+        awarded = current.get("awarded", []) if current else await _previously_awarded(db, user_id)
+
+        progress = apply_event(current or {"_id": user_id}, event, data)
+        earned = [name for name, rule in BADGE_RULES.items() if name not in awarded and rule(progress)]
+        progress.update({
+            "awarded": awarded + earned,
+            "version": version + 1,
+            "updated_at": datetime.utcnow()
+        })
+
+        try:
+            result = await db[BADGE_PROGRESS_COLLECTION].replace_one(
+                {"_id": user_id, "version": version},
+                progress,
+                upsert=current is None
+            )
+        except DuplicateKeyError:
+            # Progress document was created concurrently
+            continue
+
+        if current is None or result.matched_count:
+            break
+    else:
+        print(f"⚠️  Gave up updating badge progress for {user_id} after {MAX_RETRIES} attempts")
+        return []
+
+    if earned:
+        await _award(db, user_id, earned)
+    return earned
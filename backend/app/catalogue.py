@@ -0,0 +1,110 @@
+"""
+Recommendation catalogue cache
+
+The catalogue is seeded once and served from an immutable in-memory
+snapshot. Default recommendations registered with set_defaults() are
+seeded the first time an empty catalogue is loaded, so no startup hook is
+needed (router-level startup handlers do not run under a lifespan).
+
+A single version document is bumped whenever the catalogue changes;
+workers re-check it at most every REFRESH_INTERVAL_SECONDS and only
+reload the collection when the version has moved.
+"""
+import asyncio
+import os
+import time
+from datetime import datetime
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from app.models import Recommendation
+from app.database import get_database, RECOMMENDATIONS_COLLECTION, CATALOGUE_VERSIONS_COLLECTION
+
+CATALOGUE_KEY = "recommendations"
+REFRESH_INTERVAL_SECONDS = float(os.getenv("CATALOGUE_REFRESH_SECONDS", 30))
+
+
+class CatalogueSnapshot:
+    """Immutable view of the recommendation catalogue at one version"""
+    __slots__ = ("version", "items", "by_id")
+
+    def __init__(self, version: int, items: Tuple[Recommendation, ...]):
+        self.version = version
+        self.items = items
+        self.by_id: Mapping[str, Recommendation] = MappingProxyType({rec.id: rec for rec in items})
+
+
+class RecommendationCatalogue:
+    """Process-wide holder for the current catalogue snapshot"""
+
+    def __init__(self):
+        self._snapshot: Optional[CatalogueSnapshot] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+        self._defaults: Tuple[dict, ...] = ()
+
+    def set_defaults(self, recommendations) -> None:
+        """Recommendations to seed when the catalogue is found empty"""
+        self._defaults = tuple(recommendations)
+
+    async def seed(self, recommendations) -> None:
+        """Insert missing recommendations (matched by title) without duplicating existing ones"""
+        db = get_database()
+
+        result = await db[RECOMMENDATIONS_COLLECTION].bulk_write(
+            [
+                UpdateOne({"title": rec["title"]}, {"$setOnInsert": rec}, upsert=True)
+                for rec in recommendations
+            ],
+            ordered=False
+        )
+
+        if result.upserted_count:
+            await self.bump_version()
+            print(f"✅ Seeded {result.upserted_count} recommendations")
+
+    async def bump_version(self) -> None:
+        """Mark the catalogue as changed so every worker reloads it"""
+        db = get_database()
+        await db[CATALOGUE_VERSIONS_COLLECTION].update_one(
+            {"_id": CATALOGUE_KEY},
+            {"$inc": {"version": 1}, "$set": {"updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+        self._checked_at = 0.0
+
+    async def get(self) -> CatalogueSnapshot:
+        """Return the current snapshot, reloading only if the stored version changed"""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked_at < REFRESH_INTERVAL_SECONDS:
+            return snapshot
+
+        async with self._lock:
+            if self._snapshot is not None and time.monotonic() - self._checked_at < REFRESH_INTERVAL_SECONDS:
+                return self._snapshot
+
+            db = get_database()
+            version_doc = await db[CATALOGUE_VERSIONS_COLLECTION].find_one({"_id": CATALOGUE_KEY})
+            version = version_doc["version"] if version_doc else 0
+
+            if self._snapshot is None or self._snapshot.version != version:
+                docs = await db[RECOMMENDATIONS_COLLECTION].find({}).to_list(length=None)
+                if not docs and self._defaults:
+                    await self.seed(self._defaults)
+                    version_doc = await db[CATALOGUE_VERSIONS_COLLECTION].find_one({"_id": CATALOGUE_KEY})
+                    version = version_doc["version"] if version_doc else 0
+                    docs = await db[RECOMMENDATIONS_COLLECTION].find({}).to_list(length=None)
+                for doc in docs:
+                    doc["_id"] = str(doc["_id"])
+                self._snapshot = CatalogueSnapshot(
+                    version,
+                    tuple(Recommendation(**doc) for doc in docs)
+                )
+
+            self._checked_at = time.monotonic()
+            return self._snapshot
+
+
+catalogue = RecommendationCatalogue()
@@ -3,11 +3,16 @@ from pymongo.server_api import ServerApi
 import os
 from dotenv import load_dotenv
 
+from db_utils.monitoring import client_options
+from db_utils.read_routing import PRIMARY, read_profiles
+
 load_dotenv()
 
 class Database:
     client: AsyncIOMotorClient = None
     db = None
+    # Database handles with the read preference/concern of each read profile
+    profiles = {}
 
 db = Database()
 
@@ -16,9 +21,13 @@ async def connect_to_mongo():
     try:
         db.client = AsyncIOMotorClient(
             os.getenv("MONGODB_URL", "mongodb://localhost:27017"),
-            server_api=ServerApi('1')
+            server_api=ServerApi('1'),
+            **client_options()
         )
         db.db = db.client[os.getenv("DATABASE_NAME", "planetzero")]
+        db.profiles = {
+            name: db.db.with_options(**options) for name, options in read_profiles().items()
+        }
         
         # Test connection
         await db.client.admin.command('ping')
@@ -33,9 +42,11 @@ async def close_mongo_connection():
         db.client.close()
         print("✅ MongoDB connection closed")
 
-def get_database():
-    """Get database instance"""
-    return db.db
+def get_database(profile: str = PRIMARY):
+    """Get database instance for a read profile (db_utils/read_routing.py)"""
+    if profile == PRIMARY:
+        return db.db
+    return db.profiles[profile]
 
 # Collection names
 USERS_COLLECTION = "users"
@@ -47,3 +58,11 @@ BADGES_COLLECTION = "badges"
 USER_BADGES_COLLECTION = "user_badges"
 NOTIFICATIONS_COLLECTION = "notifications"
 DAILY_LOGS_COLLECTION = "daily_logs"
+CATALOGUE_VERSIONS_COLLECTION = "catalogue_versions"
+RECOMMENDATION_SUGGESTIONS_COLLECTION = "recommendation_suggestions"
+COMMUNITY_ROLLUPS_COLLECTION = "community_rollups"
+BADGE_PROGRESS_COLLECTION = "badge_progress"
+NOTIFICATION_COUNTERS_COLLECTION = "notification_counters"
+NOTIFICATION_EVENTS_COLLECTION = "notification_events"
+ACTIVITY_HISTORY_COLLECTION = "activity_history"
+ARCHIVES_COLLECTION = "archives"
@@ -0,0 +1,231 @@
+"""
+Notification event brokers
+
+Notification writers publish events here and the SSE endpoint
+(/api/notifications/stream) subscribes per user. Every broker fans events
+out to the subscribers connected to this process; they differ in how
+events travel between processes and how far back a client can resume
+with Last-Event-ID:
+
+- memory: single worker; keeps the last REPLAY_LIMIT events per user
+- mongo:  local stand-in for a shared broker (Redis, NATS, ...); events go
+          through a capped collection that every worker tails, so
+          subscribers on any worker see them and can resume from the
+          collection
+
+Select with NOTIFICATION_BROKER=memory|mongo (default: memory). Event ids
+are fixed-width hex strings. In-memory ids are a per-process epoch
+followed by a sequence number and compare in publish order; an id from
+another epoch (the worker restarted) replays every retained event. The
+mongo broker's ids are ObjectIds, which workers generate themselves and so
+do not order events across workers. That broker orders events by their
+position in the capped collection (insertion order) instead.
+"""
+import asyncio
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from bson import ObjectId
+from pymongo import CursorType
+
+from app.database import get_database, NOTIFICATION_EVENTS_COLLECTION
+
+REPLAY_LIMIT = 100
+SUBSCRIBER_QUEUE_SIZE = 100
+EVENTS_COLLECTION_BYTES = int(os.getenv("NOTIFICATION_EVENTS_BYTES", 16 * 1024 * 1024))
+
+
+class Event(NamedTuple):
+    id: str
+    user_id: str
+    data: dict
+
+
+class Subscription:
+    """One connected client's queue of events"""
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    async def next(self, timeout: float) -> Optional[Event]:
+        """Next event, or None if nothing arrived within `timeout` seconds"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class Broker(ABC):
+    """Publish/subscribe interface with local fan-out to subscribers"""
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[Subscription]] = defaultdict(set)
+
+    async def subscribe(self, user_id: str) -> Subscription:
+        await self.start()
+        subscription = Subscription(user_id)
+        self._subscribers[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.user_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.user_id]
+
+    def _dispatch(self, event: Event) -> None:
+        for subscription in self._subscribers.get(event.user_id, ()):
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow client: it will catch up through Last-Event-ID on reconnect
+                pass
+
+    async def start(self) -> None:
+        """Start background work (no-op by default)"""
+
+    async def stop(self) -> None:
+        """Stop background work (no-op by default)"""
+
+    @abstractmethod
+    async def publish_many(self, events: List[Tuple[str, dict]]) -> None:
+        """Publish [(user_id, data)] events"""
+
+    @abstractmethod
+    async def replay(self, user_id: str, last_event_id: str) -> List[Event]:
+        """Events for `user_id` published after `last_event_id` that are still retained"""
+
+
+class InMemoryBroker(Broker):
+    """Single-process broker"""
+
+    def __init__(self):
+        super().__init__()
+        self._epoch = f"{int(time.time() * 1000) & 0xFFFFFFFFFFFF:012x}"
+        self._sequence = 0
+        self._recent: Dict[str, Deque[Event]] = defaultdict(lambda: deque(maxlen=REPLAY_LIMIT))
+
+    async def publish_many(self, events: List[Tuple[str, dict]]) -> None:
+        for user_id, data in events:
+            self._sequence += 1
+            event = Event(f"{self._epoch}{self._sequence:012x}", user_id, data)
+            self._recent[user_id].append(event)
+            self._dispatch(event)
+
+    async def replay(self, user_id: str, last_event_id: str) -> List[Event]:
+        recent = list(self._recent.get(user_id, ()))
+        # An id from before a restart (or not ours at all) says nothing about
+        # what the client has seen from this process
+        current = f"{self._epoch}{self._sequence:012x}"
+        if len(last_event_id) != len(current) or not last_event_id.startswith(self._epoch) or last_event_id > current:
+            return recent
+        return [event for event in recent if event.id > last_event_id]
+
+
+class MongoBroker(Broker):
+    """Broker shared by all workers through a tailable capped collection"""
+
+    def __init__(self):
+        super().__init__()
+        self._tail_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._tail_task is not None and not self._tail_task.done():
+            return
+
+        db = get_database()
+        if NOTIFICATION_EVENTS_COLLECTION not in await db.list_collection_names():
+            try:
+                await db.create_collection(NOTIFICATION_EVENTS_COLLECTION, capped=True, size=EVENTS_COLLECTION_BYTES)
+            except Exception:
+                # Created concurrently by another worker
+                pass
+            await db[NOTIFICATION_EVENTS_COLLECTION].create_index(
+                [("user_id", 1), ("_id", 1)],
+                name="idx_user_id"
+            )
+
+        # Only events published from now on are dispatched
+        newest = await db[NOTIFICATION_EVENTS_COLLECTION].find_one({}, {"_id": 1}, sort=[("$natural", -1)])
+        after = newest["_id"] if newest else None
+        self._tail_task = asyncio.get_running_loop().create_task(self._tail(after))
+
+    async def stop(self) -> None:
+        if self._tail_task is not None:
+            self._tail_task.cancel()
+
+    async def _tail(self, after: Optional[ObjectId]) -> None:
+        """
+        Dispatch events in insertion order, starting after the event `after`
+
+        A tailable cursor scans the capped collection in natural (insertion)
+        order. After a reconnect the scan restarts from the oldest event and
+        skips up to the last dispatched one; if that event has aged out, the
+        first empty batch ends the skipping.
+        """
+        db = get_database()
+        while True:
+            cursor = db[NOTIFICATION_EVENTS_COLLECTION].find({}, cursor_type=CursorType.TAILABLE_AWAIT)
+            skipping = after is not None
+            try:
+                # An empty batch ends the async for, but the cursor keeps its position
+                while cursor.alive:
+                    async for doc in cursor:
+                        if skipping:
+                            skipping = doc["_id"] != after
+                            continue
+                        after = doc["_id"]
+                        self._dispatch(Event(str(doc["_id"]), doc["user_id"], doc["data"]))
+                    skipping = False
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️  Notification event tail interrupted: {e}")
+            await asyncio.sleep(0.5)
+
+    async def publish_many(self, events: List[Tuple[str, dict]]) -> None:
+        if not events:
+            return
+        await self.start()
+        db = get_database()
+        await db[NOTIFICATION_EVENTS_COLLECTION].insert_many(
+            [{"user_id": user_id, "data": data} for user_id, data in events],
+            ordered=True
+        )
+
+    async def replay(self, user_id: str, last_event_id: str) -> List[Event]:
+        if not ObjectId.is_valid(last_event_id):
+            return []
+        db = get_database()
+        # Record ids of a capped collection increase in insertion order
+        docs = await db[NOTIFICATION_EVENTS_COLLECTION].find(
+            {"user_id": user_id},
+            show_record_id=True
+        ).to_list(length=None)
+        docs.sort(key=lambda doc: doc["$recordId"])
+        ids = [doc["_id"] for doc in docs]
+        last_id = ObjectId(last_event_id)
+        # A last event that has aged out predates everything retained
+        start = ids.index(last_id) + 1 if last_id in ids else 0
+        return [Event(str(doc["_id"]), doc["user_id"], doc["data"]) for doc in docs[start:start + REPLAY_LIMIT]]
+
+
+BROKERS = {
+    "memory": InMemoryBroker,
+    "mongo": MongoBroker,
+}
+
+_broker: Optional[Broker] = None
+
+
+def get_broker() -> Broker:
+    """Process-wide broker selected by NOTIFICATION_BROKER"""
+    global _broker
+    if _broker is None:
+        _broker = BROKERS[os.getenv("NOTIFICATION_BROKER", "memory")]()
+    return _broker
@@ -194,6 +194,9 @@ class Notification(NotificationCreate):
     class Config:
         populate_by_name = True
 
+class NotificationIds(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=500)
+
 # Leaderboard Models
 class LeaderboardEntry(BaseModel):
     rank: int
@@ -0,0 +1,204 @@
+"""
+Batched notification writer and unread counters
+
+Routes hand notifications to `notification_writer` instead of inserting
+them one at a time. Documents queued within MAX_DELAY_SECONDS (or up to
+MAX_BATCH_SIZE) are written with one insert_many, and the per-user unread
+counters in notification_counters are bumped with one bulk_write.
+
+The unread counter is decremented by the notification routes on read,
+read-all and delete; jobs/reconcile_notification_counters repairs drift.
+Users from before the counters have no counter document: it is created
+from the notifications collection the first time the counter is read or
+adjusted, and increments never upsert a counter from zero.
+Written notifications are published to the event broker for SSE clients.
+
+Each step of a batch write is retried with exponential backoff on
+transient errors (network, failover, timeouts); a batch is only dropped,
+with an error logged, on errors that retrying cannot fix. Documents keep
+the _id assigned on the first attempt, so a retried insert skips the ones
+already written.
+"""
+import asyncio
+from collections import Counter
+from typing import Iterable, List, Optional
+
+from pymongo import UpdateOne
+from pymongo.errors import AutoReconnect, BulkWriteError, ExecutionTimeout, PyMongoError
+
+from app.database import get_database, NOTIFICATIONS_COLLECTION, NOTIFICATION_COUNTERS_COLLECTION
+from app.events import get_broker
+
+MAX_BATCH_SIZE = 500
+MAX_DELAY_SECONDS = 0.02
+MAX_WRITE_ATTEMPTS = 5
+RETRY_DELAY_SECONDS = 0.1
+DUPLICATE_KEY_CODE = 11000
+
+
+def _is_retryable(error: Exception) -> bool:
+    return isinstance(error, (AutoReconnect, ExecutionTimeout)) or (
+        isinstance(error, PyMongoError) and error.has_error_label("RetryableWriteError")
+    )
+
+
+async def _retry(operation, description: str):
+    """Await operation(), retrying transient errors with exponential backoff"""
+    for attempt in range(MAX_WRITE_ATTEMPTS):
+        try:
+            return await operation()
+        except Exception as e:
+            if not _is_retryable(e) or attempt == MAX_WRITE_ATTEMPTS - 1:
+                raise
+            delay = RETRY_DELAY_SECONDS * 2 ** attempt
+            print(f"⚠️  {description} failed ({e}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+async def _insert(db, batch: List[dict]) -> None:
+    """insert_many that treats documents written by an earlier attempt as done"""
+    try:
+        await db[NOTIFICATIONS_COLLECTION].insert_many(batch, ordered=False)
+    except BulkWriteError as e:
+        details = e.details
+        if details.get("writeConcernErrors") or any(
+            error["code"] != DUPLICATE_KEY_CODE for error in details.get("writeErrors", [])
+        ):
+            raise
+
+
+async def _initialize_counters(db, user_ids: List[str]) -> None:
+    """
+    Create missing counters from the current unread notifications
+
+    Call after the notification change has been written: the count already
+    includes it. $setOnInsert leaves counters created meanwhile untouched.
+    """
+    rows = await db[NOTIFICATIONS_COLLECTION].aggregate([
+        {"$match": {"user_id": {"$in": user_ids}, "read": False}},
+        {"$group": {"_id": "$user_id", "unread": {"$sum": 1}}}
+    ]).to_list(length=None)
+    unread = {row["_id"]: row["unread"] for row in rows}
+    await db[NOTIFICATION_COUNTERS_COLLECTION].bulk_write(
+        [
+            UpdateOne({"_id": user_id}, {"$setOnInsert": {"unread": unread.get(user_id, 0)}}, upsert=True)
+            for user_id in user_ids
+        ],
+        ordered=False
+    )
+
+
+async def adjust_unread(db, user_id: str, delta: int) -> None:
+    """Add `delta` to a user's unread counter, after the change is written"""
+    if delta:
+        result = await db[NOTIFICATION_COUNTERS_COLLECTION].update_one(
+            {"_id": user_id},
+            {"$inc": {"unread": delta}}
+        )
+        if not result.matched_count:
+            await _initialize_counters(db, [user_id])
+
+
+def event_payload(notification: dict) -> dict:
+    """JSON-safe representation of a stored notification for SSE clients"""
+    return {
+        "_id": str(notification["_id"]),
+        "user_id": notification["user_id"],
+        "type": notification["type"],
+        "title": notification["title"],
+        "message": notification["message"],
+        "read": notification.get("read", False),
+        "created_at": notification["created_at"].isoformat()
+    }
+
+
+async def get_unread(db, user_id: str) -> int:
+    """Read a user's unread counter, creating it on first read"""
+    counter = await db[NOTIFICATION_COUNTERS_COLLECTION].find_one({"_id": user_id})
+    if counter is None:
+        await _initialize_counters(db, [user_id])
+        counter = await db[NOTIFICATION_COUNTERS_COLLECTION].find_one({"_id": user_id})
+    return counter.get("unread", 0)
+
+
+class NotificationWriter:
+    """Coalesces notification inserts from concurrent requests"""
+
+    def __init__(self, max_batch_size: int = MAX_BATCH_SIZE, max_delay: float = MAX_DELAY_SECONDS):
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._pending: List[dict] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._full = asyncio.Event()
+
+    def send(self, notification: dict) -> None:
+        """Queue one notification document"""
+        self.send_many([notification])
+
+    def send_many(self, notifications: Iterable[dict]) -> None:
+        """Queue several notification documents"""
+        self._pending.extend(notifications)
+        if len(self._pending) >= self.max_batch_size:
+            self._full.set()
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        try:
+            await asyncio.wait_for(self._full.wait(), timeout=self.max_delay)
+        except asyncio.TimeoutError:
+            pass
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write every queued notification now"""
+        while self._pending:
+            batch = self._pending[:self.max_batch_size]
+            del self._pending[:self.max_batch_size]
+            if len(self._pending) < self.max_batch_size:
+                self._full.clear()
+            await self._write(batch)
+
+    async def _write(self, batch: List[dict]) -> None:
+        db = get_database()
+        counters = db[NOTIFICATION_COUNTERS_COLLECTION]
+        try:
+            await _retry(lambda: _insert(db, batch), f"Writing {len(batch)} notifications")
+
+            unread = Counter(doc["user_id"] for doc in batch if not doc.get("read", False))
+            if unread:
+                existing = set(await _retry(
+                    lambda: counters.distinct("_id", {"_id": {"$in": list(unread)}}),
+                    "Reading unread counters"
+                ))
+                if existing:
+                    await _retry(
+                        lambda: counters.bulk_write(
+                            [
+                                UpdateOne({"_id": user_id}, {"$inc": {"unread": count}})
+                                for user_id, count in unread.items() if user_id in existing
+                            ],
+                            ordered=False
+                        ),
+                        "Updating unread counters"
+                    )
+                missing = [user_id for user_id in unread if user_id not in existing]
+                if missing:
+                    await _retry(lambda: _initialize_counters(db, missing), "Creating unread counters")
+
+            await _retry(
+                lambda: get_broker().publish_many([(doc["user_id"], event_payload(doc)) for doc in batch]),
+                "Publishing notification events"
+            )
+        except Exception as e:
+            print(f"❌ Gave up writing {len(batch)} notifications: {e}")
+
+    async def close(self) -> None:
+        """Flush pending notifications; call on shutdown"""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._full.set()
+            await self._flush_task
+        await self.flush()
+
+
+notification_writer = NotificationWriter()
@@ -0,0 +1,51 @@
+"""
+Keyset pagination helpers
+
+Cursors are opaque URL-safe strings encoding the sort key of the last item
+on a page together with its _id, so the next page is a range query on an
+index instead of a skip.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Tuple
+
+from bson import ObjectId
+from fastapi import HTTPException, status
+
+MAX_PAGE_SIZE = 50
+
+
+def encode_cursor(value: Any, object_id) -> str:
+    """Encode (sort value, _id) of the last returned item"""
+    if isinstance(value, datetime):
+        payload = {"t": value.isoformat(), "id": str(object_id)}
+    else:
+        payload = {"v": value, "id": str(object_id)}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, ObjectId]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value = datetime.fromisoformat(payload["t"]) if "t" in payload else payload["v"]
+        return value, ObjectId(payload["id"])
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def keyset_filter(field: str, cursor: str, descending: bool = True) -> dict:
+    """Filter selecting items after the cursor for a (field, _id) sort in the given direction"""
+    value, object_id = decode_cursor(cursor)
+    op = "$lt" if descending else "$gt"
+    return {
+        "$or": [
+            {field: {op: value}},
+            {field: value, "_id": {op: object_id}}
+        ]
+    }
@@ -0,0 +1,117 @@
+"""
+Community footprint rollups
+
+One document per (community_id, period) holds the summed daily_logs of the
+community's current members, where period is "YYYY-MM" or "all". The
+documents are updated incrementally:
+
+- a member saves, edits or deletes a log -> the log's delta is applied to
+  every community they belong to
+- a user joins or leaves -> their per-month totals are added or removed
+
+average_emissions (total_emissions / log_count) is recomputed inside the
+same pipeline update, so the "greenest community" board is a single sorted
+read on the idx_period_average index.
+"""
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from pymongo import UpdateOne
+
+from app.database import (
+    COMMUNITY_ROLLUPS_COLLECTION,
+    COMMUNITY_MEMBERS_COLLECTION,
+    DAILY_LOGS_COLLECTION
+)
+
+ALL_TIME_PERIOD = "all"
+
+
+def period_for_date(date: str) -> str:
+    """Monthly period key for a YYYY-MM-DD log date"""
+    return date[:7]
+
+
+def _rollup_update(community_id: str, period: str, emissions_delta: float, logs_delta: int) -> UpdateOne:
+    """Pipeline update adding a delta and recomputing the average atomically"""
+    return UpdateOne(
+        {"community_id": community_id, "period": period},
+        [
+            {
+                "$set": {
+                    "total_emissions": {"$add": [{"$ifNull": ["$total_emissions", 0]}, emissions_delta]},
+                    "log_count": {"$add": [{"$ifNull": ["$log_count", 0]}, logs_delta]},
+                    "updated_at": datetime.utcnow()
+                }
+            },
+            {
+                "$set": {
+                    "average_emissions": {
+                        "$cond": [
+                            {"$gt": ["$log_count", 0]},
+                            {"$round": [{"$divide": ["$total_emissions", "$log_count"]}, 3]},
+                            "$$REMOVE"
+                        ]
+                    }
+                }
+            }
+        ],
+        upsert=True
+    )
+
+
+async def apply_log_delta(db, user_id: str, date: str, emissions_delta: float, logs_delta: int) -> None:
+    """Apply one daily log change to every community the user is a member of"""
+    memberships = await db[COMMUNITY_MEMBERS_COLLECTION].find(
+        {"user_id": user_id},
+        {"community_id": 1, "_id": 0}
+    ).to_list(length=None)
+
+    if not memberships:
+        return
+
+    period = period_for_date(date)
+    updates = []
+    for membership in memberships:
+        updates.append(_rollup_update(membership["community_id"], period, emissions_delta, logs_delta))
+        updates.append(_rollup_update(membership["community_id"], ALL_TIME_PERIOD, emissions_delta, logs_delta))
+
+    await db[COMMUNITY_ROLLUPS_COLLECTION].bulk_write(updates, ordered=False)
+
+
+async def _user_monthly_totals(db, user_id: str) -> List[Tuple[str, float, int]]:
+    """[(period, total emissions, log count)] for one user"""
+    cursor = db[DAILY_LOGS_COLLECTION].aggregate([
+        # Main-tree logs (total_emissions, no carbon_footprint) share the collection
+        {"$match": {"user_id": user_id, "carbon_footprint": {"$exists": True}}},
+        {
+            "$group": {
+                "_id": {"$substrCP": ["$date", 0, 7]},
+                "total_emissions": {"$sum": "$carbon_footprint"},
+                "log_count": {"$sum": 1}
+            }
+        }
+    ])
+    return [(row["_id"], row["total_emissions"], row["log_count"]) async for row in cursor]
+
+
+async def apply_membership_change(db, community_id: str, user_id: str, joined: bool) -> None:
+    """Add (joined=True) or remove a member's logs from a community's rollups"""
+    monthly = await _user_monthly_totals(db, user_id)
+    if not monthly:
+        return
+
+    sign = 1 if joined else -1
+    totals: Dict[str, list] = {ALL_TIME_PERIOD: [0.0, 0]}
+    for period, emissions, count in monthly:
+        totals[period] = [emissions, count]
+        totals[ALL_TIME_PERIOD][0] += emissions
+        totals[ALL_TIME_PERIOD][1] += count
+
+    await db[COMMUNITY_ROLLUPS_COLLECTION].bulk_write(
+        [
+            _rollup_update(community_id, period, sign * emissions, sign * count)
+            for period, (emissions, count) in totals.items()
+        ],
+        ordered=False
+    )
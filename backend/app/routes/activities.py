@@ -1,11 +1,17 @@
 from fastapi import APIRouter, HTTPException, status, Depends
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime
-from typing import List
+import asyncio
+from typing import List, Optional
 
 from app.models import DailyLogCreate, DailyLog, User
 from app.auth import get_current_active_user
-from app.database import get_database, DAILY_LOGS_COLLECTION, USERS_COLLECTION, NOTIFICATIONS_COLLECTION
+from app.rollups import apply_log_delta
+from app.badges import BadgeEvent, handle_event
+from app.notifier import notification_writer
+from app.database import get_database, DAILY_LOGS_COLLECTION, USERS_COLLECTION
 
 router = APIRouter()
 
@@ -52,57 +58,61 @@ async def create_daily_log(
     """Create a new daily log entry"""
     db = get_database()
     
-    # Check if log already exists for this date
-    existing_log = await db[DAILY_LOGS_COLLECTION].find_one({
-        "user_id": current_user.id,
-        "date": daily_log.date
-    })
-    
-    if existing_log:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Daily log already exists for {daily_log.date}"
-        )
-    
     # Calculate carbon footprint
     carbon_footprint = calculate_carbon_footprint(daily_log)
+    now = datetime.utcnow()
     
     # Create log document
     log_dict = daily_log.model_dump()
     log_dict.update({
         "user_id": current_user.id,
         "carbon_footprint": carbon_footprint,
-        "created_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow()
+        "created_at": now,
+        "updated_at": now
     })
     
-    # Insert log
-    result = await db[DAILY_LOGS_COLLECTION].insert_one(log_dict)
-    
-    # Update user's total emissions
-    await db[USERS_COLLECTION].update_one(
-        {"_id": ObjectId(current_user.id)},
-        {
-            "$inc": {"total_emissions": carbon_footprint, "points": 10},
-            "$set": {"updated_at": datetime.utcnow()}
-        }
-    )
+    # Insert log; the unique (user_id, date) index rejects duplicates
+    try:
+        await db[DAILY_LOGS_COLLECTION].insert_one(log_dict)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Daily log already exists for {daily_log.date}"
+        )
     
-    # Create notification for logging
-    await db[NOTIFICATIONS_COLLECTION].insert_one({
+    # Create notification (batched write)
+    notification_writer.send({
         "user_id": current_user.id,
         "type": "milestone",
         "title": "Daily Log Saved!",
         "message": f"Your carbon footprint for today: {carbon_footprint} kg CO2",
         "read": False,
-        "created_at": datetime.utcnow()
+        "created_at": now
     })
     
-    # Retrieve created log
-    created_log = await db[DAILY_LOGS_COLLECTION].find_one({"_id": result.inserted_id})
-    created_log["_id"] = str(created_log["_id"])
+    # Update user's total emissions, rollups and badges concurrently
+    await asyncio.gather(
+        db[USERS_COLLECTION].update_one(
+            {"_id": ObjectId(current_user.id)},
+            {
+                "$inc": {"total_emissions": carbon_footprint, "points": 10},
+                "$set": {"updated_at": now}
+            }
+        ),
+        apply_log_delta(db, current_user.id, daily_log.date, carbon_footprint, 1),
+        handle_event(
+            db,
+            current_user.id,
+            BadgeEvent.log_saved,
+            date=daily_log.date,
+            transport_modes=[t.mode.value for t in daily_log.transport]
+        )
+    )
+    
+    # insert_one filled in _id on the document we built
+    log_dict["_id"] = str(log_dict["_id"])
     
-    return DailyLog(**created_log)
+    return DailyLog(**log_dict)
 
 @router.get("/daily-logs", response_model=List[DailyLog])
 async def get_daily_logs(
@@ -154,46 +164,59 @@ async def update_daily_log(
     """Update a daily log"""
     db = get_database()
     
-    # Get existing log
-    existing_log = await db[DAILY_LOGS_COLLECTION].find_one({
-        "_id": ObjectId(log_id),
-        "user_id": current_user.id
-    })
-    
-    if not existing_log:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Daily log not found"
-        )
-    
     # Calculate new carbon footprint
     new_carbon = calculate_carbon_footprint(daily_log_update)
-    old_carbon = existing_log["carbon_footprint"]
-    carbon_diff = new_carbon - old_carbon
     
-    # Update log
+    # Update log, getting back the previous version for the emissions delta
     update_dict = daily_log_update.model_dump()
     update_dict.update({
         "carbon_footprint": new_carbon,
         "updated_at": datetime.utcnow()
     })
     
-    await db[DAILY_LOGS_COLLECTION].update_one(
-        {"_id": ObjectId(log_id)},
-        {"$set": update_dict}
-    )
+    # Moving the log to a day that is already logged hits the unique (user_id, date) index
+    try:
+        existing_log = await db[DAILY_LOGS_COLLECTION].find_one_and_update(
+            {
+                "_id": ObjectId(log_id),
+                "user_id": current_user.id
+            },
+            {"$set": update_dict},
+            return_document=ReturnDocument.BEFORE
+        )
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Daily log already exists for {daily_log_update.date}"
+        )
     
-    # Update user's total emissions
-    await db[USERS_COLLECTION].update_one(
-        {"_id": ObjectId(current_user.id)},
-        {
-            "$inc": {"total_emissions": carbon_diff},
-            "$set": {"updated_at": datetime.utcnow()}
-        }
-    )
+    if not existing_log:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Daily log not found"
+        )
+    
+    carbon_diff = new_carbon - existing_log["carbon_footprint"]
     
-    # Retrieve updated log
-    updated_log = await db[DAILY_LOGS_COLLECTION].find_one({"_id": ObjectId(log_id)})
+    # Update user's total emissions and community rollups
+    update_ops = [
+        db[USERS_COLLECTION].update_one(
+            {"_id": ObjectId(current_user.id)},
+            {
+                "$inc": {"total_emissions": carbon_diff},
+                "$set": {"updated_at": datetime.utcnow()}
+            }
+        )
+    ]
+    if daily_log_update.date == existing_log["date"]:
+        update_ops.append(apply_log_delta(db, current_user.id, existing_log["date"], carbon_diff, 0))
+    else:
+        update_ops.append(apply_log_delta(db, current_user.id, existing_log["date"], -existing_log["carbon_footprint"], -1))
+        update_ops.append(apply_log_delta(db, current_user.id, daily_log_update.date, new_carbon, 1))
+    await asyncio.gather(*update_ops)
+    
+    # Build the updated log from the previous version plus the applied changes
+    updated_log = {**existing_log, **update_dict}
     updated_log["_id"] = str(updated_log["_id"])
     
     return DailyLog(**updated_log)
@@ -206,8 +229,8 @@ async def delete_daily_log(
     """Delete a daily log"""
     db = get_database()
     
-    # Get existing log
-    existing_log = await db[DAILY_LOGS_COLLECTION].find_one({
+    # Delete log, getting back the removed document
+    existing_log = await db[DAILY_LOGS_COLLECTION].find_one_and_delete({
         "_id": ObjectId(log_id),
         "user_id": current_user.id
     })
@@ -218,31 +241,73 @@ async def delete_daily_log(
             detail="Daily log not found"
         )
     
-    # Delete log
-    await db[DAILY_LOGS_COLLECTION].delete_one({"_id": ObjectId(log_id)})
-    
-    # Update user's total emissions
-    await db[USERS_COLLECTION].update_one(
-        {"_id": ObjectId(current_user.id)},
-        {
-            "$inc": {"total_emissions": -existing_log["carbon_footprint"]},
-            "$set": {"updated_at": datetime.utcnow()}
-        }
+    # Update user's total emissions and community rollups
+    await asyncio.gather(
+        db[USERS_COLLECTION].update_one(
+            {"_id": ObjectId(current_user.id)},
+            {
+                "$inc": {"total_emissions": -existing_log["carbon_footprint"]},
+                "$set": {"updated_at": datetime.utcnow()}
+            }
+        ),
+        apply_log_delta(db, current_user.id, existing_log["date"], -existing_log["carbon_footprint"], -1)
     )
     
     return None
 
 @router.get("/stats")
-async def get_activity_stats(current_user: User = Depends(get_current_active_user)):
-    """Get user's activity statistics"""
+async def get_activity_stats(
+    current_user: User = Depends(get_current_active_user),
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+):
+    """Get user's activity statistics, optionally within a date range (YYYY-MM-DD, inclusive)"""
     db = get_database()
     
-    # Get all logs
-    logs = await db[DAILY_LOGS_COLLECTION].find(
-        {"user_id": current_user.id}
-    ).to_list(length=None)
+    # Build match on the (user_id, date) index; main-tree logs (total_emissions,
+    # no carbon_footprint) share the collection
+    match = {"user_id": current_user.id, "carbon_footprint": {"$exists": True}}
+    date_filter = {}
+    
+    if start_date:
+        try:
+            datetime.strptime(start_date, '%Y-%m-%d')
+            date_filter["$gte"] = start_date
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid start_date format. Use YYYY-MM-DD"
+            )
+    
+    if end_date:
+        try:
+            datetime.strptime(end_date, '%Y-%m-%d')
+            date_filter["$lte"] = end_date
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid end_date format. Use YYYY-MM-DD"
+            )
+    
+    if date_filter:
+        match["date"] = date_filter
+    
+    # Sum counters server-side; only one small document comes back
+    pipeline = [
+        {"$match": match},
+        {
+            "$group": {
+                "_id": None,
+                "total_logs": {"$sum": 1},
+                "total_emissions": {"$sum": "$carbon_footprint"},
+                "total_transport_activities": {"$sum": {"$size": {"$ifNull": ["$transport", []]}}},
+                "total_meals_logged": {"$sum": {"$size": {"$ifNull": ["$meals", []]}}}
+            }
+        }
+    ]
+    result = await db[DAILY_LOGS_COLLECTION].aggregate(pipeline).to_list(length=1)
     
-    if not logs:
+    if not result:
         return {
             "total_logs": 0,
             "total_emissions": 0.0,
@@ -251,14 +316,14 @@ async def get_activity_stats(current_user: User = Depends(get_current_active_use
             "total_meals_logged": 0
         }
     
-    total_emissions = sum(log["carbon_footprint"] for log in logs)
-    total_transport = sum(len(log["transport"]) for log in logs)
-    total_meals = sum(len(log["meals"]) for log in logs)
+    stats = result[0]
+    total_logs = stats["total_logs"]
+    total_emissions = stats["total_emissions"]
     
     return {
-        "total_logs": len(logs),
+        "total_logs": total_logs,
         "total_emissions": round(total_emissions, 2),
-        "average_daily_emissions": round(total_emissions / len(logs), 2),
-        "total_transport_activities": total_transport,
-        "total_meals_logged": total_meals
+        "average_daily_emissions": round(total_emissions / total_logs, 2),
+        "total_transport_activities": stats["total_transport_activities"],
+        "total_meals_logged": stats["total_meals_logged"]
     }
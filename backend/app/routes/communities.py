@@ -1,22 +1,29 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
 from bson import ObjectId
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 
 from app.models import Community, CommunityCreate, CommunityMember, CommunityRole, User
 from app.auth import get_current_active_user
+from app.pagination import MAX_PAGE_SIZE, encode_cursor, keyset_filter
+from app.rollups import ALL_TIME_PERIOD, apply_membership_change
+from app.badges import BadgeEvent, handle_event
+from app.notifier import notification_writer
 from app.database import (
     get_database, 
     COMMUNITIES_COLLECTION, 
     COMMUNITY_MEMBERS_COLLECTION,
     USERS_COLLECTION,
-    BADGES_COLLECTION,
-    USER_BADGES_COLLECTION,
-    NOTIFICATIONS_COLLECTION
+    COMMUNITY_ROLLUPS_COLLECTION
 )
+from db_utils.read_routing import ANALYTICS
 
 router = APIRouter()
 
+# Case-insensitive collation matching the idx_name_ci index
+NAME_COLLATION = {"locale": "en", "strength": 2}
+AUTOCOMPLETE_LIMIT = 10
+
 @router.post("/", response_model=Community, status_code=status.HTTP_201_CREATED)
 async def create_community(
     community: CommunityCreate,
@@ -47,41 +54,10 @@ async def create_community(
         "joined_at": datetime.utcnow()
     }
     await db[COMMUNITY_MEMBERS_COLLECTION].insert_one(member_data)
+    await apply_membership_change(db, community_id, current_user.id, joined=True)
     
     # Award "Community Founder" badge
-    founder_badge = await db[BADGES_COLLECTION].find_one({"name": "Community Founder"})
-    if founder_badge:
-        badge_id = str(founder_badge["_id"])
-        
-        # Check if user already has this badge
-        existing_badge = await db[USER_BADGES_COLLECTION].find_one({
-            "user_id": current_user.id,
-            "badge_id": badge_id
-        })
-        
-        if not existing_badge:
-            # Award badge
-            await db[USER_BADGES_COLLECTION].insert_one({
-                "user_id": current_user.id,
-                "badge_id": badge_id,
-                "earned_at": datetime.utcnow()
-            })
-            
-            # Update user's badges array
-            await db[USERS_COLLECTION].update_one(
-                {"_id": ObjectId(current_user.id)},
-                {"$addToSet": {"badges": badge_id}}
-            )
-            
-            # Create notification
-            await db[NOTIFICATIONS_COLLECTION].insert_one({
-                "user_id": current_user.id,
-                "type": "achievement",
-                "title": "New Badge Earned!",
-                "message": "You earned the Community Founder badge for creating a community!",
-                "read": False,
-                "created_at": datetime.utcnow()
-            })
+    await handle_event(db, current_user.id, BadgeEvent.community_created)
     
     # Retrieve created community
     created_community = await db[COMMUNITIES_COLLECTION].find_one({"_id": result.inserted_id})
@@ -91,31 +67,111 @@ async def create_community(
 
 @router.get("/", response_model=List[Community])
 async def get_communities(
+    response: Response,
     category: str = None,
     search: str = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get all communities with optional filters"""
+    """
+    Get communities with optional filters
+    
+    Without `search`, communities are listed newest first. With `search`,
+    results come from the text index ranked by relevance. Pass the
+    X-Next-Cursor response header back as `cursor` to get the next page.
+    """
     db = get_database()
     
-    # Build query
     query = {}
     if category:
         query["category"] = category
+    
     if search:
-        query["$or"] = [
-            {"name": {"$regex": search, "$options": "i"}},
-            {"description": {"$regex": search, "$options": "i"}}
+        query["$text"] = {"$search": search}
+        pipeline = [
+            {"$match": query},
+            {"$addFields": {"score": {"$meta": "textScore"}}}
         ]
-    
-    cursor = db[COMMUNITIES_COLLECTION].find(query).sort("created_at", -1)
-    communities = await cursor.to_list(length=None)
+        if cursor:
+            pipeline.append({"$match": keyset_filter("score", cursor)})
+        pipeline.extend([
+            {"$sort": {"score": -1, "_id": -1}},
+            {"$limit": limit + 1}
+        ])
+        communities = await db[COMMUNITIES_COLLECTION].aggregate(pipeline).to_list(length=limit + 1)
+        sort_field = "score"
+    else:
+        if cursor:
+            query.update(keyset_filter("created_at", cursor))
+        communities = await db[COMMUNITIES_COLLECTION].find(query).sort(
+            [("created_at", -1), ("_id", -1)]
+        ).limit(limit + 1).to_list(length=limit + 1)
+        sort_field = "created_at"
+    
+    if len(communities) > limit:
+        communities = communities[:limit]
+        last = communities[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last[sort_field], last["_id"])
     
     for comm in communities:
         comm["_id"] = str(comm["_id"])
     
     return [Community(**comm) for comm in communities]
 
+@router.get("/autocomplete")
+async def autocomplete_communities(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(AUTOCOMPLETE_LIMIT, ge=1, le=AUTOCOMPLETE_LIMIT),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get community names starting with `prefix` (case-insensitive)"""
+    db = get_database()
+    
+    # Range scan on the case-insensitive name index; U+FFFF sorts after every
+    # character in the ICU collation, closing the prefix range
+    cursor = db[COMMUNITIES_COLLECTION].find(
+        {"name": {"$gte": prefix, "$lt": prefix + "\uffff"}},
+        {"name": 1}
+    ).collation(NAME_COLLATION).sort("name", 1).limit(limit)
+    matches = await cursor.to_list(length=limit)
+    
+    return [{"id": str(comm["_id"]), "name": comm["name"]} for comm in matches]
+
+@router.get("/leaderboard")
+async def get_community_leaderboard(
+    period: str = Query(ALL_TIME_PERIOD, pattern=r"^(all|\d{4}-\d{2})$"),
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get greenest communities (lowest average emissions per member log) for a month (YYYY-MM) or all time"""
+    db = get_database(ANALYTICS)
+    
+    rollups = await db[COMMUNITY_ROLLUPS_COLLECTION].find(
+        {"period": period, "average_emissions": {"$gte": 0}}
+    ).sort("average_emissions", 1).limit(limit).to_list(length=limit)
+    
+    communities = await db[COMMUNITIES_COLLECTION].find(
+        {"_id": {"$in": [ObjectId(r["community_id"]) for r in rollups]}},
+        {"name": 1, "members_count": 1}
+    ).to_list(length=limit)
+    by_id = {str(comm["_id"]): comm for comm in communities}
+    
+    return [
+        {
+            "rank": idx,
+            "community_id": rollup["community_id"],
+            "name": by_id[rollup["community_id"]]["name"],
+            "members_count": by_id[rollup["community_id"]].get("members_count", 0),
+            "total_emissions": round(rollup["total_emissions"], 2),
+            "log_count": rollup["log_count"],
+            "average_emissions": rollup["average_emissions"]
+        }
+        for idx, rollup in enumerate(
+            (r for r in rollups if r["community_id"] in by_id), 1
+        )
+    ]
+
 @router.get("/my-communities", response_model=List[Community])
 async def get_my_communities(current_user: User = Depends(get_current_active_user)):
     """Get communities user is a member of"""
@@ -195,6 +251,7 @@ async def join_community(
         "joined_at": datetime.utcnow()
     }
     await db[COMMUNITY_MEMBERS_COLLECTION].insert_one(member_data)
+    await apply_membership_change(db, community_id, current_user.id, joined=True)
     
     # Update community member count
     await db[COMMUNITIES_COLLECTION].update_one(
@@ -211,8 +268,11 @@ async def join_community(
         {"$inc": {"points": 25}}
     )
     
+    # Badge progress ("Team Player")
+    await handle_event(db, current_user.id, BadgeEvent.community_joined)
+    
     # Create notification
-    await db[NOTIFICATIONS_COLLECTION].insert_one({
+    notification_writer.send({
         "user_id": current_user.id,
         "type": "community",
         "title": "Joined Community!",
@@ -255,6 +315,7 @@ async def leave_community(
         "community_id": community_id,
         "user_id": current_user.id
     })
+    await apply_membership_change(db, community_id, current_user.id, joined=False)
     
     # Update community member count
     await db[COMMUNITIES_COLLECTION].update_one(
@@ -270,27 +331,48 @@ async def leave_community(
 @router.get("/{community_id}/members")
 async def get_community_members(
     community_id: str,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get all members of a community"""
+    """
+    Get members of a community, oldest first
+    
+    Pass the X-Next-Cursor response header back as `cursor` to get the next page.
+    """
     db = get_database()
     
-    cursor = db[COMMUNITY_MEMBERS_COLLECTION].find({"community_id": community_id})
-    members = await cursor.to_list(length=None)
-    
-    # Get user details for each member
-    member_details = []
-    for member in members:
-        user = await db[USERS_COLLECTION].find_one({"_id": ObjectId(member["user_id"])})
-        if user:
-            member_details.append({
-                "user_id": member["user_id"],
-                "name": user["name"],
-                "role": member["role"],
-                "joined_at": member["joined_at"]
-            })
-    
-    return member_details
+    query = {"community_id": community_id}
+    if cursor:
+        query.update(keyset_filter("joined_at", cursor, descending=False))
+    
+    members = await db[COMMUNITY_MEMBERS_COLLECTION].find(query).sort(
+        [("joined_at", 1), ("_id", 1)]
+    ).limit(limit + 1).to_list(length=limit + 1)
+    
+    if len(members) > limit:
+        members = members[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(members[-1]["joined_at"], members[-1]["_id"])
+    
+    # Resolve all member names in one query
+    user_ids = [ObjectId(member["user_id"]) for member in members]
+    users = await db[USERS_COLLECTION].find(
+        {"_id": {"$in": user_ids}},
+        {"name": 1}
+    ).to_list(length=len(user_ids))
+    names = {str(user["_id"]): user["name"] for user in users}
+    
+    return [
+        {
+            "user_id": member["user_id"],
+            "name": names[member["user_id"]],
+            "role": member["role"],
+            "joined_at": member["joined_at"]
+        }
+        for member in members
+        if member["user_id"] in names
+    ]
 
 @router.put("/{community_id}/activities")
 async def update_community_activities(
@@ -5,6 +5,7 @@ from typing import List
 from app.models import LeaderboardEntry, User
 from app.auth import get_current_active_user
 from app.database import get_database, USERS_COLLECTION, BADGES_COLLECTION
+from db_utils.read_routing import ANALYTICS
 
 router = APIRouter()
 
@@ -14,7 +15,7 @@ async def get_leaderboard(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get leaderboard rankings"""
-    db = get_database()
+    db = get_database(ANALYTICS)
     
     # Get all users sorted by points
     cursor = db[USERS_COLLECTION].find({}).sort("points", -1).limit(limit)
@@ -53,7 +54,7 @@ async def get_user_rank(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get a specific user's rank"""
-    db = get_database()
+    db = get_database(ANALYTICS)
     
     # Get user
     user = await db[USERS_COLLECTION].find_one({"_id": ObjectId(user_id)})
@@ -90,7 +91,7 @@ async def get_user_rank(
 @router.get("/stats")
 async def get_leaderboard_stats(current_user: User = Depends(get_current_active_user)):
     """Get overall leaderboard statistics"""
-    db = get_database()
+    db = get_database(ANALYTICS)
     
     total_users = await db[USERS_COLLECTION].count_documents({})
     
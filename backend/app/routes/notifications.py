@@ -1,30 +1,120 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Header, Path, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from bson import ObjectId
-from typing import List
+from typing import List, Optional
 from datetime import datetime
+import json
 
-from app.models import Notification, NotificationCreate, User
+from app.models import Notification, NotificationCreate, NotificationIds, User
 from app.auth import get_current_active_user
 from app.database import get_database, NOTIFICATIONS_COLLECTION
+from app.archive import load_archived, archived_months
+from app.pagination import MAX_PAGE_SIZE, encode_cursor, keyset_filter
+from app.notifier import notification_writer, adjust_unread, get_unread, event_payload
+from app.events import get_broker
 
 router = APIRouter()
 
+HEARTBEAT_SECONDS = 15
+RECONNECT_MS = 3000
+
 @router.get("/", response_model=List[Notification])
 async def get_notifications(
+    response: Response,
     current_user: User = Depends(get_current_active_user),
-    limit: int = 50,
+    cursor: Optional[str] = None,
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     unread_only: bool = False
 ):
-    """Get user's notifications"""
+    """
+    Get user's notifications, newest first
+    
+    Pass the X-Next-Cursor response header back as `cursor` to get the next page.
+    """
     db = get_database()
     
     # Build query
     query = {"user_id": current_user.id}
     if unread_only:
         query["read"] = False
+    if cursor:
+        query.update(keyset_filter("created_at", cursor))
+    
+    notifications = await db[NOTIFICATIONS_COLLECTION].find(query).sort(
+        [("created_at", -1), ("_id", -1)]
+    ).limit(limit + 1).to_list(length=limit + 1)
+    
+    if len(notifications) > limit:
+        notifications = notifications[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(notifications[-1]["created_at"], notifications[-1]["_id"])
+    
+    for notif in notifications:
+        notif["_id"] = str(notif["_id"])
+    
+    return [Notification(**notif) for notif in notifications]
+
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Server-sent events stream of new notifications
+    
+    Sends a heartbeat comment every HEARTBEAT_SECONDS while idle. Clients
+    reconnecting with Last-Event-ID receive the events they missed, as far
+    back as the broker retains them.
+    """
+    broker = get_broker()
+    
+    # Subscribe before replaying so nothing published in between is lost
+    subscription = await broker.subscribe(current_user.id)
+    backlog = await broker.replay(current_user.id, last_event_id) if last_event_id else []
+    
+    def format_event(event) -> str:
+        return f"id: {event.id}\nevent: notification\ndata: {json.dumps(event.data)}\n\n"
     
-    cursor = db[NOTIFICATIONS_COLLECTION].find(query).sort("created_at", -1).limit(limit)
-    notifications = await cursor.to_list(length=limit)
+    async def event_stream():
+        replayed = {event.id for event in backlog}
+        try:
+            yield f"retry: {RECONNECT_MS}\n\n"
+            for event in backlog:
+                yield format_event(event)
+            
+            while not await request.is_disconnected():
+                event = await subscription.next(HEARTBEAT_SECONDS)
+                if event is None:
+                    yield ": heartbeat\n\n"
+                elif event.id not in replayed:
+                    yield format_event(event)
+        finally:
+            broker.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/archive")
+async def get_archived_months(current_user: User = Depends(get_current_active_user)):
+    """List months with archived notifications"""
+    db = get_database()
+    
+    months = await archived_months(db, NOTIFICATIONS_COLLECTION, current_user.id)
+    
+    return {"months": months}
+
+@router.get("/archive/{month}", response_model=List[Notification])
+async def get_archived_notifications(
+    month: str = Path(..., pattern=r"^\d{4}-\d{2}$"),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get archived notifications for one month (YYYY-MM)"""
+    db = get_database()
+    
+    notifications = await load_archived(db, NOTIFICATIONS_COLLECTION, current_user.id, month)
     
     for notif in notifications:
         notif["_id"] = str(notif["_id"])
@@ -36,10 +126,7 @@ async def get_unread_count(current_user: User = Depends(get_current_active_user)
     """Get count of unread notifications"""
     db = get_database()
     
-    count = await db[NOTIFICATIONS_COLLECTION].count_documents({
-        "user_id": current_user.id,
-        "read": False
-    })
+    count = await get_unread(db, current_user.id)
     
     return {"unread_count": count}
 
@@ -54,12 +141,18 @@ async def mark_notification_read(
     result = await db[NOTIFICATIONS_COLLECTION].update_one(
         {
             "_id": ObjectId(notification_id),
-            "user_id": current_user.id
+            "user_id": current_user.id,
+            "read": False
         },
-        {"$set": {"read": True}}
+        {"$set": {"read": True, "read_at": datetime.utcnow()}}
     )
     
-    if result.matched_count == 0:
+    if result.modified_count:
+        await adjust_unread(db, current_user.id, -1)
+    elif not await db[NOTIFICATIONS_COLLECTION].find_one(
+        {"_id": ObjectId(notification_id), "user_id": current_user.id},
+        {"_id": 1}
+    ):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Notification not found"
@@ -74,14 +167,67 @@ async def mark_all_read(current_user: User = Depends(get_current_active_user)):
     
     result = await db[NOTIFICATIONS_COLLECTION].update_many(
         {"user_id": current_user.id, "read": False},
-        {"$set": {"read": True}}
+        {"$set": {"read": True, "read_at": datetime.utcnow()}}
     )
+    await adjust_unread(db, current_user.id, -result.modified_count)
     
     return {
         "message": "All notifications marked as read",
         "count": result.modified_count
     }
 
+def _object_ids(ids: List[str]) -> List[ObjectId]:
+    """Parse notification ids from a bulk request"""
+    if not all(ObjectId.is_valid(notification_id) for notification_id in ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid notification id"
+        )
+    return [ObjectId(notification_id) for notification_id in set(ids)]
+
+@router.put("/read")
+async def mark_notifications_read(
+    body: NotificationIds,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Mark several notifications as read"""
+    db = get_database()
+    
+    result = await db[NOTIFICATIONS_COLLECTION].update_many(
+        {
+            "_id": {"$in": _object_ids(body.ids)},
+            "user_id": current_user.id,
+            "read": False
+        },
+        {"$set": {"read": True, "read_at": datetime.utcnow()}}
+    )
+    await adjust_unread(db, current_user.id, -result.modified_count)
+    
+    return {
+        "message": "Notifications marked as read",
+        "count": result.modified_count
+    }
+
+@router.post("/delete")
+async def delete_notifications(
+    body: NotificationIds,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Delete several notifications"""
+    db = get_database()
+    
+    query = {"_id": {"$in": _object_ids(body.ids)}, "user_id": current_user.id}
+    
+    # Unread ones first, so the counter is adjusted by exactly what was removed
+    unread = await db[NOTIFICATIONS_COLLECTION].delete_many({**query, "read": False})
+    read = await db[NOTIFICATIONS_COLLECTION].delete_many(query)
+    await adjust_unread(db, current_user.id, -unread.deleted_count)
+    
+    return {
+        "message": "Notifications deleted",
+        "count": unread.deleted_count + read.deleted_count
+    }
+
 @router.delete("/{notification_id}")
 async def delete_notification(
     notification_id: str,
@@ -90,17 +236,23 @@ async def delete_notification(
     """Delete a notification"""
     db = get_database()
     
-    result = await db[NOTIFICATIONS_COLLECTION].delete_one({
-        "_id": ObjectId(notification_id),
-        "user_id": current_user.id
-    })
+    deleted = await db[NOTIFICATIONS_COLLECTION].find_one_and_delete(
+        {
+            "_id": ObjectId(notification_id),
+            "user_id": current_user.id
+        },
+        projection={"read": 1}
+    )
     
-    if result.deleted_count == 0:
+    if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Notification not found"
         )
     
+    if not deleted.get("read", False):
+        await adjust_unread(db, current_user.id, -1)
+    
     return {"message": "Notification deleted"}
 
 @router.post("/", response_model=Notification, status_code=status.HTTP_201_CREATED)
@@ -117,9 +269,10 @@ async def create_notification(
         "created_at": datetime.utcnow()
     })
     
-    result = await db[NOTIFICATIONS_COLLECTION].insert_one(notif_dict)
+    await db[NOTIFICATIONS_COLLECTION].insert_one(notif_dict)
+    await adjust_unread(db, notif_dict["user_id"], 1)
+    await get_broker().publish_many([(notif_dict["user_id"], event_payload(notif_dict))])
     
-    created_notif = await db[NOTIFICATIONS_COLLECTION].find_one({"_id": result.inserted_id})
-    created_notif["_id"] = str(created_notif["_id"])
+    notif_dict["_id"] = str(notif_dict["_id"])
     
-    return Notification(**created_notif)
+    return Notification(**notif_dict)
@@ -5,7 +5,14 @@ from datetime import datetime
 
 from app.models import Recommendation, User
 from app.auth import get_current_active_user
-from app.database import get_database, RECOMMENDATIONS_COLLECTION, USERS_COLLECTION, NOTIFICATIONS_COLLECTION
+from app.database import (
+    get_database,
+    USERS_COLLECTION,
+    RECOMMENDATION_SUGGESTIONS_COLLECTION
+)
+from app.catalogue import catalogue
+from app.badges import BadgeEvent, handle_event
+from app.notifier import notification_writer
 
 router = APIRouter()
 
@@ -83,23 +90,14 @@ INITIAL_RECOMMENDATIONS = [
     }
 ]
 
+# Seeded lazily on the first read of an empty catalogue
+catalogue.set_defaults(INITIAL_RECOMMENDATIONS)
+
 @router.get("/", response_model=List[Recommendation])
 async def get_recommendations(current_user: User = Depends(get_current_active_user)):
     """Get all recommendations"""
-    db = get_database()
-    
-    # Check if recommendations exist, if not initialize them
-    count = await db[RECOMMENDATIONS_COLLECTION].count_documents({})
-    if count == 0:
-        await db[RECOMMENDATIONS_COLLECTION].insert_many(INITIAL_RECOMMENDATIONS)
-    
-    cursor = db[RECOMMENDATIONS_COLLECTION].find({})
-    recommendations = await cursor.to_list(length=None)
-    
-    for rec in recommendations:
-        rec["_id"] = str(rec["_id"])
-    
-    return [Recommendation(**rec) for rec in recommendations]
+    snapshot = await catalogue.get()
+    return list(snapshot.items)
 
 @router.get("/{recommendation_id}", response_model=Recommendation)
 async def get_recommendation(
@@ -107,9 +105,8 @@ async def get_recommendation(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get a specific recommendation"""
-    db = get_database()
-    
-    rec = await db[RECOMMENDATIONS_COLLECTION].find_one({"_id": ObjectId(recommendation_id)})
+    snapshot = await catalogue.get()
+    rec = snapshot.by_id.get(recommendation_id)
     
     if not rec:
         raise HTTPException(
@@ -117,8 +114,7 @@ async def get_recommendation(
             detail="Recommendation not found"
         )
     
-    rec["_id"] = str(rec["_id"])
-    return Recommendation(**rec)
+    return rec
 
 @router.post("/{recommendation_id}/complete")
 async def mark_recommendation_complete(
@@ -129,7 +125,8 @@ async def mark_recommendation_complete(
     db = get_database()
     
     # Verify recommendation exists
-    rec = await db[RECOMMENDATIONS_COLLECTION].find_one({"_id": ObjectId(recommendation_id)})
+    snapshot = await catalogue.get()
+    rec = snapshot.by_id.get(recommendation_id)
     if not rec:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -137,7 +134,10 @@ async def mark_recommendation_complete(
         )
     
     # Update user's completed recommendations
-    user = await db[USERS_COLLECTION].find_one({"_id": ObjectId(current_user.id)})
+    user = await db[USERS_COLLECTION].find_one(
+        {"_id": ObjectId(current_user.id)},
+        {"completed_recommendations": 1}
+    )
     completed_recs = user.get("completed_recommendations", [])
     
     if recommendation_id in completed_recs:
@@ -158,15 +158,17 @@ async def mark_recommendation_complete(
     )
     
     # Create achievement notification
-    await db[NOTIFICATIONS_COLLECTION].insert_one({
+    notification_writer.send({
         "user_id": current_user.id,
         "type": "achievement",
         "title": "Recommendation Completed!",
-        "message": f"You earned {points_awarded} points for completing: {rec['title']}",
+        "message": f"You earned {points_awarded} points for completing: {rec.title}",
         "read": False,
         "created_at": datetime.utcnow()
     })
     
+    await handle_event(db, current_user.id, BadgeEvent.recommendation_completed, category=rec.category)
+    
     return {
         "message": "Recommendation marked as completed",
         "points_awarded": points_awarded
@@ -205,19 +207,42 @@ async def get_user_completed_recommendations(
     """Get user's completed recommendations"""
     db = get_database()
     
-    user = await db[USERS_COLLECTION].find_one({"_id": ObjectId(current_user.id)})
-    completed_ids = user.get("completed_recommendations", [])
+    user = await db[USERS_COLLECTION].find_one(
+        {"_id": ObjectId(current_user.id)},
+        {"completed_recommendations": 1}
+    )
+    completed_ids = user.get("completed_recommendations", []) if user else []
     
     if not completed_ids:
         return []
     
-    # Convert string IDs to ObjectIds
-    object_ids = [ObjectId(id) for id in completed_ids if ObjectId.is_valid(id)]
+    snapshot = await catalogue.get()
+    return [snapshot.by_id[rec_id] for rec_id in completed_ids if rec_id in snapshot.by_id]
+
+@router.get("/user/suggested", response_model=List[Recommendation])
+async def get_suggested_recommendations(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get recommendations adopted by similar users (precomputed by jobs.collaborative_recommendations)"""
+    db = get_database()
     
-    cursor = db[RECOMMENDATIONS_COLLECTION].find({"_id": {"$in": object_ids}})
-    recommendations = await cursor.to_list(length=None)
+    doc = await db[RECOMMENDATION_SUGGESTIONS_COLLECTION].find_one({"_id": current_user.id})
+    if not doc or not doc.get("suggestions"):
+        doc = await db[RECOMMENDATION_SUGGESTIONS_COLLECTION].find_one({"_id": "_popular"})
     
-    for rec in recommendations:
-        rec["_id"] = str(rec["_id"])
+    if not doc:
+        return []
     
-    return [Recommendation(**rec) for rec in recommendations]
+    # Suggestions are precomputed; drop anything completed since the last job run
+    user = await db[USERS_COLLECTION].find_one(
+        {"_id": ObjectId(current_user.id)},
+        {"completed_recommendations": 1}
+    )
+    completed_ids = set(user.get("completed_recommendations", [])) if user else set()
+    
+    snapshot = await catalogue.get()
+    return [
+        snapshot.by_id[item["recommendation_id"]]
+        for item in doc.get("suggestions", [])
+        if item["recommendation_id"] in snapshot.by_id and item["recommendation_id"] not in completed_ids
+    ]
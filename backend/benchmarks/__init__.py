@@ -0,0 +1,8 @@
+"""
+Benchmarks for PlanetZero
+Scripts measuring query and endpoint performance against a local MongoDB
+
+Each module seeds its own throwaway database (BENCH_DATABASE_NAME,
+default planetzero_bench) and drops it when finished. Run from backend/,
+e.g. `python -m benchmarks.community_members`
+"""
@@ -0,0 +1,138 @@
+"""
+carbon_footprints Storage Benchmark
+Compares the regular one-document-per-day layout with a native time-series
+collection: storage and index size, and latency of the 30- and 365-day
+per-user range queries issued by routes/charts
+
+Both layouts are loaded with the same synthetic footprints (every user
+logs every day) in the throwaway BENCH_DATABASE_NAME database.
+Requires MongoDB 5.0+.
+
+Usage:
+    python -m benchmarks.carbon_footprints [--users 1000] [--days 730] [--queries 200]
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from db_utils.indexes import DOCUMENT_FOOTPRINT_INDEXES, TIMESERIES_FOOTPRINT_INDEXES
+from services.footprint_service import TIMESERIES_OPTIONS
+
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+BENCH_DATABASE_NAME = os.getenv("BENCH_DATABASE_NAME", "planetzero_bench")
+
+DOCUMENT_COLLECTION = "footprints_document"
+TIMESERIES_COLLECTION = "footprints_timeseries"
+INSERT_BATCH_SIZE = 10000
+
+
+def footprint(user_id: ObjectId, day: datetime, rng: random.Random) -> dict:
+    """Synthetic entry shaped like the ones written by routes/daily_log"""
+    transport, energy, food, shopping = (round(rng.uniform(0, 10), 2) for _ in range(4))
+    return {
+        "user_id": user_id,
+        "date": day,
+        "daily_log_id": ObjectId(),
+        "total_emissions": round(transport + energy + food + shopping, 2),
+        "transport_emissions": transport,
+        "energy_emissions": energy,
+        "food_emissions": food,
+        "breakdown": {"transport": transport, "electricity": energy, "food": food, "water": 0.0, "shopping": shopping},
+        "comparison_to_average": -25.0,
+        "created_at": day + timedelta(hours=20)
+    }
+
+
+async def load(db, user_ids, days: int, end: datetime) -> None:
+    """Insert the same footprints into both layouts"""
+    rng = random.Random(42)
+    start = end - timedelta(days=days - 1)
+    batch = []
+
+    async def flush():
+        await asyncio.gather(
+            db[DOCUMENT_COLLECTION].insert_many([dict(doc) for doc in batch], ordered=False),
+            db[TIMESERIES_COLLECTION].insert_many([dict(doc) for doc in batch], ordered=False)
+        )
+        batch.clear()
+
+    # Day-major order, as the data arrives in production
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        for user_id in user_ids:
+            batch.append(footprint(user_id, day, rng))
+            if len(batch) >= INSERT_BATCH_SIZE:
+                await flush()
+    if batch:
+        await flush()
+
+
+async def storage(db, name: str) -> dict:
+    stats = await db.command("collStats", name)
+    return {"storage": stats.get("storageSize", 0), "indexes": stats.get("totalIndexSize", 0)}
+
+
+async def range_latency(db, name: str, user_ids, window: int, end: datetime, queries: int) -> float:
+    """Median milliseconds for one user's `window`-day range, sorted by date"""
+    rng = random.Random(7)
+    start = end - timedelta(days=window - 1)
+    samples = []
+    for _ in range(queries):
+        user_id = rng.choice(user_ids)
+        began = time.perf_counter()
+        await db[name].find(
+            {"user_id": user_id, "date": {"$gte": start, "$lte": end}}
+        ).sort("date", 1).to_list(length=None)
+        samples.append((time.perf_counter() - began) * 1000)
+    return statistics.median(samples)
+
+
+def megabytes(size: int) -> str:
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark carbon_footprints storage layouts")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(MONGODB_URL)
+    db = client[BENCH_DATABASE_NAME]
+    end = datetime(2026, 1, 1)
+    user_ids = [ObjectId() for _ in range(args.users)]
+
+    try:
+        await client.drop_database(BENCH_DATABASE_NAME)
+        await db[DOCUMENT_COLLECTION].create_indexes(DOCUMENT_FOOTPRINT_INDEXES)
+        await db.create_collection(TIMESERIES_COLLECTION, timeseries=TIMESERIES_OPTIONS)
+        await db[TIMESERIES_COLLECTION].create_indexes(TIMESERIES_FOOTPRINT_INDEXES)
+
+        print(f"📥 Loading {args.users * args.days} footprints ({args.users} users x {args.days} days)...")
+        await load(db, user_ids, args.days, end)
+
+        print(f"\n{'layout':>10} | {'storage':>10} | {'indexes':>10} | {'30 days (ms)':>12} | {'365 days (ms)':>13}")
+        print("-" * 68)
+        for label, name in (("document", DOCUMENT_COLLECTION), ("timeseries", TIMESERIES_COLLECTION)):
+            sizes = await storage(db, name)
+            month = await range_latency(db, name, user_ids, 30, end, args.queries)
+            year = await range_latency(db, name, user_ids, 365, end, args.queries)
+            print(
+                f"{label:>10} | {megabytes(sizes['storage']):>10} | {megabytes(sizes['indexes']):>10} | "
+                f"{month:>12.2f} | {year:>13.2f}"
+            )
+    finally:
+        await client.drop_database(BENCH_DATABASE_NAME)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
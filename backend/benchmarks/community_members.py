@@ -0,0 +1,114 @@
+"""
+Community Members Benchmark
+Compares the old per-member users.find_one lookup (N+1) with the batched
+$in query used by app/routes/communities.get_community_members
+
+Usage:
+    python -m benchmarks.community_members [--sizes 10 1000 10000] [--repeat 5]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from fastapi import Response
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app import database as app_database
+from app.routes.communities import get_community_members
+from db_utils.indexes import create_all_indexes
+
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+BENCH_DATABASE_NAME = os.getenv("BENCH_DATABASE_NAME", "planetzero_bench")
+
+
+async def seed_community(db, size: int) -> str:
+    """Create one community with `size` members and return its id"""
+    community_id = str(ObjectId())
+    joined = datetime(2026, 1, 1)
+    users = [{"_id": ObjectId(), "name": f"Member {i}", "email": f"member{size}-{i}@bench.local"} for i in range(size)]
+    await db.users.insert_many(users, ordered=False)
+    await db.community_members.insert_many([
+        {
+            "community_id": community_id,
+            "user_id": str(user["_id"]),
+            "role": "Member",
+            "joined_at": joined + timedelta(seconds=i)
+        }
+        for i, user in enumerate(users)
+    ], ordered=False)
+    return community_id
+
+
+async def n_plus_one_members(db, community_id: str):
+    """Previous implementation: every membership, one find_one per member"""
+    members = await db.community_members.find({"community_id": community_id}).to_list(length=None)
+    details = []
+    for member in members:
+        user = await db.users.find_one({"_id": ObjectId(member["user_id"])})
+        if user:
+            details.append({"user_id": member["user_id"], "name": user["name"]})
+    return details
+
+
+async def batched_members(community_id: str):
+    """Current implementation: walk every page of the paginated endpoint"""
+    details = []
+    cursor = None
+    while True:
+        response = Response()
+        page = await get_community_members(community_id, response, cursor=cursor, limit=50, current_user=None)
+        details.extend(page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return details
+
+
+async def first_page(community_id: str):
+    """Latency of the first page, which is what a client actually requests"""
+    return await get_community_members(community_id, Response(), cursor=None, limit=50, current_user=None)
+
+
+async def timed(fn, repeat: int) -> float:
+    """Median wall time in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark community member resolution")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(MONGODB_URL)
+    db = client[BENCH_DATABASE_NAME]
+    app_database.db.client = client
+    app_database.db.db = db
+
+    try:
+        await client.drop_database(BENCH_DATABASE_NAME)
+        await create_all_indexes(db)
+
+        print(f"\n{'members':>8} | {'N+1 (ms)':>10} | {'batched all (ms)':>16} | {'first page (ms)':>15}")
+        print("-" * 60)
+        for size in args.sizes:
+            community_id = await seed_community(db, size)
+            old = await timed(lambda: n_plus_one_members(db, community_id), args.repeat)
+            new_all = await timed(lambda: batched_members(community_id), args.repeat)
+            new_page = await timed(lambda: first_page(community_id), args.repeat)
+            print(f"{size:>8} | {old:>10.1f} | {new_all:>16.1f} | {new_page:>15.1f}")
+    finally:
+        await client.drop_database(BENCH_DATABASE_NAME)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,235 @@
+"""
+End-to-End Load Test
+Drives the running API over HTTP with a mix of user scenarios and reports
+throughput and latency percentiles per endpoint
+
+Each virtual user logs in as one of the generated users
+(db_utils/generate_dataset: user{N}@loadtest.planetzero.dev, Password123)
+and then loops over weighted scenarios until the run ends:
+
+    login        POST /api/auth/login
+    log_submit   POST /api/daily-log     (a day within the last 30, so both
+                                          inserts and updates happen)
+    dashboard    GET  /api/dashboard
+    charts       GET  /api/charts
+    leaderboard  GET  /api/leaderboard   (weekly, monthly or all_time)
+    history      GET  /api/history
+
+Results can be saved as a JSON baseline and a later run compared against
+it: an endpoint regresses when its p95 or p99 grows, or its throughput
+drops, by more than --tolerance, or when its error rate rises. The
+comparison exits with status 1 on regressions so it can gate CI.
+
+Start the API against a generated dataset first, e.g.:
+    python -m db_utils.generate_dataset --users 10000 --drop
+    DATABASE_NAME=planetzero_load python main.py
+
+Usage:
+    python -m benchmarks.load_test [--base-url http://localhost:8000] [--users 50] [--duration 60]
+        [--dataset-users 10000] [--mix "login=1,log_submit=2,dashboard=4,charts=2,leaderboard=2,history=2"]
+        [--save baselines/main.json] [--compare baselines/main.json] [--tolerance 0.2]
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import httpx
+
+from db_utils.generate_dataset import DEFAULT_DIETS, DEFAULT_MODES, EMAIL_DOMAIN, parse_distribution
+
+PASSWORD = "Password123"
+DEFAULT_MIX = "login=1,log_submit=2,dashboard=4,charts=2,leaderboard=2,history=2"
+DEFAULT_TOLERANCE = 0.2
+PERCENTILES = (50, 95, 99)
+
+
+class Recorder:
+    """Latency samples and error counts per endpoint"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, endpoint: str, milliseconds: float, ok: bool) -> None:
+        self.samples.setdefault(endpoint, []).append(milliseconds)
+        if not ok:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def summary(self, elapsed: float) -> Dict[str, dict]:
+        results = {}
+        for endpoint, samples in sorted(self.samples.items()):
+            ordered = sorted(samples)
+            results[endpoint] = {
+                "requests": len(ordered),
+                "errors": self.errors.get(endpoint, 0),
+                "rps": round(len(ordered) / elapsed, 2),
+                **{f"p{p}": round(percentile(ordered, p), 2) for p in PERCENTILES}
+            }
+        return results
+
+
+def percentile(ordered: List[float], p: float) -> float:
+    """Nearest-rank percentile of sorted samples"""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, email: str, rng: random.Random):
+        self.client = client
+        self.recorder = recorder
+        self.email = email
+        self.rng = rng
+        self.headers: Dict[str, str] = {}
+        self.modes = parse_distribution(DEFAULT_MODES)
+        self.diets = parse_distribution(DEFAULT_DIETS)
+
+    async def request(self, endpoint: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        began = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=self.headers, **kwargs)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            response, ok = None, False
+        self.recorder.record(endpoint, (time.perf_counter() - began) * 1000, ok)
+        return response
+
+    async def login(self) -> None:
+        response = await self.request("login", "POST", "/api/auth/login", json={"email": self.email, "password": PASSWORD})
+        if response is not None and response.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def log_submit(self) -> None:
+        day = datetime.utcnow().date() - timedelta(days=self.rng.randrange(30))
+        await self.request("log_submit", "POST", "/api/daily-log", json={
+            "date": day.isoformat(),
+            "transportation": [
+                {"mode": self.modes.pick(self.rng), "distance_km": round(self.rng.uniform(1, 40), 1)}
+                for _ in range(self.rng.randint(0, 2))
+            ],
+            "electricity_kwh": round(self.rng.uniform(2, 12), 1),
+            "food": [{"meal_type": self.diets.pick(self.rng), "meals_count": 3}],
+            "lifestyle": []
+        })
+
+    async def dashboard(self) -> None:
+        await self.request("dashboard", "GET", "/api/dashboard")
+
+    async def charts(self) -> None:
+        await self.request("charts", "GET", "/api/charts", params={"days": 30})
+
+    async def leaderboard(self) -> None:
+        period = self.rng.choice(("weekly", "monthly", "all_time"))
+        await self.request("leaderboard", "GET", "/api/leaderboard", params={"period": period})
+
+    async def history(self) -> None:
+        await self.request("history", "GET", "/api/history", params={"limit": 30})
+
+    async def run(self, scenarios: List[str], weights: List[float], deadline: float, think_time: float) -> None:
+        await self.login()
+        while time.perf_counter() < deadline:
+            await getattr(self, self.rng.choices(scenarios, weights)[0])()
+            if think_time:
+                await asyncio.sleep(self.rng.expovariate(1 / think_time))
+
+
+async def run_load(args) -> Dict[str, dict]:
+    mix = parse_distribution(args.mix)
+    unknown = [name for name in mix.values if not hasattr(VirtualUser, name) or name == "run"]
+    if unknown:
+        raise SystemExit(f"❌ Unknown scenarios: {', '.join(unknown)}")
+
+    recorder = Recorder()
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        users = [
+            VirtualUser(client, recorder, f"user{index}@{EMAIL_DOMAIN}", random.Random(rng.random()))
+            for index in rng.sample(range(args.dataset_users), min(args.users, args.dataset_users))
+        ]
+        began = time.perf_counter()
+        deadline = began + args.duration
+        await asyncio.gather(*(user.run(mix.values, mix.weights, deadline, args.think_time) for user in users))
+        elapsed = time.perf_counter() - began
+    return recorder.summary(elapsed)
+
+
+def print_report(results: Dict[str, dict]) -> None:
+    print(f"\n{'endpoint':>12} | {'requests':>8} | {'errors':>6} | {'req/s':>8} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8}")
+    print("-" * 78)
+    for endpoint, row in results.items():
+        print(
+            f"{endpoint:>12} | {row['requests']:>8} | {row['errors']:>6} | {row['rps']:>8.1f} | "
+            f"{row['p50']:>8.1f} | {row['p95']:>8.1f} | {row['p99']:>8.1f}"
+        )
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """Regressions of `results` against a baseline's endpoints"""
+    regressions = []
+    for endpoint, base in baseline.items():
+        row = results.get(endpoint)
+        if row is None:
+            regressions.append(f"{endpoint}: not exercised in this run")
+            continue
+        for key in ("p95", "p99"):
+            if base[key] and row[key] > base[key] * (1 + tolerance):
+                regressions.append(f"{endpoint}: {key} {base[key]:.1f} -> {row[key]:.1f} ms")
+        if base["rps"] and row["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{endpoint}: throughput {base['rps']:.1f} -> {row['rps']:.1f} req/s")
+        base_rate = base["errors"] / max(base["requests"], 1)
+        rate = row["errors"] / max(row["requests"], 1)
+        if rate > base_rate + 0.01:
+            regressions.append(f"{endpoint}: error rate {base_rate:.1%} -> {rate:.1%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the PlanetZero API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--users", type=int, default=50, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds to run")
+    parser.add_argument("--dataset-users", type=int, default=10000, help="Users in the generated dataset")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help='Scenario weights, "name=weight,..."')
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean pause between requests (seconds)")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save", help="Write the results as a JSON baseline")
+    parser.add_argument("--compare", help="Compare against a JSON baseline and fail on regressions")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    print(f"🚀 {args.users} virtual users for {args.duration:.0f}s against {args.base_url}")
+    results = asyncio.run(run_load(args))
+    print_report(results)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                "created_at": datetime.utcnow().isoformat(),
+                "config": {key: getattr(args, key) for key in ("base_url", "users", "duration", "mix", "think_time", "seed")},
+                "endpoints": results
+            }, f, indent=2)
+        print(f"\n💾 Saved baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline["endpoints"], args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regressions against {args.compare} (tolerance {args.tolerance:.0%}):")
+            for regression in regressions:
+                print(f"   {regression}")
+            sys.exit(1)
+        print(f"\n✅ No regressions against {args.compare} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Read Routing Benchmark
+Measures how much read work the analytics routes put on the primary of a
+replica set, with every read on the primary and with the analytics read
+profile (db_utils/read_routing.py)
+
+A mixed workload runs for a fixed time in each mode: writer tasks upsert
+daily logs while reader tasks issue the analytics queries (period and
+all-time leaderboard, charts range, history page). Before and after each
+run serverStatus is read from every member directly, and the read
+operations and read time each member served are reported, together with
+the write and read latencies seen by the client.
+
+Start a local 3-member replica set first:
+    mkdir -p /tmp/rs0-0 /tmp/rs0-1 /tmp/rs0-2
+    mongod --replSet rs0 --port 27017 --dbpath /tmp/rs0-0 --fork --logpath /tmp/rs0-0.log
+    mongod --replSet rs0 --port 27018 --dbpath /tmp/rs0-1 --fork --logpath /tmp/rs0-1.log
+    mongod --replSet rs0 --port 27019 --dbpath /tmp/rs0-2 --fork --logpath /tmp/rs0-2.log
+    mongosh --port 27017 --eval 'rs.initiate({_id: "rs0", members: [
+        {_id: 0, host: "localhost:27017"}, {_id: 1, host: "localhost:27018"}, {_id: 2, host: "localhost:27019"}]})'
+
+Usage:
+    python -m benchmarks.read_routing [--users 2000] [--days 180] [--seconds 30] [--readers 16] [--writers 4]
+
+Environment:
+    BENCH_REPLICA_SET_URL   default mongodb://localhost:27017,localhost:27018,localhost:27019/?replicaSet=rs0
+    BENCH_DATABASE_NAME     throwaway database (default planetzero_bench)
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from db_utils.indexes import INDEXES
+from db_utils.read_routing import ANALYTICS, PRIMARY, read_profiles
+
+REPLICA_SET_URL = os.getenv(
+    "BENCH_REPLICA_SET_URL",
+    "mongodb://localhost:27017,localhost:27018,localhost:27019/?replicaSet=rs0"
+)
+BENCH_DATABASE_NAME = os.getenv("BENCH_DATABASE_NAME", "planetzero_bench")
+INSERT_BATCH_SIZE = 5000
+END_DATE = datetime(2026, 1, 1)
+
+
+def log(user_id: str, day: datetime, rng: random.Random) -> dict:
+    """Daily log shaped like the ones written by routes/daily_log"""
+    transport, electricity, food, lifestyle = (round(rng.uniform(0, 10), 2) for _ in range(4))
+    return {
+        "user_id": user_id,
+        "date": day.strftime("%Y-%m-%d"),
+        "transport_emissions": transport,
+        "electricity_emissions": electricity,
+        "food_emissions": food,
+        "lifestyle_emissions": lifestyle,
+        "total_emissions": round(transport + electricity + food + lifestyle, 2),
+        "created_at": day,
+        "updated_at": day
+    }
+
+
+async def load(db, user_ids: List[str], days: int) -> None:
+    """Seed daily_logs, carbon_footprints and user_stats"""
+    rng = random.Random(42)
+    start = END_DATE - timedelta(days=days - 1)
+    for name in ("daily_logs", "carbon_footprints", "user_stats"):
+        await db[name].create_indexes(INDEXES[name])
+
+    batch = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        for user_id in user_ids:
+            batch.append(log(user_id, day, rng))
+            if len(batch) >= INSERT_BATCH_SIZE:
+                await db.daily_logs.insert_many(batch, ordered=False)
+                batch.clear()
+    if batch:
+        await db.daily_logs.insert_many(batch, ordered=False)
+
+    footprints = db.daily_logs.aggregate([
+        {"$project": {
+            "_id": 0,
+            "user_id": {"$toObjectId": "$user_id"},
+            "date": {"$dateFromString": {"dateString": "$date"}},
+            "daily_log_id": "$_id",
+            "total_emissions": 1,
+            "created_at": 1
+        }},
+        {"$merge": {"into": "carbon_footprints"}}
+    ])
+    await footprints.to_list(length=None)
+    stats = db.daily_logs.aggregate([
+        {"$group": {"_id": "$user_id", "total_logs": {"$sum": 1}, "total_emissions": {"$sum": "$total_emissions"}}},
+        {"$set": {"average_daily_emissions": {"$divide": ["$total_emissions", "$total_logs"]}}},
+        {"$merge": {"into": "user_stats"}}
+    ])
+    await stats.to_list(length=None)
+
+
+async def member_reads(client: AsyncIOMotorClient) -> Dict[str, dict]:
+    """Read ops and cumulative read time (microseconds) served by every member"""
+    status = await client.admin.command("replSetGetStatus")
+    counters = {}
+    for member in status["members"]:
+        direct = AsyncIOMotorClient(f"mongodb://{member['name']}/?directConnection=true")
+        try:
+            server = await direct.admin.command("serverStatus")
+        finally:
+            direct.close()
+        reads = server["opLatencies"]["reads"]
+        counters[member["name"]] = {"state": member["stateStr"], "ops": reads["ops"], "micros": reads["latency"]}
+    return counters
+
+
+async def writer(db, user_ids: List[str], deadline: float, latencies: List[float], seed: int) -> None:
+    rng = random.Random(seed)
+    while time.perf_counter() < deadline:
+        doc = log(rng.choice(user_ids), END_DATE - timedelta(days=rng.randrange(7)), rng)
+        began = time.perf_counter()
+        await db.daily_logs.update_one({"user_id": doc["user_id"], "date": doc["date"]}, {"$set": doc}, upsert=True)
+        latencies.append((time.perf_counter() - began) * 1000)
+
+
+async def reader(db, user_ids: List[str], deadline: float, latencies: List[float], seed: int) -> None:
+    """Cycle through the analytics routes' queries"""
+    rng = random.Random(seed)
+    month_ago = (END_DATE - timedelta(days=30)).strftime("%Y-%m-%d")
+    queries = [
+        # routes/leaderboard: period averages
+        lambda user_id: db.daily_logs.aggregate([
+            {"$match": {"date": {"$gte": month_ago}}},
+            {"$group": {"_id": "$user_id", "total_emissions": {"$sum": "$total_emissions"}, "log_count": {"$sum": 1}}},
+            {"$set": {"average_daily_emissions": {"$divide": ["$total_emissions", "$log_count"]}}},
+            {"$sort": {"average_daily_emissions": 1}},
+            {"$limit": 10}
+        ]).to_list(length=10),
+        # routes/leaderboard: all time
+        lambda user_id: db.user_stats.find(
+            {"average_daily_emissions": {"$exists": True}}
+        ).sort("average_daily_emissions", 1).limit(10).to_list(length=10),
+        # routes/charts
+        lambda user_id: db.carbon_footprints.find({
+            "user_id": ObjectId(user_id),
+            "date": {"$gte": END_DATE - timedelta(days=29), "$lte": END_DATE}
+        }).sort("date", 1).to_list(length=None),
+        # routes/history
+        lambda user_id: db.daily_logs.find({"user_id": user_id}).sort("date", -1).limit(30).to_list(length=30),
+    ]
+    while time.perf_counter() < deadline:
+        query = rng.choice(queries)
+        began = time.perf_counter()
+        await query(rng.choice(user_ids))
+        latencies.append((time.perf_counter() - began) * 1000)
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run(client: AsyncIOMotorClient, profile: str, user_ids: List[str], args) -> None:
+    base = client[BENCH_DATABASE_NAME]
+    read_db = base if profile == PRIMARY else base.with_options(**read_profiles()[profile])
+    write_latencies, read_latencies = [], []
+
+    before = await member_reads(client)
+    began = time.perf_counter()
+    deadline = began + args.seconds
+    await asyncio.gather(
+        *(writer(base, user_ids, deadline, write_latencies, seed) for seed in range(args.writers)),
+        *(reader(read_db, user_ids, deadline, read_latencies, 1000 + seed) for seed in range(args.readers))
+    )
+    elapsed = time.perf_counter() - began
+    after = await member_reads(client)
+
+    print(f"\n📊 {profile}: {len(read_latencies) / elapsed:.0f} reads/s, {len(write_latencies) / elapsed:.0f} writes/s")
+    print(f"   reads  p50 {statistics.median(read_latencies or [0]):.2f} ms | p95 {percentile(read_latencies, 0.95):.2f} ms")
+    print(f"   writes p50 {statistics.median(write_latencies or [0]):.2f} ms | p95 {percentile(write_latencies, 0.95):.2f} ms")
+    print(f"   {'member':>16} | {'state':>9} | {'read ops/s':>10} | {'read time (ms/s)':>16}")
+    for name, counters in after.items():
+        ops = (counters["ops"] - before[name]["ops"]) / elapsed
+        busy = (counters["micros"] - before[name]["micros"]) / 1000 / elapsed
+        print(f"   {name:>16} | {counters['state']:>9} | {ops:>10.0f} | {busy:>16.1f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare primary load with and without secondary analytics reads")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--seconds", type=int, default=30)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--writers", type=int, default=4)
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(REPLICA_SET_URL)
+    user_ids = [str(ObjectId()) for _ in range(args.users)]
+    try:
+        await client.drop_database(BENCH_DATABASE_NAME)
+        print(f"📥 Loading {args.users * args.days} daily logs ({args.users} users x {args.days} days)...")
+        await load(client[BENCH_DATABASE_NAME], user_ids, args.days)
+
+        for profile in (PRIMARY, ANALYTICS):
+            await run(client, profile, user_ids, args)
+    finally:
+        await client.drop_database(BENCH_DATABASE_NAME)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
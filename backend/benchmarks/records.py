@@ -0,0 +1,264 @@
+"""
+Data Access Records Benchmark
+Compares the former dict path of the history and leaderboard routes (whole
+documents, Pydantic response models, FastAPI response validation) with
+the record path (projected fields, slotted records, direct serialization)
+
+Reports:
+- memory per record: whole decoded documents vs records built from
+  projected documents, measured with tracemalloc
+- requests per second of the history and leaderboard handlers' data and
+  serialization path (database reads included, HTTP and auth excluded)
+
+Usage:
+    python -m benchmarks.records [--users 500] [--days 120] [--requests 500] [--concurrency 20]
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from motor.motor_asyncio import AsyncIOMotorClient
+from pydantic import TypeAdapter
+
+from database import DAILY_LOGS_COLLECTION, USERS_COLLECTION
+from db_utils.indexes import INDEXES
+from repositories.daily_logs import find_history
+from repositories.records import DailyLogRecord, UserRecord
+from repositories.users import find_user_names
+from schemas import HistoryEntry, HistoryResponse, LeaderboardEntry, LeaderboardResponse
+
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+BENCH_DATABASE_NAME = os.getenv("BENCH_DATABASE_NAME", "planetzero_bench")
+INSERT_BATCH_SIZE = 5000
+END_DATE = datetime(2026, 1, 1)
+LEADERBOARD_LIMIT = 10
+
+
+def user_document(rng: random.Random, index: int) -> dict:
+    return {
+        "_id": ObjectId(),
+        "email": f"user{index}@example.com",
+        "hashed_password": "$2b$12$" + "x" * 53,
+        "name": f"User {index}",
+        "age": rng.randint(18, 80),
+        "gender": rng.choice(["female", "male", "other"]),
+        "country": rng.choice(["India", "Germany", "Canada"]),
+        "city": "Somewhere",
+        "household_size": rng.randint(1, 5),
+        "transport_mode": "bus",
+        "diet_type": "veg",
+        "energy_source": "grid",
+        "created_at": END_DATE - timedelta(days=400),
+        "updated_at": END_DATE,
+        "is_active": True
+    }
+
+
+def log_document(user_id: str, day: datetime, rng: random.Random) -> dict:
+    """Daily log shaped like the ones written by routes/daily_log"""
+    transport, electricity, food, lifestyle = (round(rng.uniform(0, 10), 2) for _ in range(4))
+    return {
+        "user_id": user_id,
+        "date": day.strftime("%Y-%m-%d"),
+        "transportation": [{"mode": "bus", "distance_km": 12.5}, {"mode": "car_petrol", "distance_km": 8.0}],
+        "electricity_kwh": 6.5,
+        "food": [{"meal_type": "veg", "meals_count": 2}, {"meal_type": "non_veg", "meals_count": 1}],
+        "lifestyle": [{"category": "clothing", "items_count": 1}],
+        "transport_emissions": transport,
+        "electricity_emissions": electricity,
+        "food_emissions": food,
+        "lifestyle_emissions": lifestyle,
+        "total_emissions": round(transport + electricity + food + lifestyle, 2),
+        "created_at": day,
+        "updated_at": day
+    }
+
+
+async def load(db, users: int, days: int) -> list:
+    rng = random.Random(42)
+    for name in (USERS_COLLECTION, DAILY_LOGS_COLLECTION):
+        await db[name].create_indexes(INDEXES[name])
+    user_docs = [user_document(rng, index) for index in range(users)]
+    await db[USERS_COLLECTION].insert_many(user_docs, ordered=False)
+
+    user_ids = [str(user["_id"]) for user in user_docs]
+    batch = []
+    for offset in range(days):
+        day = END_DATE - timedelta(days=offset)
+        for user_id in user_ids:
+            batch.append(log_document(user_id, day, rng))
+            if len(batch) >= INSERT_BATCH_SIZE:
+                await db[DAILY_LOGS_COLLECTION].insert_many(batch, ordered=False)
+                batch.clear()
+    if batch:
+        await db[DAILY_LOGS_COLLECTION].insert_many(batch, ordered=False)
+    return user_ids
+
+
+async def memory_per_record(db, count: int) -> None:
+    """Bytes retained per loaded daily log and user, dicts vs records"""
+
+    async def measure(load_items) -> float:
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        items = await load_items()
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return (after - before) / max(len(items), 1)
+
+    logs = db[DAILY_LOGS_COLLECTION]
+    users = db[USERS_COLLECTION]
+    rows = [
+        ("daily log", "document",
+         lambda: logs.find({}).limit(count).to_list(length=count)),
+        ("daily log", "DailyLogRecord",
+         lambda: _records(logs.find({}, DailyLogRecord.HISTORY_PROJECTION).limit(count), DailyLogRecord)),
+        ("user", "document",
+         lambda: users.find({}).limit(count).to_list(length=count)),
+        ("user", "UserRecord",
+         lambda: _records(users.find({}, UserRecord.PROJECTION).limit(count), UserRecord)),
+    ]
+    print(f"\n{'collection':>10} | {'representation':>15} | {'bytes/record':>12}")
+    print("-" * 44)
+    for collection, representation, load_items in rows:
+        print(f"{collection:>10} | {representation:>15} | {await measure(load_items):>12.0f}")
+
+
+async def _records(cursor, record_type) -> list:
+    return [record_type.from_document(doc) async for doc in cursor]
+
+
+# Former route implementations: whole documents and Pydantic responses,
+# then FastAPI validating and serializing the returned model
+history_adapter = TypeAdapter(HistoryResponse)
+leaderboard_adapter = TypeAdapter(LeaderboardResponse)
+
+
+def fastapi_serialize(adapter: TypeAdapter, response) -> bytes:
+    value = adapter.validate_python(response.model_dump())
+    return JSONResponse(adapter.dump_python(value, mode="json")).body
+
+
+async def history_dicts(db, user_id: str) -> bytes:
+    logs = await db[DAILY_LOGS_COLLECTION].find({"user_id": user_id}).sort("date", -1).limit(30).to_list(length=30)
+    entries = [
+        HistoryEntry(
+            date=log["date"],
+            total_emissions=log.get("total_emissions", 0.0),
+            transport_emissions=log.get("transport_emissions", 0.0),
+            electricity_emissions=log.get("electricity_emissions", 0.0),
+            food_emissions=log.get("food_emissions", 0.0),
+            lifestyle_emissions=log.get("lifestyle_emissions", 0.0)
+        )
+        for log in logs
+    ]
+    return fastapi_serialize(history_adapter, HistoryResponse(entries=entries, total_days=len(entries)))
+
+
+async def history_records(db, user_id: str) -> bytes:
+    logs = await find_history(db, user_id, {}, 30)
+    return JSONResponse({"entries": [log.to_history_entry() for log in logs], "total_days": len(logs)}).body
+
+
+async def _leaders(db) -> list:
+    start_date = (END_DATE - timedelta(days=29)).strftime("%Y-%m-%d")
+    return await db[DAILY_LOGS_COLLECTION].aggregate([
+        {"$match": {"date": {"$gte": start_date}}},
+        {"$group": {"_id": "$user_id", "total_emissions": {"$sum": "$total_emissions"}, "log_count": {"$sum": 1}}},
+        {"$project": {
+            "user_id": "$_id",
+            "total_emissions": 1,
+            "average_daily_emissions": {"$divide": ["$total_emissions", "$log_count"]}
+        }},
+        {"$sort": {"average_daily_emissions": 1}},
+        {"$limit": LEADERBOARD_LIMIT}
+    ]).to_list(length=LEADERBOARD_LIMIT)
+
+
+async def leaderboard_dicts(db, results: list) -> bytes:
+    users = await db[USERS_COLLECTION].find(
+        {"_id": {"$in": [ObjectId(result["user_id"]) for result in results]}}
+    ).to_list(length=len(results))
+    names = {str(user["_id"]): user["name"] for user in users}
+    entries = [
+        LeaderboardEntry(
+            rank=idx,
+            user_name=names.get(result["user_id"], "Unknown User"),
+            total_emissions=round(result["total_emissions"], 3),
+            average_daily_emissions=round(result["average_daily_emissions"], 3)
+        )
+        for idx, result in enumerate(results, start=1)
+    ]
+    return fastapi_serialize(leaderboard_adapter, LeaderboardResponse(entries=entries))
+
+
+async def leaderboard_records(db, results: list) -> bytes:
+    names = await find_user_names(db, [result["user_id"] for result in results])
+    entries = [
+        {
+            "rank": idx,
+            "user_name": names.get(result["user_id"], "Unknown User"),
+            "total_emissions": round(result["total_emissions"], 3),
+            "average_daily_emissions": round(result["average_daily_emissions"], 3)
+        }
+        for idx, result in enumerate(results, start=1)
+    ]
+    return JSONResponse({"entries": entries, "user_rank": None, "user_emissions": None}).body
+
+
+async def requests_per_second(call, requests: int, concurrency: int) -> float:
+    queue = iter(range(requests))
+
+    async def worker():
+        for index in queue:
+            await call(index)
+
+    began = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - began)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark dict vs record data paths")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--days", type=int, default=120)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(MONGODB_URL)
+    db = client[BENCH_DATABASE_NAME]
+    try:
+        await client.drop_database(BENCH_DATABASE_NAME)
+        print(f"📥 Loading {args.users} users and {args.users * args.days} daily logs...")
+        user_ids = await load(db, args.users, args.days)
+
+        await memory_per_record(db, min(10000, args.users * args.days))
+
+        # The leaderboard aggregation is identical on both paths; run it once
+        leaders = await _leaders(db)
+        paths = [
+            ("history", "dicts", lambda i: history_dicts(db, user_ids[i % len(user_ids)])),
+            ("history", "records", lambda i: history_records(db, user_ids[i % len(user_ids)])),
+            ("leaderboard", "dicts", lambda i: leaderboard_dicts(db, leaders)),
+            ("leaderboard", "records", lambda i: leaderboard_records(db, leaders)),
+        ]
+        print(f"\n{'route':>11} | {'path':>8} | {'requests/s':>10}")
+        print("-" * 36)
+        for route, path, call in paths:
+            await requests_per_second(call, min(50, args.requests), args.concurrency)  # warm-up
+            rate = await requests_per_second(call, args.requests, args.concurrency)
+            print(f"{route:>11} | {path:>8} | {rate:>10.0f}")
+    finally:
+        await client.drop_database(BENCH_DATABASE_NAME)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
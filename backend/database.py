@@ -7,11 +7,16 @@ from pymongo.errors import ConnectionFailure
 import os
 from dotenv import load_dotenv
 
+from db_utils.monitoring import client_options
+from db_utils.read_routing import PRIMARY, read_profiles
+
 load_dotenv()
 
 class Database:
     client: AsyncIOMotorClient = None
     db = None
+    # Database handles with the read preference/concern of each read profile
+    profiles = {}
 
 database = Database()
 
@@ -21,9 +26,13 @@ async def connect_to_mongo():
     """
     try:
         database.client = AsyncIOMotorClient(
-            os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+            os.getenv("MONGODB_URL", "mongodb://localhost:27017"),
+            **client_options()
         )
         database.db = database.client[os.getenv("DATABASE_NAME", "planetzero")]
+        database.profiles = {
+            name: database.db.with_options(**options) for name, options in read_profiles().items()
+        }
         
         # Test connection
         await database.client.admin.command('ping')
@@ -40,14 +49,27 @@ async def close_mongo_connection():
         database.client.close()
         print("✅ MongoDB connection closed")
 
-def get_database():
+def get_database(profile: str = PRIMARY):
     """
     Get database instance
+
+    Args:
+        profile: Read profile (db_utils/read_routing.py); ANALYTICS routes
+            may be served by secondaries
     """
-    return database.db
+    if profile == PRIMARY:
+        return database.db
+    return database.profiles[profile]
 
 # Collection names
 USERS_COLLECTION = "users"
 CONSENTS_COLLECTION = "consents"
 DAILY_LOGS_COLLECTION = "daily_logs"
 EMISSION_SUMMARIES_COLLECTION = "emission_summaries"
+USER_STATS_COLLECTION = "user_stats"
+LOG_CALENDARS_COLLECTION = "log_calendars"
+CARBON_FOOTPRINTS_COLLECTION = "carbon_footprints"
+PROJECTOR_STATE_COLLECTION = "projector_state"
+
+# Storage layout of carbon_footprints: "document" or "timeseries" (see services/footprint_service.py)
+CARBON_FOOTPRINTS_TIMESERIES = os.getenv("CARBON_FOOTPRINTS_MODE", "document") == "timeseries"
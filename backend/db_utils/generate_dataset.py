@@ -0,0 +1,466 @@
+"""
+Synthetic Dataset Generator for PlanetZero
+Creates a production-sized dataset for load testing and benchmarks, in
+the document shapes the routes write:
+
+- users          signup shape (routes/auth) plus app points/badges;
+                 every user's password is "Password123" and their email
+                 user{N}@loadtest.planetzero.dev
+- consents       routes/consent shape, for --consent-rate of the users
+- daily_logs     routes/daily_log shape, emissions computed with
+                 services/emission_service
+- carbon_footprints and user_stats, derived exactly as the projector does
+- communities and community_members (app/ shape)
+- notifications and notification_counters (app/ shape), as they look in
+  steady state: read ones were read within NOTIFICATION_READ_TTL_DAYS of
+  --end-date (older ones are gone through the TTL index) and unread ones
+  are younger than NOTIFICATION_ARCHIVE_DAYS (older ones are archived).
+  The TTL is checked against the clock, so with an --end-date far in the
+  past mongod removes the read ones once the indexes are built.
+
+Each user logs on a given day with their own probability, drawn around
+--log-frequency; transport modes, diets and countries follow the weighted
+distributions given on the command line ("name=weight,...").
+
+Users are generated in shards by a pool of worker processes, each writing
+unordered insert_many batches over its own connection. Every shard is
+seeded from (--seed, shard number) and ObjectIds are derived from the
+same generator, so a given command line (with a fixed --end-date) always
+produces the same data.
+Indexes are built after loading, which is much faster than maintaining
+them during the inserts. On a replica set the projector resume token is
+set to the end of the load, so the daily log projector does not replay it.
+
+Usage:
+    python -m db_utils.generate_dataset --users 100000 [--days 365] [--workers 8] [--drop]
+        [--log-frequency 0.6] [--modes "bus=3,train=2,car_petrol=3,car_diesel=1,flight=0.05"]
+        [--countries "India=6,United States=2,Germany=1,Brazil=1"] [--diets "veg=4,non_veg=5,vegan=1"]
+        [--communities 500] [--notifications-per-user 5] [--seed 42]
+
+Environment:
+    MONGODB_URL                 target server
+    LOADTEST_DATABASE_NAME      default --database (planetzero_load)
+"""
+import argparse
+import os
+import random
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional
+
+from bson import ObjectId
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import OperationFailure
+
+from app.archive import NOTIFICATION_ARCHIVE_DAYS, NOTIFICATION_READ_TTL_DAYS
+from app.models import CommunityCategory, CommunityRole, NotificationType
+from database import CARBON_FOOTPRINTS_TIMESERIES, PROJECTOR_STATE_COLLECTION
+from db_utils.indexes import INDEXES
+from services.emission_service import calculate_total_emissions
+from services.footprint_service import TIMESERIES_OPTIONS, footprint_from_log
+from services.projector import PROJECTOR_ID
+
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+DEFAULT_DATABASE_NAME = os.getenv("LOADTEST_DATABASE_NAME", "planetzero_load")
+
+EMAIL_DOMAIN = "loadtest.planetzero.dev"
+PASSWORD_HASH = "$2b$12$6ie5A2GJmB7goKi80YmauuYBSB8lTq2uiOf1JEthrO0U2clu3Xyc2"  # "Password123"
+
+DEFAULT_MODES = "bus=3,train=2,car_petrol=3,car_diesel=1,flight=0.05"
+DEFAULT_COUNTRIES = "India=6,United States=2,Germany=1,Brazil=1"
+DEFAULT_DIETS = "veg=4,non_veg=5,vegan=1"
+
+# Typical one-way trip length per mode (km), used as the lognormal median
+TRIP_KM = {"car_petrol": 12.0, "car_diesel": 15.0, "bus": 8.0, "train": 20.0, "flight": 900.0}
+LIFESTYLE_PURCHASE_RATE = 0.04
+NOTIFICATION_READ_RATE = 0.7
+MAX_COMMUNITIES_PER_USER = 3
+EPOCH = datetime(1970, 1, 1)
+
+
+class Distribution(NamedTuple):
+    values: List[str]
+    weights: List[float]
+
+    def pick(self, rng: random.Random) -> str:
+        return rng.choices(self.values, self.weights)[0]
+
+
+def parse_distribution(spec: str) -> Distribution:
+    """Parse "name=weight,name=weight" into a Distribution"""
+    values, weights = [], []
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        values.append(name.strip())
+        weights.append(float(weight) if weight else 1.0)
+    if not values or sum(weights) <= 0:
+        raise argparse.ArgumentTypeError(f"Invalid distribution: {spec!r}")
+    return Distribution(values, weights)
+
+
+class Settings(NamedTuple):
+    database: str
+    seed: int
+    users: int
+    days: int
+    end_date: datetime
+    log_frequency: float
+    modes: Distribution
+    countries: Distribution
+    diets: Distribution
+    consent_rate: float
+    notifications_per_user: float
+    communities: List[str]
+    # user index -> community id the user created
+    community_creators: Dict[int, str]
+    batch_size: int
+
+
+def object_id(moment: datetime, rng: random.Random) -> ObjectId:
+    """Deterministic ObjectId: creation time plus 8 bytes from the shard's generator"""
+    seconds = int((moment - EPOCH).total_seconds())
+    return ObjectId(struct.pack(">IQ", seconds, rng.getrandbits(64)))
+
+
+class ShardWriter:
+    """Buffers documents per collection and flushes them in unordered batches"""
+
+    def __init__(self, db, batch_size: int):
+        self.db = db
+        self.batch_size = batch_size
+        self.buffers: Dict[str, List[dict]] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add(self, collection: str, document: dict) -> None:
+        buffer = self.buffers.setdefault(collection, [])
+        buffer.append(document)
+        if len(buffer) >= self.batch_size:
+            self.flush(collection)
+
+    def flush(self, collection: Optional[str] = None) -> None:
+        for name in [collection] if collection else list(self.buffers):
+            buffer = self.buffers.get(name)
+            if buffer:
+                self.db[name].insert_many(buffer, ordered=False)
+                self.counts[name] = self.counts.get(name, 0) + len(buffer)
+                buffer.clear()
+
+
+def daily_log(user_id: str, day: datetime, settings: Settings, diet: str, rng: random.Random) -> dict:
+    """One day of activity for a user, shaped like routes/daily_log"""
+    transportation = [
+        {"mode": mode, "distance_km": round(TRIP_KM[mode] * rng.lognormvariate(0, 0.5), 1)}
+        for mode in (settings.modes.pick(rng) for _ in range(rng.choice((0, 1, 2, 2, 3))))
+        if mode in TRIP_KM
+    ]
+    electricity_kwh = round(max(0.0, rng.gauss(7.0, 2.5)), 1)
+    # Mostly the user's usual diet, sometimes something else
+    meals = [diet if rng.random() < 0.8 else settings.diets.pick(rng) for _ in range(3)]
+    food = [{"meal_type": meal, "meals_count": meals.count(meal)} for meal in sorted(set(meals))]
+    lifestyle = []
+    if rng.random() < LIFESTYLE_PURCHASE_RATE:
+        lifestyle.append({"category": rng.choice(("clothing", "clothing", "electronics")), "items_count": 1})
+
+    emissions = calculate_total_emissions(
+        transportation_data=transportation,
+        electricity_kwh=electricity_kwh,
+        food_data=food,
+        lifestyle_data=lifestyle
+    )
+    logged_at = day + timedelta(hours=rng.randint(17, 23), minutes=rng.randint(0, 59))
+    return {
+        "_id": object_id(logged_at, rng),
+        "user_id": user_id,
+        "date": day.strftime("%Y-%m-%d"),
+        "transportation": transportation,
+        "electricity_kwh": electricity_kwh,
+        "food": food,
+        "lifestyle": lifestyle,
+        "transport_emissions": emissions["transport_emissions"],
+        "electricity_emissions": emissions["electricity_emissions"],
+        "food_emissions": emissions["food_emissions"],
+        "lifestyle_emissions": emissions["lifestyle_emissions"],
+        "total_emissions": emissions["total_emissions"],
+        "created_at": logged_at,
+        "updated_at": logged_at
+    }
+
+
+def generate_user(index: int, settings: Settings, writer: ShardWriter, rng: random.Random) -> None:
+    """Write one user and everything that belongs to them"""
+    first_day = settings.end_date - timedelta(days=settings.days - 1)
+    signup = first_day + timedelta(days=rng.randrange(settings.days), seconds=rng.randrange(86400))
+    user_oid = object_id(signup, rng)
+    user_id = str(user_oid)
+    country = settings.countries.pick(rng)
+    diet = settings.diets.pick(rng)
+
+    # Per-user logging probability around the configured mean (beta, concentration 4)
+    frequency = min(max(settings.log_frequency, 0.001), 0.999)
+    log_probability = rng.betavariate(4 * frequency, 4 * (1 - frequency))
+
+    total_logs, total_emissions, first_log_date = 0, 0.0, None
+    day = signup.replace(hour=0, minute=0, second=0, microsecond=0)
+    while day <= settings.end_date:
+        if rng.random() < log_probability:
+            log = daily_log(user_id, day, settings, diet, rng)
+            writer.add("daily_logs", log)
+            writer.add("carbon_footprints", footprint_from_log(log))
+            total_logs += 1
+            total_emissions += log["total_emissions"]
+            first_log_date = first_log_date or log["date"]
+        day += timedelta(days=1)
+
+    if total_logs:
+        writer.add("user_stats", {
+            "_id": user_id,
+            "total_logs": total_logs,
+            "total_emissions": total_emissions,
+            "average_daily_emissions": total_emissions / total_logs,
+            "first_log_date": first_log_date,
+            "updated_at": settings.end_date
+        })
+
+    if rng.random() < settings.consent_rate:
+        writer.add("consents", {
+            "_id": object_id(signup, rng),
+            "user_id": user_id,
+            "data_collection": True,
+            "data_usage": True,
+            "analytics": rng.random() < 0.6,
+            "consent_timestamp": signup + timedelta(minutes=5),
+            "created_at": signup + timedelta(minutes=5),
+            "updated_at": signup + timedelta(minutes=5)
+        })
+
+    memberships = []
+    if index in settings.community_creators:
+        memberships.append((settings.community_creators[index], CommunityRole.leader.value))
+    if settings.communities:
+        # Popular communities attract most members (weights ~ 1/rank)
+        for _ in range(rng.randint(0, MAX_COMMUNITIES_PER_USER)):
+            rank = min(int(rng.paretovariate(1.0)) - 1, len(settings.communities) - 1)
+            community_id = settings.communities[rank]
+            if all(community_id != joined for joined, _ in memberships):
+                memberships.append((community_id, CommunityRole.member.value))
+    for community_id, role in memberships:
+        writer.add("community_members", {
+            "_id": object_id(signup, rng),
+            "community_id": community_id,
+            "user_id": user_id,
+            "role": role,
+            "joined_at": signup + timedelta(days=rng.randint(0, 30))
+        })
+
+    unread = 0
+    notifications = int(rng.expovariate(1 / settings.notifications_per_user)) if settings.notifications_per_user else 0
+    # Users who signed up on the last day may do so after its midnight
+    window_end = max(signup, settings.end_date)
+    read_window_start = max(signup, window_end - timedelta(days=NOTIFICATION_READ_TTL_DAYS))
+    unread_window_start = max(signup, window_end - timedelta(days=NOTIFICATION_ARCHIVE_DAYS))
+    for _ in range(notifications):
+        read = rng.random() < NOTIFICATION_READ_RATE
+        if read:
+            read_at = read_window_start + (window_end - read_window_start) * rng.random()
+            created_at = max(signup, read_at - timedelta(hours=rng.randint(1, 72)))
+        else:
+            created_at = unread_window_start + (window_end - unread_window_start) * rng.random()
+        notification = {
+            "_id": object_id(created_at, rng),
+            "user_id": user_id,
+            "type": rng.choice(list(NotificationType)).value,
+            "title": "PlanetZero update",
+            "message": "Keep up the great work reducing your footprint!",
+            "read": read,
+            "created_at": created_at
+        }
+        if read:
+            notification["read_at"] = read_at
+        else:
+            unread += 1
+        writer.add("notifications", notification)
+    if unread:
+        writer.add("notification_counters", {"_id": user_id, "unread": unread})
+
+    writer.add("users", {
+        "_id": user_oid,
+        "email": f"user{index}@{EMAIL_DOMAIN}",
+        "hashed_password": PASSWORD_HASH,
+        "name": f"Load Test User {index}",
+        "age": rng.randint(18, 75),
+        "gender": rng.choice(("female", "male", "other")),
+        "country": country,
+        "city": None,
+        "diet_type": diet,
+        "points": 10 * total_logs + 25 * sum(role == CommunityRole.member.value for _, role in memberships),
+        "badges": [],
+        "role": "user",
+        "created_at": signup,
+        "updated_at": signup,
+        "is_active": True
+    })
+
+
+def generate_shard(settings: Settings, shard: int, start: int, end: int) -> Dict[str, int]:
+    """Worker process entry point: generate users [start, end)"""
+    rng = random.Random(f"{settings.seed}:{shard}")
+    client = MongoClient(MONGODB_URL)
+    try:
+        writer = ShardWriter(client[settings.database], settings.batch_size)
+        for index in range(start, end):
+            generate_user(index, settings, writer, rng)
+        writer.flush()
+        return writer.counts
+    finally:
+        client.close()
+
+
+def create_communities(db, settings_rng: random.Random, count: int, users: int, end_date: datetime):
+    """Community documents and the user index that created each"""
+    communities, creators = [], {}
+    for number in range(count):
+        created_at = end_date - timedelta(days=settings_rng.randint(30, 720))
+        community_id = object_id(created_at, settings_rng)
+        creator = settings_rng.randrange(users)
+        while creator in creators:
+            creator = settings_rng.randrange(users)
+        creators[creator] = str(community_id)
+        communities.append({
+            "_id": community_id,
+            "name": f"Green Circle {number}",
+            "description": "A community working together to cut emissions",
+            "category": settings_rng.choice(list(CommunityCategory)).value,
+            "location": "Online",
+            "creator_id": None,  # set by finalize_communities
+            "members_count": 0,
+            "activities": [],
+            "created_at": created_at,
+            "updated_at": created_at
+        })
+    if communities:
+        db.communities.insert_many(communities, ordered=False)
+    return [str(community["_id"]) for community in communities], creators
+
+
+def finalize_communities(db, creators: Dict[int, str]) -> None:
+    """Set creator ids and member counts from the generated memberships"""
+    creator_ids = {
+        row["community_id"]: row["user_id"]
+        for row in db.community_members.find({"role": CommunityRole.leader.value}, {"community_id": 1, "user_id": 1})
+    }
+    counts = db.community_members.aggregate([{"$group": {"_id": "$community_id", "count": {"$sum": 1}}}])
+    updates = [
+        UpdateOne(
+            {"_id": ObjectId(row["_id"])},
+            {"$set": {"members_count": row["count"], "creator_id": creator_ids.get(row["_id"])}}
+        )
+        for row in counts
+    ]
+    if updates:
+        db.communities.bulk_write(updates, ordered=False)
+
+
+def record_projector_position(db) -> None:
+    """Start the daily log projector after the generated data (replica sets only)"""
+    try:
+        with db.daily_logs.watch() as stream:
+            token = stream.resume_token
+    except OperationFailure:
+        print("⚠️  Not a replica set; the daily log projector will rebuild on its first run")
+        return
+    db[PROJECTOR_STATE_COLLECTION].update_one(
+        {"_id": PROJECTOR_ID},
+        {"$set": {"resume_token": token, "updated_at": datetime.utcnow()}},
+        upsert=True
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic PlanetZero dataset")
+    parser.add_argument("--database", default=DEFAULT_DATABASE_NAME)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--days", type=int, default=365, help="Length of the generated history")
+    parser.add_argument("--end-date", default=None, help="Last generated day, YYYY-MM-DD (default: today)")
+    parser.add_argument("--log-frequency", type=float, default=0.6, help="Mean share of days a user logs")
+    parser.add_argument("--modes", type=parse_distribution, default=parse_distribution(DEFAULT_MODES))
+    parser.add_argument("--countries", type=parse_distribution, default=parse_distribution(DEFAULT_COUNTRIES))
+    parser.add_argument("--diets", type=parse_distribution, default=parse_distribution(DEFAULT_DIETS))
+    parser.add_argument("--consent-rate", type=float, default=0.95)
+    parser.add_argument("--communities", type=int, default=500)
+    parser.add_argument("--notifications-per-user", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--shard-size", type=int, default=1000, help="Users per worker task")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Documents per insert_many")
+    parser.add_argument("--drop", action="store_true", help="Drop the database first")
+    args = parser.parse_args()
+
+    end_date = (
+        datetime.strptime(args.end_date, "%Y-%m-%d") if args.end_date
+        else datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    )
+    client = MongoClient(MONGODB_URL)
+    db = client[args.database]
+    began = time.perf_counter()
+
+    if args.drop:
+        client.drop_database(args.database)
+        print(f"🗑️  Dropped database '{args.database}'")
+    elif db.users.estimated_document_count():
+        raise SystemExit(f"❌ Database '{args.database}' already has users; use --drop or another --database")
+
+    if CARBON_FOOTPRINTS_TIMESERIES:
+        db.create_collection("carbon_footprints", timeseries=TIMESERIES_OPTIONS)
+
+    communities, creators = create_communities(
+        db, random.Random(f"{args.seed}:communities"), min(args.communities, args.users), args.users, end_date
+    )
+    settings = Settings(
+        database=args.database,
+        seed=args.seed,
+        users=args.users,
+        days=args.days,
+        end_date=end_date,
+        log_frequency=args.log_frequency,
+        modes=args.modes,
+        countries=args.countries,
+        diets=args.diets,
+        consent_rate=args.consent_rate,
+        notifications_per_user=args.notifications_per_user,
+        communities=communities,
+        community_creators=creators,
+        batch_size=args.batch_size
+    )
+
+    print(f"📥 Generating {args.users} users over {args.days} days with {args.workers} workers...")
+    totals: Dict[str, int] = {"communities": len(communities)}
+    shards = [(shard, start, min(start + args.shard_size, args.users))
+              for shard, start in enumerate(range(0, args.users, args.shard_size))]
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(generate_shard, settings, shard, start, end) for shard, start, end in shards]
+        for done, future in enumerate(futures, 1):
+            for collection, count in future.result().items():
+                totals[collection] = totals.get(collection, 0) + count
+            if done % max(1, len(futures) // 20) == 0 or done == len(futures):
+                logs = totals.get("daily_logs", 0)
+                elapsed = time.perf_counter() - began
+                print(f"   {done}/{len(futures)} shards, {logs} daily logs ({logs / elapsed:.0f} logs/s)")
+
+    finalize_communities(db, creators)
+
+    print("🔧 Building indexes...")
+    for collection_name, indexes in INDEXES.items():
+        db[collection_name].create_indexes(indexes)
+    record_projector_position(db)
+    client.close()
+
+    elapsed = time.perf_counter() - began
+    print(f"\n✅ Generated dataset '{args.database}' in {elapsed:.0f}s")
+    for collection, count in sorted(totals.items()):
+        print(f"   {collection:>22}: {count}")
+
+
+if __name__ == "__main__":
+    main()
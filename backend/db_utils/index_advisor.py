@@ -0,0 +1,316 @@
+"""
+Index Advisor for PlanetZero
+Runs the query shapes the routes actually issue through
+explain("executionStats") and flags plans that will not scale
+
+A shape is flagged when its winning plan contains a COLLSCAN or an
+in-memory SORT, or when it examines many more documents than it returns.
+For flagged shapes an index is proposed following the equality-sort-range
+rule, and --apply creates it.
+
+Modes:
+    python -m db_utils.index_advisor [--database planetzero] [--max-ratio 10] [--apply]
+        Explain every shape against an existing database (real data gives
+        meaningful examined/returned ratios)
+    python -m db_utils.index_advisor --check
+        Create the declared indexes (create_all_indexes) in a throwaway
+        database on the local mongod, explain every shape, drop the
+        database and exit non-zero if any shape is flagged. The same check
+        runs in the test suite (tests/test_index_advisor.py).
+
+Environment:
+    MONGODB_URL                 mongod to explain against
+    INDEX_CHECK_DATABASE_NAME   throwaway database for --check
+                                (default: planetzero_index_check)
+"""
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import IndexModel
+
+from db_utils.indexes import create_all_indexes
+
+DEFAULT_MAX_RATIO = 10
+CHECK_DATABASE_NAME = os.getenv("INDEX_CHECK_DATABASE_NAME", "planetzero_index_check")
+
+# Representative parameter values; only the shape matters to the planner
+USER_ID = str(ObjectId())
+COMMUNITY_ID = str(ObjectId())
+DATE_FROM = "2026-01-01"
+DATE_TO = "2026-01-31"
+TIMESTAMP = datetime(2026, 1, 1)
+NAME_COLLATION = {"locale": "en", "strength": 2}
+
+
+class QueryShape(NamedTuple):
+    name: str
+    collection: str
+    filter: Dict[str, Any]
+    sort: Optional[List[Tuple[str, int]]] = None
+    pipeline: Optional[List[dict]] = None
+    collation: Optional[dict] = None
+    limit: int = 0
+
+
+QUERY_SHAPES: List[QueryShape] = [
+    # users
+    QueryShape("auth: user by email", "users", {"email": "user@example.com"}),
+    QueryShape("leaderboard (app): top users by points", "users", {}, sort=[("points", -1)], limit=10),
+    QueryShape("leaderboard (app): users ranked above", "users", {"points": {"$gt": 100}}),
+
+    # consents
+    QueryShape("consent: by user", "consents", {"user_id": USER_ID}),
+
+    # daily_logs
+    QueryShape("daily log: by user and date", "daily_logs", {"user_id": USER_ID, "date": DATE_FROM}),
+    QueryShape(
+        "history: user logs in range, newest first",
+        "daily_logs",
+        {"user_id": USER_ID, "date": {"$gte": DATE_FROM, "$lte": DATE_TO}},
+        sort=[("date", -1)],
+        limit=30
+    ),
+    QueryShape("activities (app): recent logs", "daily_logs", {"user_id": USER_ID}, sort=[("date", -1)], limit=50),
+    QueryShape(
+        "activities (app): stats in range",
+        "daily_logs",
+        {},
+        pipeline=[
+            {"$match": {"user_id": USER_ID, "date": {"$gte": DATE_FROM, "$lte": DATE_TO}}},
+            {"$group": {"_id": None, "total_logs": {"$sum": 1}}}
+        ]
+    ),
+    QueryShape(
+        "leaderboard: period averages",
+        "daily_logs",
+        {},
+        pipeline=[
+            {"$match": {"date": {"$gte": DATE_FROM}}},
+            {"$group": {"_id": "$user_id", "total_emissions": {"$sum": "$total_emissions"}, "log_count": {"$sum": 1}}}
+        ]
+    ),
+    # user_stats
+    QueryShape(
+        "leaderboard: all-time averages",
+        "user_stats",
+        {"average_daily_emissions": {"$exists": True}},
+        sort=[("average_daily_emissions", 1)],
+        limit=10
+    ),
+    QueryShape("leaderboard: all-time rank", "user_stats", {"average_daily_emissions": {"$lt": 5.0}}),
+
+    # carbon_footprints
+    QueryShape(
+        "charts: footprints in range",
+        "carbon_footprints",
+        {"user_id": USER_ID, "date": {"$gte": TIMESTAMP, "$lte": TIMESTAMP}},
+        sort=[("date", 1)]
+    ),
+    QueryShape("projector: footprints of deleted logs", "carbon_footprints", {"daily_log_id": {"$in": [ObjectId()]}}),
+
+    # notifications
+    QueryShape(
+        "notifications: inbox page",
+        "notifications",
+        {"user_id": USER_ID},
+        sort=[("created_at", -1), ("_id", -1)],
+        limit=51
+    ),
+    QueryShape(
+        "notifications: unread page",
+        "notifications",
+        {"user_id": USER_ID, "read": False},
+        sort=[("created_at", -1), ("_id", -1)],
+        limit=51
+    ),
+    QueryShape("notifications: archiver batch", "notifications", {"created_at": {"$lt": TIMESTAMP}}, sort=[("created_at", 1), ("_id", 1)], limit=1000),
+    QueryShape("activity history: archiver batch", "activity_history", {"timestamp": {"$lt": TIMESTAMP}}, sort=[("timestamp", 1), ("_id", 1)], limit=1000),
+
+    # communities
+    QueryShape(
+        "communities: newest in category",
+        "communities",
+        {"category": "transport"},
+        sort=[("created_at", -1), ("_id", -1)],
+        limit=21
+    ),
+    QueryShape(
+        "communities: autocomplete",
+        "communities",
+        {"name": {"$gte": "gre", "$lt": "gre\uffff"}},
+        sort=[("name", 1)],
+        collation=NAME_COLLATION,
+        limit=10
+    ),
+    QueryShape("communities: memberships of user", "community_members", {"user_id": USER_ID}),
+    QueryShape("communities: membership check", "community_members", {"community_id": COMMUNITY_ID, "user_id": USER_ID}),
+    QueryShape(
+        "communities: members page",
+        "community_members",
+        {"community_id": COMMUNITY_ID},
+        sort=[("joined_at", 1), ("_id", 1)],
+        limit=51
+    ),
+    QueryShape(
+        "communities: footprint leaderboard",
+        "community_rollups",
+        {"period": "2026-01", "average_emissions": {"$gte": 0}},
+        sort=[("average_emissions", 1)],
+        limit=10
+    ),
+
+    # archives
+    QueryShape("archive: user month", "archives", {"collection": "notifications", "user_id": USER_ID, "month": "2026-01"}),
+]
+
+
+def _stages(plan: dict):
+    """Yield every stage in an explain plan tree"""
+    yield plan.get("stage")
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            yield from _stages(plan[key])
+    for child in plan.get("inputStages", []):
+        yield from _stages(child)
+
+
+def _execution(explain: dict) -> Tuple[dict, dict]:
+    """(winning plan, execution stats) from a find or aggregate explain"""
+    if "stages" in explain:
+        # Aggregation: the first stage wraps the underlying query
+        cursor = explain["stages"][0].get("$cursor", {})
+        return cursor.get("queryPlanner", {}).get("winningPlan", {}), cursor.get("executionStats", {})
+    return explain.get("queryPlanner", {}).get("winningPlan", {}), explain.get("executionStats", {})
+
+
+def _is_equality(value: Any) -> bool:
+    return not (isinstance(value, dict) and any(key.startswith("$") for key in value))
+
+
+def propose_index(shape: QueryShape) -> Optional[List[Tuple[str, int]]]:
+    """Index keys for a shape: equality fields, then sort fields, then range fields"""
+    query = shape.pipeline[0].get("$match", {}) if shape.pipeline else shape.filter
+    equality = [(field, 1) for field, value in query.items() if not field.startswith("$") and _is_equality(value)]
+    ranges = [(field, 1) for field, value in query.items() if not field.startswith("$") and not _is_equality(value)]
+
+    keys = list(equality)
+    for field, direction in shape.sort or []:
+        if field not in dict(keys):
+            keys.append((field, direction))
+    for field, direction in ranges:
+        if field not in dict(keys):
+            keys.append((field, direction))
+    return keys or None
+
+
+async def explain_shape(db, shape: QueryShape) -> dict:
+    """Explain one shape with executionStats and summarise the plan"""
+    if shape.pipeline is not None:
+        command = {"aggregate": shape.collection, "pipeline": shape.pipeline, "cursor": {}}
+    else:
+        command = {"find": shape.collection, "filter": shape.filter}
+        if shape.sort:
+            command["sort"] = dict(shape.sort)
+        if shape.limit:
+            command["limit"] = shape.limit
+    if shape.collation:
+        command["collation"] = shape.collation
+
+    explain = await db.command("explain", command, verbosity="executionStats")
+    plan, stats = _execution(explain)
+    stages = [stage for stage in _stages(plan) if stage]
+    examined = stats.get("totalDocsExamined", 0)
+    returned = stats.get("nReturned", 0)
+
+    return {
+        "shape": shape,
+        "stages": stages,
+        "collscan": "COLLSCAN" in stages,
+        "blocking_sort": "SORT" in stages,
+        "examined": examined,
+        "returned": returned,
+        "ratio": examined / max(returned, 1),
+        "millis": stats.get("executionTimeMillis", 0)
+    }
+
+
+def problems(result: dict, max_ratio: float) -> List[str]:
+    """Reasons a shape is flagged (empty if the plan is fine)"""
+    reasons = []
+    if result["collscan"]:
+        reasons.append("COLLSCAN")
+    if result["blocking_sort"]:
+        reasons.append("in-memory SORT")
+    if result["examined"] and result["ratio"] > max_ratio:
+        reasons.append(f"examined/returned {result['examined']}/{result['returned']}")
+    return reasons
+
+
+async def advise(db, max_ratio: float = DEFAULT_MAX_RATIO, apply: bool = False) -> List[Tuple[str, List[str]]]:
+    """Explain every shape, print a report and return the flagged shapes with their reasons"""
+    flagged = []
+    for shape in QUERY_SHAPES:
+        result = await explain_shape(db, shape)
+        reasons = problems(result, max_ratio)
+        plan = " <- ".join(result["stages"])
+
+        if not reasons:
+            print(f"✅ {shape.name}: {plan}")
+            continue
+
+        flagged.append((shape.name, reasons))
+        keys = propose_index(shape)
+        print(f"❌ {shape.collection} | {shape.name}: {', '.join(reasons)} [{plan}]")
+        if keys:
+            print(f"   💡 proposed index on {shape.collection}: {keys}")
+            if apply:
+                name = "idx_" + "_".join(field for field, _ in keys)
+                options = {"collation": shape.collation} if shape.collation else {}
+                await db[shape.collection].create_indexes([IndexModel(keys, name=name, **options)])
+                print(f"   ✅ created {name}")
+    return flagged
+
+
+async def check(client: AsyncIOMotorClient, max_ratio: float = DEFAULT_MAX_RATIO) -> List[Tuple[str, List[str]]]:
+    """Explain every shape against the declared indexes in a throwaway database"""
+    db = client[CHECK_DATABASE_NAME]
+    await client.drop_database(CHECK_DATABASE_NAME)
+    try:
+        await create_all_indexes(db)
+        return await advise(db, max_ratio=max_ratio)
+    finally:
+        await client.drop_database(CHECK_DATABASE_NAME)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Explain the app's query shapes and propose indexes")
+    parser.add_argument("--database", default=os.getenv("DATABASE_NAME", "planetzero"))
+    parser.add_argument("--max-ratio", type=float, default=DEFAULT_MAX_RATIO,
+                        help="Flag shapes examining more than this many documents per result")
+    parser.add_argument("--apply", action="store_true", help="Create proposed indexes")
+    parser.add_argument("--check", action="store_true",
+                        help="Verify declared indexes cover every shape in a throwaway database")
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(os.getenv("MONGODB_URL", "mongodb://localhost:27017"))
+    try:
+        if args.check:
+            flagged = await check(client, max_ratio=args.max_ratio)
+        else:
+            flagged = await advise(client[args.database], max_ratio=args.max_ratio, apply=args.apply)
+    finally:
+        client.close()
+
+    print(f"\n{'🎉 All query shapes are index-backed' if not flagged else f'⚠️  {len(flagged)} query shapes flagged'}")
+    if args.check and flagged:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,289 @@
+"""
+Index Reconciliation for PlanetZero
+Compares the declared indexes (db_utils/indexes.INDEXES) with
+index_information() on the live database
+
+For every collection an index is:
+- missing:     declared but not present under its name
+- conflicting: present under its name with different keys or options
+- extra:       present but not declared (the _id index is ignored)
+
+On startup (main.lifespan) sync_indexes() runs as a background task: it
+builds missing indexes one at a time and only reports conflicting and
+extra ones, so the API starts serving immediately and never drops
+anything on its own.
+
+Migration mode rolls out changes that need more than a build:
+- TTL changes are applied in place with collMod
+- indexes whose keys or options (unique, partial filter, collation)
+  changed are first covered by a temporary stand-in (name + "_next") with
+  the declared options, then the old index is dropped, the declared one
+  built and the stand-in dropped, so queries keep an index and unique
+  constraints stay enforced throughout. If the stand-in cannot be built
+  (e.g. duplicates under a new unique constraint) nothing is dropped.
+- text indexes are dropped and rebuilt (a collection has at most one text
+  index, so there is no stand-in); if the rebuild fails the old index is
+  restored
+- extra indexes are hidden (--hide-extra, reversible with collMod) or
+  dropped (--drop-extra)
+
+Usage:
+    python -m db_utils.index_sync [--migrate] [--dry-run] [--hide-extra | --drop-extra]
+"""
+import argparse
+import asyncio
+from typing import Dict, List, NamedTuple, Tuple
+
+from pymongo import IndexModel
+from pymongo.errors import OperationFailure, PyMongoError
+
+from database import connect_to_mongo, close_mongo_connection, get_database
+from db_utils.indexes import INDEXES
+
+COMPARED_OPTIONS = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression", "weights")
+TEMPORARY_SUFFIX = "_next"
+TEMPORARY_FIELD = "_index_migration"
+
+
+class IndexDrift(NamedTuple):
+    collection: str
+    missing: List[IndexModel]
+    # (declared, existing index_information() entry, differences)
+    conflicting: List[Tuple[IndexModel, dict, List[str]]]
+    extra: List[str]
+
+
+def _normalize_keys(keys) -> List[Tuple[str, object]]:
+    return [(field, int(direction) if isinstance(direction, (int, float)) else direction) for field, direction in keys]
+
+
+def _is_text(keys) -> bool:
+    return any(direction == "text" for _, direction in keys)
+
+
+def differences(declared: dict, existing: dict) -> List[str]:
+    """How an existing index differs from its declared definition"""
+    diffs = []
+    declared_keys = _normalize_keys(declared["key"].items())
+    existing_keys = _normalize_keys(existing["key"])
+
+    # Text indexes are stored as _fts/_ftsx; their fields show up in weights
+    if not (_is_text(declared_keys) and ("_fts", "text") in existing_keys) and declared_keys != existing_keys:
+        diffs.append(f"keys {existing_keys} -> {declared_keys}")
+
+    for option in COMPARED_OPTIONS:
+        if option == "weights" and not _is_text(declared_keys):
+            continue
+        wanted = declared.get(option)
+        if option == "weights" and wanted is None:
+            wanted = {field: 1 for field, direction in declared_keys if direction == "text"}
+        actual = existing.get(option)
+        if option == "unique" or option == "sparse":
+            wanted, actual = bool(wanted), bool(actual)
+        if wanted != actual:
+            diffs.append(f"{option} {actual!r} -> {wanted!r}")
+
+    wanted_collation = declared.get("collation")
+    actual_collation = existing.get("collation")
+    if wanted_collation or actual_collation:
+        if not wanted_collation or not actual_collation or any(
+            actual_collation.get(key) != value for key, value in wanted_collation.items()
+        ):
+            diffs.append(f"collation {actual_collation!r} -> {wanted_collation!r}")
+
+    return diffs
+
+
+async def diff_indexes(db) -> List[IndexDrift]:
+    """Compare declared and live indexes for every declared collection"""
+    drift = []
+    for collection_name, declared in INDEXES.items():
+        existing = await db[collection_name].index_information()
+        declared_names = set()
+        missing, conflicting = [], []
+
+        for model in declared:
+            document = model.document
+            declared_names.add(document["name"])
+            info = existing.get(document["name"])
+            if info is None:
+                missing.append(model)
+                continue
+            diffs = differences(document, info)
+            if diffs:
+                conflicting.append((model, info, diffs))
+
+        extra = sorted(
+            name for name in existing
+            if name != "_id_" and name not in declared_names and not name.endswith(TEMPORARY_SUFFIX)
+        )
+        if missing or conflicting or extra:
+            drift.append(IndexDrift(collection_name, missing, conflicting, extra))
+    return drift
+
+
+def report(drift: List[IndexDrift]) -> None:
+    """Print conflicting and extra indexes"""
+    for entry in drift:
+        for model, _, diffs in entry.conflicting:
+            print(f"⚠️  {entry.collection}.{model.document['name']} differs from its definition: {'; '.join(diffs)}")
+        for name in entry.extra:
+            print(f"⚠️  {entry.collection}.{name} is not declared in db_utils/indexes.py")
+
+
+async def sync_indexes(db) -> Dict[str, int]:
+    """
+    Build missing indexes one at a time and report drift
+
+    Safe to run on every startup: it never drops or modifies existing
+    indexes. Returns counts of built, failed, conflicting and extra indexes.
+    """
+    summary = {"built": 0, "failed": 0, "conflicting": 0, "extra": 0}
+    try:
+        drift = await diff_indexes(db)
+    except PyMongoError as e:
+        print(f"❌ Could not read index information: {e}")
+        return summary
+    report(drift)
+
+    for entry in drift:
+        summary["conflicting"] += len(entry.conflicting)
+        summary["extra"] += len(entry.extra)
+        for model in entry.missing:
+            name = model.document["name"]
+            try:
+                await db[entry.collection].create_indexes([model])
+                summary["built"] += 1
+                print(f"✅ Built index {entry.collection}.{name}")
+            except OperationFailure as e:
+                summary["failed"] += 1
+                print(f"❌ Failed to build index {entry.collection}.{name}: {e}")
+
+    if not drift:
+        print("✅ Indexes match their definitions")
+    return summary
+
+
+def _restore_model(name: str, info: dict) -> IndexModel:
+    """IndexModel recreating an existing index from its index_information() entry"""
+    options = {key: value for key, value in info.items() if key not in ("v", "key", "ns")}
+    return IndexModel(info["key"], name=name, **options)
+
+
+def _temporary_model(model: IndexModel) -> IndexModel:
+    """
+    Stand-in for a declared index while the old one is replaced
+
+    MongoDB rejects two indexes with the same keys, so the stand-in appends
+    a field no document has; it still serves every query the declared
+    index serves, and a unique stand-in enforces the same constraint.
+    TTL only applies to single-field indexes and is left out.
+    """
+    document = dict(model.document)
+    keys = list(document.pop("key").items()) + [(TEMPORARY_FIELD, 1)]
+    document.pop("expireAfterSeconds", None)
+    document["name"] = document["name"] + TEMPORARY_SUFFIX
+    return IndexModel(keys, **document)
+
+
+async def _migrate_conflict(collection, model: IndexModel, info: dict, diffs: List[str], dry_run: bool) -> None:
+    document = model.document
+    name = document["name"]
+    declared_keys = _normalize_keys(document["key"].items())
+
+    if all(diff.startswith("expireAfterSeconds") for diff in diffs):
+        print(f"🔧 {collection.name}.{name}: collMod expireAfterSeconds={document['expireAfterSeconds']}")
+        if not dry_run:
+            await collection.database.command(
+                "collMod", collection.name,
+                index={"name": name, "expireAfterSeconds": document["expireAfterSeconds"]}
+            )
+        return
+
+    if not _is_text(declared_keys) and not _is_text(_normalize_keys(info["key"])):
+        temporary = name + TEMPORARY_SUFFIX
+        print(
+            f"🔧 {collection.name}.{name}: build {temporary}, drop old, build {name}, drop {temporary} "
+            f"({'; '.join(diffs)})"
+        )
+        if dry_run:
+            return
+        try:
+            await collection.create_indexes([_temporary_model(model)])
+        except OperationFailure as e:
+            print(f"❌ Could not build {collection.name}.{temporary}, keeping the previous index: {e}")
+            return
+        await collection.drop_index(name)
+        try:
+            await collection.create_indexes([model])
+        except OperationFailure as e:
+            print(f"❌ Build of {collection.name}.{name} failed, {temporary} stays in place: {e}")
+            return
+        await collection.drop_index(temporary)
+        return
+
+    print(f"🔧 {collection.name}.{name}: drop and rebuild text index ({'; '.join(diffs)})")
+    if not dry_run:
+        await collection.drop_index(name)
+        try:
+            await collection.create_indexes([model])
+        except OperationFailure as e:
+            print(f"❌ Rebuild of {collection.name}.{name} failed, restoring the previous index: {e}")
+            await collection.create_indexes([_restore_model(name, info)])
+
+
+async def migrate(db, dry_run: bool = False, hide_extra: bool = False, drop_extra: bool = False) -> None:
+    """Roll out index changes: build missing, fix conflicting, optionally hide/drop extra"""
+    drift = await diff_indexes(db)
+    for entry in drift:
+        collection = db[entry.collection]
+        for model in entry.missing:
+            print(f"🔧 {entry.collection}.{model.document['name']}: build")
+            if not dry_run:
+                await collection.create_indexes([model])
+        for model, info, diffs in entry.conflicting:
+            await _migrate_conflict(collection, model, info, diffs, dry_run)
+        for name in entry.extra:
+            if drop_extra:
+                print(f"🔧 {entry.collection}.{name}: drop")
+                if not dry_run:
+                    await collection.drop_index(name)
+            elif hide_extra:
+                print(f"🔧 {entry.collection}.{name}: hide")
+                if not dry_run:
+                    await db.command("collMod", entry.collection, index={"name": name, "hidden": True})
+            else:
+                print(f"⚠️  {entry.collection}.{name} is not declared (use --hide-extra or --drop-extra)")
+
+    if not drift:
+        print("✅ Indexes match their definitions")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Reconcile declared indexes with the database")
+    parser.add_argument("--migrate", action="store_true", help="Fix conflicting indexes, not only build missing ones")
+    parser.add_argument("--dry-run", action="store_true", help="Only print the planned changes")
+    extra = parser.add_mutually_exclusive_group()
+    extra.add_argument("--hide-extra", action="store_true", help="Hide undeclared indexes (reversible)")
+    extra.add_argument("--drop-extra", action="store_true", help="Drop undeclared indexes")
+    args = parser.parse_args()
+
+    await connect_to_mongo()
+    try:
+        db = get_database()
+        if args.migrate:
+            await migrate(db, dry_run=args.dry_run, hide_extra=args.hide_extra, drop_extra=args.drop_extra)
+        elif args.dry_run:
+            drift = await diff_indexes(db)
+            report(drift)
+            for entry in drift:
+                for model in entry.missing:
+                    print(f"🔧 {entry.collection}.{model.document['name']}: build")
+        else:
+            await sync_indexes(db)
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,20 +2,60 @@
 MongoDB Index Creation for PlanetZero
 Creates all necessary indexes for optimal query performance
 """
+from typing import Dict, List
+
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from pymongo import IndexModel, ASCENDING, DESCENDING
+from pymongo import IndexModel, ASCENDING, DESCENDING, TEXT
 
+from app.archive import NOTIFICATION_READ_TTL_DAYS
+from database import CARBON_FOOTPRINTS_TIMESERIES
 
-async def create_all_indexes(db: AsyncIOMotorDatabase):
-    """
-    Create all collection indexes.
-    Should be run on application startup or via migration script.
-    """
-    
+# carbon_footprints layouts (CARBON_FOOTPRINTS_MODE, see services/footprint_service.py)
+DOCUMENT_FOOTPRINT_INDEXES = [
+    IndexModel(
+        [("user_id", ASCENDING), ("date", DESCENDING)],
+        unique=True,
+        name="idx_user_date_unique"
+    ),
+    IndexModel(
+        [("date", DESCENDING)],
+        name="idx_date"
+    ),
+    IndexModel(
+        [("total_emissions", DESCENDING)],
+        name="idx_total_emissions"
+    ),
+    IndexModel(
+        [("created_at", DESCENDING)],
+        name="idx_created_at"
+    ),
+    IndexModel(
+        [("daily_log_id", ASCENDING)],
+        name="idx_daily_log_id"
+    )
+]
+
+# Time-series carbon_footprints: no unique indexes; MongoDB 6.3+ creates
+# this (metaField, timeField) index itself, older servers get it built
+TIMESERIES_FOOTPRINT_INDEXES = [
+    IndexModel(
+        [("user_id", ASCENDING), ("date", ASCENDING)],
+        name="user_id_1_date_1"
+    ),
+    IndexModel(
+        [("daily_log_id", ASCENDING)],
+        name="idx_daily_log_id"
+    )
+]
+
+
+# Declared indexes per collection; db_utils/index_sync reconciles these
+# against the live database
+INDEXES: Dict[str, List[IndexModel]] = {
     # ============================================================================
     # COLLECTION 1: USERS
     # ============================================================================
-    await db.users.create_indexes([
+    "users": [
         IndexModel(
             [("email", ASCENDING)],
             unique=True,
@@ -32,14 +72,17 @@ async def create_all_indexes(db: AsyncIOMotorDatabase):
         IndexModel(
             [("created_at", DESCENDING)],
             name="idx_created_at"
+        ),
+        IndexModel(
+            [("points", DESCENDING)],
+            name="idx_points"
         )
-    ])
-    print("✅ Created indexes for 'users' collection")
+    ],
     
     # ============================================================================
-    # COLLECTION 2: USER_CONSENTS
+    # COLLECTION 2: CONSENTS
     # ============================================================================
-    await db.user_consents.create_indexes([
+    "consents": [
         IndexModel(
             [("user_id", ASCENDING)],
             name="idx_user_id"
@@ -52,13 +95,12 @@ async def create_all_indexes(db: AsyncIOMotorDatabase):
             [("user_id", ASCENDING), ("consent_version", ASCENDING)],
             name="idx_user_consent_version"
         )
-    ])
-    print("✅ Created indexes for 'user_consents' collection")
+    ],
     
     # ============================================================================
     # COLLECTION 3: PROFILES
     # ============================================================================
-    await db.profiles.create_indexes([
+    "profiles": [
         IndexModel(
             [("user_id", ASCENDING)],
             unique=True,
@@ -76,13 +118,12 @@ async def create_all_indexes(db: AsyncIOMotorDatabase):
             [("diet_type", ASCENDING)],
             name="idx_diet_type"
         )
-    ])
-    print("✅ Created indexes for 'profiles' collection")
+    ],
     
     # ============================================================================
     # COLLECTION 4: DAILY_LOGS
     # ============================================================================
-    await db.daily_logs.create_indexes([
+    "daily_logs": [
         IndexModel(
             [("user_id", ASCENDING), ("date", DESCENDING)],
             unique=True,
@@ -96,13 +137,12 @@ async def create_all_indexes(db: AsyncIOMotorDatabase):
             [("created_at", DESCENDING)],
             name="idx_created_at"
         )
-    ])
-    print("✅ Created indexes for 'daily_logs' collection")
+    ],
     
     # ============================================================================
     # COLLECTION 5: EMISSION_FACTORS
     # ============================================================================
-    await db.emission_factors.create_indexes([
+    "emission_factors": [
         IndexModel(
             [("category", ASCENDING)],
             name="idx_category"
@@ -119,37 +159,17 @@ async def create_all_indexes(db: AsyncIOMotorDatabase):
             [("updated_at", DESCENDING)],
             name="idx_updated_at"
         )
-    ])
-    print("✅ Created indexes for 'emission_factors' collection")
+    ],
     
     # ============================================================================
     # COLLECTION 6: CARBON_FOOTPRINTS
     # ============================================================================
-    await db.carbon_footprints.create_indexes([
-        IndexModel(
-            [("user_id", ASCENDING), ("date", DESCENDING)],
-            unique=True,
-            name="idx_user_date_unique"
-        ),
-        IndexModel(
-            [("date", DESCENDING)],
-            name="idx_date"
-        ),
-        IndexModel(
-            [("total_emissions", DESCENDING)],
-            name="idx_total_emissions"
-        ),
-        IndexModel(
-            [("created_at", DESCENDING)],
-            name="idx_created_at"
-        )
-    ])
-    print("✅ Created indexes for 'carbon_footprints' collection")
+    "carbon_footprints": TIMESERIES_FOOTPRINT_INDEXES if CARBON_FOOTPRINTS_TIMESERIES else DOCUMENT_FOOTPRINT_INDEXES,
     
     # ============================================================================
     # COLLECTION 7: RECOMMENDATIONS
     # ============================================================================
-    await db.recommendations.create_indexes([
+    "recommendations": [
         IndexModel(
             [("user_id", ASCENDING)],
             name="idx_user_id"
@@ -170,13 +190,12 @@ async def create_all_indexes(db: AsyncIOMotorDatabase):
             [("user_id", ASCENDING), ("is_applied", ASCENDING)],
             name="idx_user_applied"
         )
-    ])
-    print("✅ Created indexes for 'recommendations' collection")
+    ],
     
     # ============================================================================
     # COLLECTION 8: LEADERBOARD
     # ============================================================================
-    await db.leaderboard.create_indexes([
+    "leaderboard": [
         IndexModel(
             [("period", ASCENDING), ("rank", ASCENDING)],
             name="idx_period_rank"
@@ -193,13 +212,12 @@ async def create_all_indexes(db: AsyncIOMotorDatabase):
             [("period", ASCENDING), ("score", ASCENDING)],
             name="idx_period_score"
         )
-    ])
-    print("✅ Created indexes for 'leaderboard' collection")
+    ],
     
     # ============================================================================
     # COLLECTION 9: COMMUNITY_POSTS
     # ============================================================================
-    await db.community_posts.create_indexes([
+    "community_posts": [
         IndexModel(
             [("user_id", ASCENDING)],
             name="idx_user_id"
@@ -216,13 +234,12 @@ async def create_all_indexes(db: AsyncIOMotorDatabase):
             [("comments_count", DESCENDING)],
             name="idx_comments_count"
         )
-    ])
-    print("✅ Created indexes for 'community_posts' collection")
+    ],
     
     # ============================================================================
     # COLLECTION 10: COMMUNITY_COMMENTS
     # ============================================================================
-    await db.community_comments.create_indexes([
+    "community_comments": [
         IndexModel(
             [("post_id", ASCENDING), ("created_at", ASCENDING)],
             name="idx_post_created"
@@ -235,13 +252,12 @@ async def create_all_indexes(db: AsyncIOMotorDatabase):
             [("created_at", DESCENDING)],
             name="idx_created_at"
         )
-    ])
-    print("✅ Created indexes for 'community_comments' collection")
+    ],
     
     # ============================================================================
     # COLLECTION 11: ACTIVITY_HISTORY
     # ============================================================================
-    await db.activity_history.create_indexes([
+    "activity_history": [
         IndexModel(
             [("user_id", ASCENDING), ("timestamp", DESCENDING)],
             name="idx_user_timestamp"
@@ -251,34 +267,124 @@ async def create_all_indexes(db: AsyncIOMotorDatabase):
             name="idx_action"
         ),
         IndexModel(
-            [("timestamp", DESCENDING)],
-            name="idx_timestamp"
+            [("timestamp", ASCENDING), ("_id", ASCENDING)],
+            name="idx_timestamp_id"
         )
-    ])
-    print("✅ Created indexes for 'activity_history' collection")
+    ],
     
     # ============================================================================
     # COLLECTION 12: NOTIFICATIONS
     # ============================================================================
-    await db.notifications.create_indexes([
+    "notifications": [
         IndexModel(
-            [("user_id", ASCENDING), ("is_read", ASCENDING)],
-            name="idx_user_is_read"
+            [("user_id", ASCENDING), ("read", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="idx_user_read_created_id"
         ),
         IndexModel(
-            [("user_id", ASCENDING), ("created_at", DESCENDING)],
-            name="idx_user_created"
+            [("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="idx_user_created_id"
         ),
         IndexModel(
             [("type", ASCENDING)],
             name="idx_type"
         ),
         IndexModel(
-            [("created_at", DESCENDING)],
-            name="idx_created_at"
+            [("created_at", ASCENDING), ("_id", ASCENDING)],
+            name="idx_created_at_id"
+        ),
+        # Read notifications expire NOTIFICATION_READ_TTL_DAYS after being read
+        IndexModel(
+            [("read_at", ASCENDING)],
+            expireAfterSeconds=NOTIFICATION_READ_TTL_DAYS * 24 * 3600,
+            partialFilterExpression={"read": True},
+            name="idx_read_at_ttl"
+        )
+    ],
+    
+    # ============================================================================
+    # COLLECTION 13: COMMUNITIES
+    # ============================================================================
+    "communities": [
+        IndexModel(
+            [("name", TEXT), ("description", TEXT)],
+            weights={"name": 10, "description": 2},
+            name="idx_name_description_text"
+        ),
+        IndexModel(
+            [("name", ASCENDING)],
+            collation={"locale": "en", "strength": 2},
+            name="idx_name_ci"
+        ),
+        IndexModel(
+            [("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="idx_created_at_id"
+        ),
+        IndexModel(
+            [("category", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="idx_category_created_at_id"
+        )
+    ],
+    
+    # ============================================================================
+    # COLLECTION 14: COMMUNITY_MEMBERS
+    # ============================================================================
+    "community_members": [
+        IndexModel(
+            [("community_id", ASCENDING), ("joined_at", ASCENDING), ("_id", ASCENDING)],
+            name="idx_community_joined"
+        ),
+        IndexModel(
+            [("user_id", ASCENDING), ("community_id", ASCENDING)],
+            unique=True,
+            name="idx_user_community_unique"
+        )
+    ],
+    
+    # ============================================================================
+    # COLLECTION 15: COMMUNITY_ROLLUPS
+    # ============================================================================
+    "community_rollups": [
+        IndexModel(
+            [("community_id", ASCENDING), ("period", ASCENDING)],
+            unique=True,
+            name="idx_community_period_unique"
+        ),
+        IndexModel(
+            [("period", ASCENDING), ("average_emissions", ASCENDING)],
+            name="idx_period_average"
         )
-    ])
-    print("✅ Created indexes for 'notifications' collection")
+    ],
+    
+    # ============================================================================
+    # COLLECTION 16: ARCHIVES
+    # ============================================================================
+    "archives": [
+        IndexModel(
+            [("collection", ASCENDING), ("user_id", ASCENDING), ("month", DESCENDING)],
+            name="idx_collection_user_month"
+        )
+    ],
+    
+    # ============================================================================
+    # COLLECTION 17: USER_STATS
+    # ============================================================================
+    "user_stats": [
+        IndexModel(
+            [("average_daily_emissions", ASCENDING)],
+            name="idx_average_daily_emissions"
+        )
+    ]
+}
+
+
+async def create_all_indexes(db: AsyncIOMotorDatabase):
+    """
+    Create all collection indexes.
+    Should be run on application startup or via migration script.
+    """
+    for collection_name, indexes in INDEXES.items():
+        await db[collection_name].create_indexes(indexes)
+        print(f"✅ Created indexes for '{collection_name}' collection")
     
     print("\n🎉 All indexes created successfully!")
 
@@ -288,14 +394,7 @@ async def drop_all_indexes(db: AsyncIOMotorDatabase):
     Drop all custom indexes (keeps _id index).
     Use with caution - only for development/testing.
     """
-    collections = [
-        'users', 'user_consents', 'profiles', 'daily_logs',
-        'emission_factors', 'carbon_footprints', 'recommendations',
-        'leaderboard', 'community_posts', 'community_comments',
-        'activity_history', 'notifications'
-    ]
-    
-    for collection_name in collections:
+    for collection_name in INDEXES:
         collection = db[collection_name]
         # Drop all indexes except _id
         indexes = await collection.index_information()
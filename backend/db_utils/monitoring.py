@@ -0,0 +1,292 @@
+"""
+MongoDB Client Configuration and Monitoring
+Builds MongoClient options from the environment and collects connection
+pool and per-request command metrics through pymongo event listeners
+
+Environment (unset values keep the driver defaults):
+    MONGODB_MAX_POOL_SIZE           maxPoolSize (driver default 100)
+    MONGODB_MIN_POOL_SIZE           minPoolSize (driver default 0)
+    MONGODB_MAX_IDLE_TIME_MS        maxIdleTimeMS
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS   waitQueueTimeoutMS
+    MONGODB_COMPRESSORS             e.g. "zstd,snappy,zlib" (zstd needs the
+                                    zstandard package, snappy python-snappy)
+
+Metrics are rendered in Prometheus text format by render_prometheus().
+
+Commands are attributed to the current request through the `db_stats`
+context variable: the HTTP middleware in main.py sets a fresh RequestDbStats
+per request and Motor copies the context onto the worker thread that runs
+each command, where CommandMetrics records it.
+"""
+import os
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import monitoring
+
+INT_OPTIONS = {
+    "maxPoolSize": "MONGODB_MAX_POOL_SIZE",
+    "minPoolSize": "MONGODB_MIN_POOL_SIZE",
+    "maxIdleTimeMS": "MONGODB_MAX_IDLE_TIME_MS",
+    "waitQueueTimeoutMS": "MONGODB_WAIT_QUEUE_TIMEOUT_MS",
+}
+
+# Checkout wait histogram bucket upper bounds (seconds)
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """
+    Per-server connection pool counters
+
+    Checkout wait is measured from "checkout started" to "checked out" (or
+    failed). Motor runs each operation on a worker thread, so the start
+    time is kept thread-local.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.in_use: Dict[str, int] = defaultdict(int)
+        self.open: Dict[str, int] = defaultdict(int)
+        self.cleared: Dict[str, int] = defaultdict(int)
+        self.checkout_failed: Dict[tuple, int] = defaultdict(int)
+        self.wait_buckets: Dict[str, List[int]] = defaultdict(lambda: [0] * len(WAIT_BUCKETS))
+        self.wait_count: Dict[str, int] = defaultdict(int)
+        self.wait_sum: Dict[str, float] = defaultdict(float)
+        self.wait_max: Dict[str, float] = defaultdict(float)
+
+    @staticmethod
+    def _server(event) -> str:
+        host, port = event.address
+        return f"{host}:{port}"
+
+    def _record_wait(self, server: str) -> None:
+        started = getattr(self._local, "started", None)
+        if started is None:
+            return
+        self._local.started = None
+        wait = time.perf_counter() - started
+        self.wait_count[server] += 1
+        self.wait_sum[server] += wait
+        self.wait_max[server] = max(self.wait_max[server], wait)
+        buckets = self.wait_buckets[server]
+        for i, bound in enumerate(WAIT_BUCKETS):
+            if wait <= bound:
+                buckets[i] += 1
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        server = self._server(event)
+        with self._lock:
+            self._record_wait(server)
+            self.in_use[server] += 1
+
+    def connection_check_out_failed(self, event):
+        server = self._server(event)
+        with self._lock:
+            self._record_wait(server)
+            self.checkout_failed[(server, event.reason)] += 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.in_use[self._server(event)] -= 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open[self._server(event)] += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open[self._server(event)] -= 1
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.cleared[self._server(event)] += 1
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def render_prometheus(self) -> str:
+        """Pool metrics in Prometheus text exposition format"""
+        lines = [
+            "# HELP mongodb_pool_connections_in_use Connections currently checked out",
+            "# TYPE mongodb_pool_connections_in_use gauge",
+        ]
+        with self._lock:
+            for server, count in sorted(self.in_use.items()):
+                lines.append(f'mongodb_pool_connections_in_use{{server="{server}"}} {count}')
+
+            lines += [
+                "# HELP mongodb_pool_connections_open Open pooled connections",
+                "# TYPE mongodb_pool_connections_open gauge",
+            ]
+            for server, count in sorted(self.open.items()):
+                lines.append(f'mongodb_pool_connections_open{{server="{server}"}} {count}')
+
+            lines += [
+                "# HELP mongodb_pool_cleared_total Pool cleared events",
+                "# TYPE mongodb_pool_cleared_total counter",
+            ]
+            for server, count in sorted(self.cleared.items()):
+                lines.append(f'mongodb_pool_cleared_total{{server="{server}"}} {count}')
+
+            lines += [
+                "# HELP mongodb_pool_checkout_failed_total Failed connection checkouts",
+                "# TYPE mongodb_pool_checkout_failed_total counter",
+            ]
+            for (server, reason), count in sorted(self.checkout_failed.items()):
+                lines.append(f'mongodb_pool_checkout_failed_total{{server="{server}",reason="{reason}"}} {count}')
+
+            lines += [
+                "# HELP mongodb_pool_checkout_wait_seconds Time spent waiting for a pooled connection",
+                "# TYPE mongodb_pool_checkout_wait_seconds histogram",
+            ]
+            for server in sorted(self.wait_count):
+                for bound, count in zip(WAIT_BUCKETS, self.wait_buckets[server]):
+                    lines.append(f'mongodb_pool_checkout_wait_seconds_bucket{{server="{server}",le="{bound}"}} {count}')
+                lines.append(f'mongodb_pool_checkout_wait_seconds_bucket{{server="{server}",le="+Inf"}} {self.wait_count[server]}')
+                lines.append(f'mongodb_pool_checkout_wait_seconds_sum{{server="{server}"}} {self.wait_sum[server]:.6f}')
+                lines.append(f'mongodb_pool_checkout_wait_seconds_count{{server="{server}"}} {self.wait_count[server]}')
+
+            lines += [
+                "# HELP mongodb_pool_checkout_wait_max_seconds Longest checkout wait since start",
+                "# TYPE mongodb_pool_checkout_wait_max_seconds gauge",
+            ]
+            for server, wait in sorted(self.wait_max.items()):
+                lines.append(f'mongodb_pool_checkout_wait_max_seconds{{server="{server}"}} {wait:.6f}')
+
+        return "\n".join(lines) + "\n"
+
+
+pool_metrics = PoolMetrics()
+
+
+class RequestDbStats:
+    """Database commands issued while handling one request"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.round_trips = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_command: Optional[str] = None
+
+    def record(self, command_name: str, seconds: float) -> None:
+        with self._lock:
+            self.round_trips += 1
+            self.total_seconds += seconds
+            if seconds >= self.slowest_seconds:
+                self.slowest_seconds = seconds
+                self.slowest_command = command_name
+
+    def server_timing(self) -> str:
+        """Server-Timing header value"""
+        entries = [f'db;desc="{self.round_trips} round trips";dur={self.total_seconds * 1000:.1f}']
+        if self.slowest_command:
+            entries.append(f'db-slowest;desc="{self.slowest_command}";dur={self.slowest_seconds * 1000:.1f}')
+        return ", ".join(entries)
+
+
+db_stats: ContextVar[Optional[RequestDbStats]] = ContextVar("db_stats", default=None)
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """Attributes each command's round trip to the request in `db_stats`"""
+
+    def _record(self, event) -> None:
+        stats = db_stats.get()
+        if stats is not None:
+            stats.record(event.command_name, event.duration_micros / 1e6)
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event)
+
+    def failed(self, event):
+        self._record(event)
+
+
+class RouteMetrics:
+    """Per-route summaries of database usage, fed by the request middleware"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.round_trips: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.db_seconds: Dict[Tuple[str, str], float] = defaultdict(float)
+        self.slowest_seconds: Dict[Tuple[str, str], float] = defaultdict(float)
+
+    def observe(self, method: str, route: str, stats: RequestDbStats) -> None:
+        key = (method, route)
+        with self._lock:
+            self.requests[key] += 1
+            self.round_trips[key] += stats.round_trips
+            self.db_seconds[key] += stats.total_seconds
+            self.slowest_seconds[key] = max(self.slowest_seconds[key], stats.slowest_seconds)
+
+    def render_prometheus(self) -> str:
+        """Route metrics in Prometheus text exposition format"""
+        lines = [
+            "# HELP http_db_round_trips Database round trips per request",
+            "# TYPE http_db_round_trips summary",
+        ]
+        with self._lock:
+            keys = sorted(self.requests)
+            for method, route in keys:
+                labels = f'method="{method}",route="{route}"'
+                lines.append(f"http_db_round_trips_sum{{{labels}}} {self.round_trips[(method, route)]}")
+                lines.append(f"http_db_round_trips_count{{{labels}}} {self.requests[(method, route)]}")
+
+            lines += [
+                "# HELP http_db_seconds Database time per request",
+                "# TYPE http_db_seconds summary",
+            ]
+            for method, route in keys:
+                labels = f'method="{method}",route="{route}"'
+                lines.append(f"http_db_seconds_sum{{{labels}}} {self.db_seconds[(method, route)]:.6f}")
+                lines.append(f"http_db_seconds_count{{{labels}}} {self.requests[(method, route)]}")
+
+            lines += [
+                "# HELP http_db_slowest_command_seconds Slowest single command seen on the route",
+                "# TYPE http_db_slowest_command_seconds gauge",
+            ]
+            for method, route in keys:
+                labels = f'method="{method}",route="{route}"'
+                lines.append(f"http_db_slowest_command_seconds{{{labels}}} {self.slowest_seconds[(method, route)]:.6f}")
+
+        return "\n".join(lines) + "\n"
+
+
+command_metrics = CommandMetrics()
+route_metrics = RouteMetrics()
+
+
+def client_options() -> dict:
+    """Keyword arguments for AsyncIOMotorClient built from the environment"""
+    options = {"event_listeners": [pool_metrics, command_metrics]}
+    for option, env_var in INT_OPTIONS.items():
+        value = os.getenv(env_var)
+        if value:
+            options[option] = int(value)
+
+    compressors = os.getenv("MONGODB_COMPRESSORS")
+    if compressors:
+        options["compressors"] = compressors
+    return options
@@ -0,0 +1,69 @@
+"""
+Read Routing for PlanetZero
+Per-route read preference and read concern
+
+Routes pick a read profile with get_database(profile). Everything defaults
+to PRIMARY; routes that read heavily and tolerate a little staleness
+(leaderboards, charts, history) use ANALYTICS so that on a replica set they
+are served by secondaries and stop competing with writes on the primary.
+
+Environment for the analytics profile:
+    ANALYTICS_READ_PREFERENCE         primary | primaryPreferred | secondary |
+                                      secondaryPreferred (default) | nearest
+    ANALYTICS_MAX_STALENESS_SECONDS   skip secondaries lagging more than this
+                                      (default 90, the smallest value the
+                                      drivers accept; unset/0 = no limit)
+    ANALYTICS_READ_CONCERN            local (default) | available | majority
+
+With a standalone server or a single-member replica set every profile
+reads from the only node, so the settings are harmless in development.
+"""
+import os
+from typing import Dict
+
+from pymongo.read_concern import ReadConcern
+from pymongo.read_preferences import (
+    Nearest,
+    Primary,
+    PrimaryPreferred,
+    Secondary,
+    SecondaryPreferred
+)
+
+PRIMARY = "primary"
+ANALYTICS = "analytics"
+
+# Drivers reject maxStalenessSeconds below heartbeat frequency + 10s and below 90s
+MIN_MAX_STALENESS_SECONDS = 90
+
+READ_PREFERENCES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+
+def _analytics_options() -> dict:
+    mode = os.getenv("ANALYTICS_READ_PREFERENCE", "secondaryPreferred")
+    if mode not in READ_PREFERENCES:
+        raise ValueError(f"ANALYTICS_READ_PREFERENCE must be one of {', '.join(READ_PREFERENCES)}, got {mode!r}")
+
+    staleness = int(os.getenv("ANALYTICS_MAX_STALENESS_SECONDS", str(MIN_MAX_STALENESS_SECONDS)) or 0)
+    if mode == "primary":
+        read_preference = Primary()
+    elif staleness > 0:
+        read_preference = READ_PREFERENCES[mode](max_staleness=max(staleness, MIN_MAX_STALENESS_SECONDS))
+    else:
+        read_preference = READ_PREFERENCES[mode]()
+
+    return {
+        "read_preference": read_preference,
+        "read_concern": ReadConcern(os.getenv("ANALYTICS_READ_CONCERN", "local")),
+    }
+
+
+def read_profiles() -> Dict[str, dict]:
+    """with_options() keyword arguments for every non-primary read profile"""
+    return {ANALYTICS: _analytics_options()}
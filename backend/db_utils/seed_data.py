@@ -54,9 +54,9 @@ SEED_DATA = {
     ],
     
     # ========================================================================
-    # COLLECTION 2: USER_CONSENTS
+    # COLLECTION 2: CONSENTS
     # ========================================================================
-    "user_consents": [
+    "consents": [
         {
             "_id": ObjectId("65a100000000000000000001"),
             "user_id": ObjectId("65a000000000000000000001"),
@@ -410,7 +410,7 @@ SEED_DATA = {
             "user_id": ObjectId("65a000000000000000000001"),
             "type": "achievement",
             "message": "Congratulations! You've reduced your carbon footprint by 20% this week!",
-            "is_read": False,
+            "read": False,
             "created_at": datetime(2026, 1, 4, 18, 0, 0)
         },
         {
@@ -418,7 +418,8 @@ SEED_DATA = {
             "user_id": ObjectId("65a000000000000000000001"),
             "type": "reminder",
             "message": "Don't forget to log your daily activities!",
-            "is_read": True,
+            "read": True,
+            "read_at": datetime(2026, 1, 3, 21, 0, 0),
             "created_at": datetime(2026, 1, 3, 19, 0, 0)
         },
         {
@@ -426,7 +427,7 @@ SEED_DATA = {
             "user_id": ObjectId("65a000000000000000000002"),
             "type": "social",
             "message": "Ravi Kumar commented on your post",
-            "is_read": False,
+            "read": False,
             "created_at": datetime(2026, 1, 3, 16, 0, 0)
         }
     ]
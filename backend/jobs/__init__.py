@@ -0,0 +1,6 @@
+"""
+Offline jobs for PlanetZero
+Batch computations and maintenance tasks run outside the request path
+
+Each module can be run directly, e.g. `python -m jobs.collaborative_recommendations`
+"""
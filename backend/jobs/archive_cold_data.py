@@ -0,0 +1,119 @@
+"""
+Cold Data Archiver
+Moves notifications and activity_history rows past their retention window
+into compressed monthly archive documents (see app/archive.py)
+
+Rows older than the cutoff are read oldest first in fixed-size batches on
+the timestamp index, grouped by (user, month), written as archive chunks
+with one bulk_write and then removed from the hot collection with one
+delete_many. Unread notifications that are archived are subtracted from
+the users' unread counters.
+
+Archive chunks are upserted before the rows are deleted, so an interrupted
+run leaves at worst duplicate rows, which load_archived drops on read.
+
+Usage:
+    python -m jobs.archive_cold_data [--collection notifications] [--batch-size 1000] [--dry-run]
+"""
+import argparse
+import asyncio
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from pymongo import ReplaceOne, UpdateOne
+
+from app.archive import ARCHIVED_COLLECTIONS, archive_document, month_key
+from app.database import (
+    connect_to_mongo,
+    close_mongo_connection,
+    get_database,
+    ARCHIVES_COLLECTION,
+    NOTIFICATIONS_COLLECTION,
+    NOTIFICATION_COUNTERS_COLLECTION
+)
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+async def archive_collection(
+    db,
+    collection: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    dry_run: bool = False
+) -> Dict[str, int]:
+    """Archive rows of one collection older than its retention window"""
+    time_field, retention_days = ARCHIVED_COLLECTIONS[collection]
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    summary = {"rows": 0, "chunks": 0}
+    last = None
+
+    while True:
+        query = {time_field: {"$lt": cutoff}}
+        if dry_run and last is not None:
+            # Nothing is deleted in a dry run, so page past the previous batch
+            query = {
+                "$or": [
+                    {time_field: {"$gt": last[0], "$lt": cutoff}},
+                    {time_field: last[0], "_id": {"$gt": last[1]}}
+                ]
+            }
+        rows = await db[collection].find(query).sort(
+            [(time_field, 1), ("_id", 1)]
+        ).limit(batch_size).to_list(length=batch_size)
+
+        if not rows:
+            break
+        last = (rows[-1][time_field], rows[-1]["_id"])
+
+        groups: Dict[Tuple[str, str], List[dict]] = defaultdict(list)
+        for row in rows:
+            groups[(str(row["user_id"]), month_key(row[time_field]))].append(row)
+
+        summary["rows"] += len(rows)
+        summary["chunks"] += len(groups)
+        if dry_run:
+            continue
+
+        chunks = [archive_document(collection, user_id, month, group) for (user_id, month), group in groups.items()]
+        await db[ARCHIVES_COLLECTION].bulk_write(
+            [ReplaceOne({"_id": chunk["_id"]}, chunk, upsert=True) for chunk in chunks],
+            ordered=False
+        )
+        await db[collection].delete_many({"_id": {"$in": [row["_id"] for row in rows]}})
+
+        if collection == NOTIFICATIONS_COLLECTION:
+            unread = Counter(row["user_id"] for row in rows if not row.get("read", False))
+            if unread:
+                await db[NOTIFICATION_COUNTERS_COLLECTION].bulk_write(
+                    [
+                        UpdateOne({"_id": user_id}, {"$inc": {"unread": -count}})
+                        for user_id, count in unread.items()
+                    ],
+                    ordered=False
+                )
+
+    return summary
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Archive cold notifications and activity history")
+    parser.add_argument("--collection", choices=sorted(ARCHIVED_COLLECTIONS), action="append",
+                        help="Collection to archive (repeatable, default: all)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="Only count rows that would be archived")
+    args = parser.parse_args()
+
+    await connect_to_mongo()
+    try:
+        db = get_database()
+        for collection in args.collection or sorted(ARCHIVED_COLLECTIONS):
+            summary = await archive_collection(db, collection, batch_size=args.batch_size, dry_run=args.dry_run)
+            action = "would archive" if args.dry_run else "archived"
+            print(f"✅ {collection}: {action} {summary['rows']} rows into {summary['chunks']} chunks")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,56 @@
+"""
+User Stats Backfill
+Computes user_stats for every user from their existing daily_logs
+
+Stats documents are written when a user's logs change, so users who have
+not logged since user_stats was introduced have no document (missing
+from the all-time leaderboard) until their profile is first read. Run
+this once after deploying, or whenever user_stats needs recomputing
+without the projector's change-stream rebuild (standalone servers).
+
+Users are walked in _id order in fixed-size batches; every batch is one
+aggregation over daily_logs and one bulk_write (services/stats_service
+.project_user_stats), so re-running it is harmless.
+
+Usage:
+    python -m jobs.backfill_user_stats [--batch-size 500]
+"""
+import argparse
+import asyncio
+
+from database import connect_to_mongo, close_mongo_connection, get_database, USERS_COLLECTION
+from services.stats_service import project_user_stats
+
+DEFAULT_BATCH_SIZE = 500
+
+
+async def backfill(db, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Recompute stats for every user; returns the number of users processed"""
+    processed = 0
+    last_id = None
+    while True:
+        query = {"_id": {"$gt": last_id}} if last_id is not None else {}
+        users = await db[USERS_COLLECTION].find(query, {"_id": 1}).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        if not users:
+            break
+        last_id = users[-1]["_id"]
+        await project_user_stats(db, [str(user["_id"]) for user in users])
+        processed += len(users)
+    return processed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Backfill user_stats from daily_logs")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    await connect_to_mongo()
+    try:
+        processed = await backfill(get_database(), args.batch_size)
+        print(f"✅ Backfilled stats for {processed} users")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,196 @@
+"""
+Adoption-based Collaborative Recommendations
+Offline job computing item-item similarity from the recommendations users
+have completed (users.completed_recommendations)
+
+Steps:
+1. Stream users and build a sparse user x recommendation adoption matrix (CSR)
+2. Compute item-item co-occurrence C = X^T X and cosine similarity
+   sim(i, j) = C[i, j] / sqrt(C[i, i] * C[j, j])
+3. Score every user's unadopted items as the sum of similarities to the
+   items they adopted and store the top-K per user
+
+Work is proportional to the number of adoptions (each user contributes
+deg^2 co-occurrence updates, bounded by the catalogue size). The API only
+reads the stored results.
+
+Usage:
+    python -m jobs.collaborative_recommendations [--top-k 5] [--batch-size 1000]
+"""
+import argparse
+import asyncio
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+from pymongo import ReplaceOne
+
+from app.database import (
+    connect_to_mongo,
+    close_mongo_connection,
+    get_database,
+    USERS_COLLECTION,
+    RECOMMENDATIONS_COLLECTION,
+    RECOMMENDATION_SUGGESTIONS_COLLECTION
+)
+
+DEFAULT_TOP_K = 5
+DEFAULT_BATCH_SIZE = 1000
+
+# Document holding the globally most adopted items, used for users with no adoptions
+POPULAR_KEY = "_popular"
+
+
+class AdoptionMatrix:
+    """Sparse user x item adoption matrix in CSR layout"""
+
+    def __init__(self, item_ids: List[str]):
+        self.item_ids = item_ids
+        self.item_index = {item_id: idx for idx, item_id in enumerate(item_ids)}
+        self.user_ids: List[str] = []
+        self.indptr: List[int] = [0]
+        self.indices: List[int] = []
+
+    def add_user(self, user_id: str, adopted: List[str]) -> None:
+        """Append one user row, ignoring unknown and duplicate item ids"""
+        row = sorted({self.item_index[item] for item in adopted if item in self.item_index})
+        self.user_ids.append(user_id)
+        self.indices.extend(row)
+        self.indptr.append(len(self.indices))
+
+    def rows(self):
+        """Yield (user_id, item index array) for every user"""
+        indices = np.asarray(self.indices, dtype=np.int32)
+        for row, user_id in enumerate(self.user_ids):
+            yield user_id, indices[self.indptr[row]:self.indptr[row + 1]]
+
+    @property
+    def adoptions(self) -> int:
+        return len(self.indices)
+
+
+def item_similarity(matrix: AdoptionMatrix) -> np.ndarray:
+    """Cosine item-item similarity from X^T X, with a zeroed diagonal"""
+    n_items = len(matrix.item_ids)
+    cooccurrence = np.zeros((n_items, n_items), dtype=np.float64)
+
+    for _, row in matrix.rows():
+        if len(row):
+            cooccurrence[np.ix_(row, row)] += 1.0
+
+    counts = np.sqrt(np.diag(cooccurrence))
+    norm = np.outer(counts, counts)
+    similarity = np.divide(cooccurrence, norm, out=np.zeros_like(cooccurrence), where=norm > 0)
+    np.fill_diagonal(similarity, 0.0)
+    return similarity
+
+
+def top_k_for_user(similarity: np.ndarray, adopted: np.ndarray, top_k: int) -> List[tuple]:
+    """Return [(item index, score)] of the best unadopted items for one user"""
+    if not len(adopted):
+        return []
+
+    scores = similarity[adopted].sum(axis=0)
+    scores[adopted] = 0.0
+    candidates = np.flatnonzero(scores > 0)
+    if not len(candidates):
+        return []
+
+    if len(candidates) > top_k:
+        best = np.argpartition(-scores[candidates], top_k - 1)[:top_k]
+        candidates = candidates[best]
+
+    ordered = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return [(int(idx), float(scores[idx])) for idx in ordered]
+
+
+def most_adopted(matrix: AdoptionMatrix, top_k: int) -> List[tuple]:
+    """Return [(item index, adoptions)] of the most adopted items overall, for users with no adoptions yet"""
+    popularity = np.bincount(np.asarray(matrix.indices, dtype=np.int32), minlength=len(matrix.item_ids))
+    return [
+        (int(idx), float(popularity[idx]))
+        for idx in np.argsort(-popularity, kind="stable")[:top_k]
+        if popularity[idx] > 0
+    ]
+
+
+async def build_adoption_matrix(db, batch_size: int = DEFAULT_BATCH_SIZE) -> AdoptionMatrix:
+    """Stream users with adoptions into a sparse matrix"""
+    item_docs = await db[RECOMMENDATIONS_COLLECTION].find({}, {"_id": 1}).to_list(length=None)
+    matrix = AdoptionMatrix([str(doc["_id"]) for doc in item_docs])
+
+    cursor = db[USERS_COLLECTION].find(
+        {"completed_recommendations.0": {"$exists": True}},
+        {"completed_recommendations": 1}
+    ).batch_size(batch_size)
+
+    async for user in cursor:
+        matrix.add_user(str(user["_id"]), user.get("completed_recommendations", []))
+
+    return matrix
+
+
+async def run(top_k: int = DEFAULT_TOP_K, batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, int]:
+    """Recompute and store top-K suggestions for every user with adoptions"""
+    db = get_database()
+    started_at = datetime.utcnow()
+
+    matrix = await build_adoption_matrix(db, batch_size)
+    similarity = item_similarity(matrix)
+
+    def suggestion_doc(key: str, ranked: List[tuple]) -> dict:
+        return {
+            "_id": key,
+            "suggestions": [
+                {"recommendation_id": matrix.item_ids[idx], "score": round(score, 4)}
+                for idx, score in ranked
+            ],
+            "computed_at": started_at
+        }
+
+    written = 0
+    batch = [ReplaceOne({"_id": POPULAR_KEY}, suggestion_doc(POPULAR_KEY, most_adopted(matrix, top_k)), upsert=True)]
+
+    for user_id, adopted in matrix.rows():
+        ranked = top_k_for_user(similarity, adopted, top_k)
+        batch.append(ReplaceOne({"_id": user_id}, suggestion_doc(user_id, ranked), upsert=True))
+
+        if len(batch) >= batch_size:
+            await db[RECOMMENDATION_SUGGESTIONS_COLLECTION].bulk_write(batch, ordered=False)
+            written += len(batch)
+            batch = []
+
+    if batch:
+        await db[RECOMMENDATION_SUGGESTIONS_COLLECTION].bulk_write(batch, ordered=False)
+        written += len(batch)
+
+    # Drop suggestions for users who no longer have any adoptions
+    await db[RECOMMENDATION_SUGGESTIONS_COLLECTION].delete_many({"computed_at": {"$lt": started_at}})
+
+    return {
+        "users": len(matrix.user_ids),
+        "items": len(matrix.item_ids),
+        "adoptions": matrix.adoptions,
+        "documents_written": written
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compute collaborative recommendation suggestions")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    await connect_to_mongo()
+    try:
+        stats = await run(top_k=args.top_k, batch_size=args.batch_size)
+        print(
+            f"✅ Stored suggestions for {stats['users']} users "
+            f"({stats['adoptions']} adoptions over {stats['items']} recommendations)"
+        )
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,38 @@
+"""
+Daily Log Projector
+Runs the change-stream projector (services/projector.py) as its own
+process, keeping carbon_footprints, user_stats and log_calendars in step
+with daily_logs
+
+Start the API with DAILY_LOG_PROJECTOR=external when this runs separately,
+so only one process follows the stream. Following requires a replica set
+and exits with an error on a standalone server; --rebuild works on both.
+
+Usage:
+    python -m jobs.daily_log_projector [--rebuild]
+"""
+import argparse
+import asyncio
+
+from database import connect_to_mongo, close_mongo_connection, get_database
+from services.projector import rebuild, run_projector
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Project daily_logs into the derived collections")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Recompute every derived document from daily_logs and exit")
+    args = parser.parse_args()
+
+    await connect_to_mongo()
+    try:
+        if args.rebuild:
+            await rebuild(get_database())
+        else:
+            await run_projector(get_database())
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+"""
+carbon_footprints Time-Series Migration
+Converts the regular carbon_footprints collection into a native
+time-series collection (metaField user_id, timeField date)
+
+Time-series collections cannot be renamed, so the migration:
+1. Renames carbon_footprints to carbon_footprints_legacy
+2. Creates carbon_footprints as a time-series collection
+3. Copies the legacy documents in _id order with unordered insert_many
+   batches, recording progress in the migrations collection
+4. Builds the declared time-series indexes
+
+Deploy with CARBON_FOOTPRINTS_MODE=timeseries before running it, so
+footprints written during the copy already land in the new collection;
+entries copied afterwards for the same day are older and are dropped by
+the read path, as are duplicates from a batch re-copied after a crash.
+Re-running resumes the copy after the last recorded _id.
+The legacy collection is kept until --drop-legacy.
+
+Usage:
+    python -m jobs.migrate_carbon_footprints_timeseries [--batch-size 5000] [--drop-legacy]
+"""
+import argparse
+import asyncio
+from typing import Dict
+
+from database import (
+    connect_to_mongo,
+    close_mongo_connection,
+    get_database,
+    CARBON_FOOTPRINTS_COLLECTION
+)
+from db_utils.indexes import TIMESERIES_FOOTPRINT_INDEXES
+from services.footprint_service import TIMESERIES_OPTIONS
+
+LEGACY_COLLECTION = f"{CARBON_FOOTPRINTS_COLLECTION}_legacy"
+DEFAULT_BATCH_SIZE = 5000
+
+
+async def _collection_type(db, name: str):
+    info = await db.list_collections(filter={"name": name}).to_list(length=1)
+    return info[0].get("type", "collection") if info else None
+
+
+async def migrate(batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, int]:
+    """Move carbon_footprints into a time-series collection and return counts"""
+    db = get_database()
+    summary = {"copied": 0}
+
+    current_type = await _collection_type(db, CARBON_FOOTPRINTS_COLLECTION)
+    if current_type == "collection":
+        if await _collection_type(db, LEGACY_COLLECTION):
+            raise RuntimeError(f"Both {CARBON_FOOTPRINTS_COLLECTION} and {LEGACY_COLLECTION} are regular collections")
+        await db[CARBON_FOOTPRINTS_COLLECTION].rename(LEGACY_COLLECTION)
+        print(f"✅ Renamed {CARBON_FOOTPRINTS_COLLECTION} to {LEGACY_COLLECTION}")
+        current_type = None
+
+    if current_type is None:
+        await db.create_collection(CARBON_FOOTPRINTS_COLLECTION, timeseries=TIMESERIES_OPTIONS)
+        print(f"✅ Created time-series collection {CARBON_FOOTPRINTS_COLLECTION}")
+
+    # Resume after the last copied legacy document
+    progress = await db.migrations.find_one({"_id": "carbon_footprints_timeseries"})
+    last_id = progress.get("last_id") if progress else None
+
+    while True:
+        query = {"_id": {"$gt": last_id}} if last_id is not None else {}
+        batch = await db[LEGACY_COLLECTION].find(query).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            break
+        last_id = batch[-1]["_id"]
+
+        # Measurements keep their own _id; the legacy _id is not carried over
+        docs = [{key: value for key, value in doc.items() if key != "_id"} for doc in batch]
+        await db[CARBON_FOOTPRINTS_COLLECTION].insert_many(docs, ordered=False)
+        await db.migrations.update_one(
+            {"_id": "carbon_footprints_timeseries"},
+            {"$set": {"last_id": last_id}},
+            upsert=True
+        )
+        summary["copied"] += len(batch)
+        print(f"   copied {summary['copied']} footprints")
+
+    await db[CARBON_FOOTPRINTS_COLLECTION].create_indexes(TIMESERIES_FOOTPRINT_INDEXES)
+    return summary
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Convert carbon_footprints to a time-series collection")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--drop-legacy", action="store_true", help=f"Drop {LEGACY_COLLECTION} after copying")
+    args = parser.parse_args()
+
+    await connect_to_mongo()
+    try:
+        summary = await migrate(batch_size=args.batch_size)
+        print(f"✅ Copied {summary['copied']} footprints into the time-series collection")
+        if args.drop_legacy:
+            await get_database().drop_collection(LEGACY_COLLECTION)
+            await get_database().migrations.delete_one({"_id": "carbon_footprints_timeseries"})
+            print(f"🗑️  Dropped {LEGACY_COLLECTION}")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
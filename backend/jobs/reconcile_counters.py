@@ -0,0 +1,188 @@
+"""
+Counter Reconciliation
+Detects and repairs drift in the denormalized users.total_emissions and
+users.points counters maintained with $inc by app/routes
+
+Users are walked in _id order in fixed-size batches. For each batch the
+matching daily_logs are grouped by user in one aggregation, compared with
+the stored counters, and mismatches are written back with one bulk_write.
+Memory and per-batch work depend only on the batch size.
+
+Expected values:
+- total_emissions = sum of daily_logs.carbon_footprint
+- points = 10 per log + 50 per completed recommendation + 25 per joined
+  community (as member). Deleting a log does not refund its points, so
+  points drift in either direction is reported but only repaired with
+  --repair-points.
+
+Only app-tree logs (those with carbon_footprint) are counted; main-tree
+logs in the same collection neither add emissions nor earn points.
+
+Usage:
+    python -m jobs.reconcile_counters [--batch-size 500] [--dry-run] [--repair-points] [--report drift.jsonl]
+"""
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime
+from typing import Dict, Optional, TextIO
+
+from pymongo import UpdateOne
+
+from app.models import CommunityRole
+from app.database import (
+    connect_to_mongo,
+    close_mongo_connection,
+    get_database,
+    USERS_COLLECTION,
+    DAILY_LOGS_COLLECTION,
+    COMMUNITY_MEMBERS_COLLECTION
+)
+
+DEFAULT_BATCH_SIZE = 500
+EMISSIONS_TOLERANCE = 0.01
+
+LOG_POINTS = 10
+RECOMMENDATION_POINTS = 50
+JOIN_POINTS = 25
+
+
+async def _batch_log_totals(db, user_ids) -> Dict[str, dict]:
+    """Sum emissions and count logs for a batch of users"""
+    cursor = db[DAILY_LOGS_COLLECTION].aggregate([
+        # Only app-tree logs carry carbon_footprint and earn points; main-tree
+        # logs (total_emissions) share the collection
+        {"$match": {"user_id": {"$in": user_ids}, "carbon_footprint": {"$exists": True}}},
+        {
+            "$group": {
+                "_id": "$user_id",
+                "total_emissions": {"$sum": "$carbon_footprint"},
+                "log_count": {"$sum": 1}
+            }
+        }
+    ])
+    return {row["_id"]: row async for row in cursor}
+
+
+async def _batch_join_counts(db, user_ids) -> Dict[str, int]:
+    """Count communities joined as a regular member for a batch of users"""
+    cursor = db[COMMUNITY_MEMBERS_COLLECTION].aggregate([
+        {"$match": {"user_id": {"$in": user_ids}, "role": CommunityRole.member.value}},
+        {"$group": {"_id": "$user_id", "count": {"$sum": 1}}}
+    ])
+    return {row["_id"]: row["count"] async for row in cursor}
+
+
+async def reconcile(
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    dry_run: bool = False,
+    repair_points: bool = False,
+    report: Optional[TextIO] = None
+) -> Dict[str, int]:
+    """
+    Compare counters with the source collections and repair mismatches
+
+    Each drifted user is written to `report` as one JSON line.
+    """
+    db = get_database()
+    summary = {"users_checked": 0, "emissions_drift": 0, "points_drift": 0, "repaired": 0}
+    last_id = None
+
+    while True:
+        query = {"_id": {"$gt": last_id}} if last_id is not None else {}
+        users = await db[USERS_COLLECTION].find(
+            query,
+            {"total_emissions": 1, "points": 1, "completed_recommendations": 1}
+        ).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+
+        if not users:
+            break
+        last_id = users[-1]["_id"]
+
+        user_ids = [str(user["_id"]) for user in users]
+        log_totals, join_counts = await asyncio.gather(
+            _batch_log_totals(db, user_ids),
+            _batch_join_counts(db, user_ids)
+        )
+
+        repairs = []
+        for user, user_id in zip(users, user_ids):
+            logs = log_totals.get(user_id, {"total_emissions": 0.0, "log_count": 0})
+            expected_emissions = round(logs["total_emissions"], 2)
+            expected_points = (
+                LOG_POINTS * logs["log_count"]
+                + RECOMMENDATION_POINTS * len(user.get("completed_recommendations", []))
+                + JOIN_POINTS * join_counts.get(user_id, 0)
+            )
+
+            stored_emissions = user.get("total_emissions", 0.0)
+            stored_points = user.get("points", 0)
+
+            fix = {}
+            if abs(stored_emissions - expected_emissions) > EMISSIONS_TOLERANCE:
+                summary["emissions_drift"] += 1
+                fix["total_emissions"] = expected_emissions
+
+            points_drift = stored_points != expected_points
+            if points_drift:
+                summary["points_drift"] += 1
+                if repair_points:
+                    fix["points"] = expected_points
+
+            if fix or points_drift:
+                if report:
+                    report.write(json.dumps({
+                        "user_id": user_id,
+                        "stored_emissions": stored_emissions,
+                        "expected_emissions": expected_emissions,
+                        "stored_points": stored_points,
+                        "expected_points": expected_points,
+                        "repairing": sorted(fix) if not dry_run else []
+                    }) + "\n")
+
+            if fix and not dry_run:
+                fix["updated_at"] = datetime.utcnow()
+                repairs.append(UpdateOne({"_id": user["_id"]}, {"$set": fix}))
+
+        if repairs:
+            result = await db[USERS_COLLECTION].bulk_write(repairs, ordered=False)
+            summary["repaired"] += result.modified_count
+
+        summary["users_checked"] += len(users)
+
+    return summary
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Reconcile denormalized user counters with daily_logs")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="Only report drift, do not repair")
+    parser.add_argument("--repair-points", action="store_true", help="Also repair points mismatches")
+    parser.add_argument("--report", help="Write the drift report (JSON lines) to this file instead of stdout")
+    args = parser.parse_args()
+
+    await connect_to_mongo()
+    report = open(args.report, "w") if args.report else sys.stdout
+    try:
+        summary = await reconcile(
+            batch_size=args.batch_size,
+            dry_run=args.dry_run,
+            repair_points=args.repair_points,
+            report=report
+        )
+        print(
+            f"✅ Checked {summary['users_checked']} users: "
+            f"{summary['emissions_drift']} emission mismatches, "
+            f"{summary['points_drift']} points mismatches, "
+            f"{summary['repaired']} repaired",
+            file=sys.stderr
+        )
+    finally:
+        if report is not sys.stdout:
+            report.close()
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,113 @@
+"""
+Notification Counter Reconciliation
+Rebuilds notification_counters.unread from the notifications collection
+
+Two passes, each in fixed-size batches:
+1. Stream actual unread counts grouped by user and fix counters that
+   differ (creating missing counter documents)
+2. Walk counters that claim unread > 0 and zero out those whose users
+   have no unread notifications left
+
+Usage:
+    python -m jobs.reconcile_notification_counters [--batch-size 1000] [--dry-run]
+"""
+import argparse
+import asyncio
+from typing import Dict, List
+
+from pymongo import UpdateOne
+
+from app.database import (
+    connect_to_mongo,
+    close_mongo_connection,
+    get_database,
+    NOTIFICATIONS_COLLECTION,
+    NOTIFICATION_COUNTERS_COLLECTION
+)
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+async def _fix_batch(db, actual: Dict[str, int], dry_run: bool) -> int:
+    """Compare one batch of actual counts with stored counters and repair"""
+    counters = await db[NOTIFICATION_COUNTERS_COLLECTION].find(
+        {"_id": {"$in": list(actual)}}
+    ).to_list(length=len(actual))
+    stored = {counter["_id"]: counter.get("unread", 0) for counter in counters}
+
+    repairs: List[UpdateOne] = [
+        UpdateOne({"_id": user_id}, {"$set": {"unread": count}}, upsert=True)
+        for user_id, count in actual.items()
+        if stored.get(user_id, 0) != count
+    ]
+
+    if repairs and not dry_run:
+        await db[NOTIFICATION_COUNTERS_COLLECTION].bulk_write(repairs, ordered=False)
+    return len(repairs)
+
+
+async def reconcile(batch_size: int = DEFAULT_BATCH_SIZE, dry_run: bool = False) -> Dict[str, int]:
+    """Repair unread counters and return a summary"""
+    db = get_database()
+    summary = {"users_checked": 0, "repaired": 0}
+
+    # Pass 1: users with unread notifications
+    cursor = db[NOTIFICATIONS_COLLECTION].aggregate(
+        [
+            {"$match": {"read": False}},
+            {"$group": {"_id": "$user_id", "unread": {"$sum": 1}}}
+        ],
+        allowDiskUse=True,
+        batchSize=batch_size
+    )
+    batch: Dict[str, int] = {}
+    async for row in cursor:
+        batch[row["_id"]] = row["unread"]
+        if len(batch) >= batch_size:
+            summary["repaired"] += await _fix_batch(db, batch, dry_run)
+            summary["users_checked"] += len(batch)
+            batch = {}
+    if batch:
+        summary["repaired"] += await _fix_batch(db, batch, dry_run)
+        summary["users_checked"] += len(batch)
+
+    # Pass 2: counters claiming unread notifications that no longer exist
+    last_id = None
+    while True:
+        query = {"unread": {"$ne": 0}}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        counters = await db[NOTIFICATION_COUNTERS_COLLECTION].find(query).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        if not counters:
+            break
+        last_id = counters[-1]["_id"]
+
+        user_ids = [counter["_id"] for counter in counters]
+        rows = await db[NOTIFICATIONS_COLLECTION].aggregate([
+            {"$match": {"user_id": {"$in": user_ids}, "read": False}},
+            {"$group": {"_id": "$user_id", "unread": {"$sum": 1}}}
+        ]).to_list(length=None)
+        actual = {user_id: 0 for user_id in user_ids}
+        actual.update({row["_id"]: row["unread"] for row in rows})
+        summary["repaired"] += await _fix_batch(db, actual, dry_run)
+
+    return summary
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Reconcile notification unread counters")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="Only count mismatches, do not repair")
+    args = parser.parse_args()
+
+    await connect_to_mongo()
+    try:
+        summary = await reconcile(batch_size=args.batch_size, dry_run=args.dry_run)
+        action = "would repair" if args.dry_run else "repaired"
+        print(f"✅ Checked {summary['users_checked']} users with unread notifications, {action} {summary['repaired']} counters")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
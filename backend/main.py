@@ -12,14 +12,21 @@ Main Features:
 - Personalized recommendations
 - User profile management
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import uvicorn
 from dotenv import load_dotenv
 import os
 
-from database import connect_to_mongo, close_mongo_connection
+from database import connect_to_mongo, close_mongo_connection, get_database
+from db_utils.index_sync import sync_indexes
+from services.footprint_service import ensure_footprints_collection
+from services.projector import enable_inline_projection, run_projector, supports_change_streams
+from db_utils.monitoring import RequestDbStats, db_stats, pool_metrics, route_metrics
+from app.notifier import notification_writer
 
 # Import routers
 from routes import (
@@ -46,9 +53,36 @@ async def lifespan(app: FastAPI):
     # Startup
     print("🌍 Starting PlanetZero Backend...")
     await connect_to_mongo()
+    await ensure_footprints_collection(get_database())
+    
+    # Build missing indexes in the background; drift is only reported
+    index_sync = None
+    if os.getenv("INDEX_SYNC_ON_STARTUP", "True") == "True":
+        index_sync = asyncio.create_task(sync_indexes(get_database()))
+    
+    # Derive footprints, stats and calendars from daily_logs (services/projector.py)
+    projector = None
+    projector_mode = os.getenv("DAILY_LOG_PROJECTOR", "embedded")
+    if projector_mode != "inline" and not await supports_change_streams(get_database()):
+        print(
+            "⚠️  MongoDB is not a replica set, so daily_logs cannot be watched: projecting logs inline on "
+            "write (run python -m jobs.daily_log_projector --rebuild once to catch up)"
+        )
+        projector_mode = "inline"
+    if projector_mode == "inline":
+        enable_inline_projection()
+    elif projector_mode == "embedded":
+        projector = asyncio.create_task(run_projector(get_database()))
+    
     yield
     # Shutdown
     print("👋 Shutting down PlanetZero Backend...")
+    if index_sync is not None and not index_sync.done():
+        index_sync.cancel()
+    if projector is not None and not projector.done():
+        projector.cancel()
+    # Write notifications still queued by the batched writer (app/notifier.py)
+    await notification_writer.close()
     await close_mongo_connection()
 
 # Initialize FastAPI app
@@ -72,6 +106,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def database_timing(request: Request, call_next):
+    """
+    Attribute MongoDB commands to the request and report them in
+    Server-Timing headers and the per-route /metrics summaries
+    """
+    stats = RequestDbStats()
+    token = db_stats.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        db_stats.reset(token)
+    
+    response.headers["Server-Timing"] = stats.server_timing()
+    route = request.scope.get("route")
+    if route is not None:
+        route_metrics.observe(request.method, route.path, stats)
+    return response
+
 # Include routers with /api prefix
 app.include_router(auth.router, prefix="/api")
 app.include_router(consent.router, prefix="/api")
@@ -95,6 +148,7 @@ async def root():
         "docs": "/docs",
         "redoc": "/redoc",
         "health": "/health",
+        "metrics": "/metrics",
         "endpoints": {
             "authentication": "/api/auth",
             "consent": "/api/consent",
@@ -119,6 +173,13 @@ async def health_check():
         "version": "1.0.0"
     }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Prometheus metrics (MongoDB connection pool and per-route database usage)
+    """
+    return pool_metrics.render_prometheus() + route_metrics.render_prometheus()
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
@@ -469,13 +469,14 @@ class NotificationModel(BaseModel):
     """
     In-app notifications for user engagement.
     Type field allows for different notification categories/styles.
-    is_read enables unread badge counts.
+    read enables unread badge counts; read_at drives TTL expiry of read notifications.
     """
     id: Optional[PyObjectId] = Field(default=None, alias="_id")
     user_id: PyObjectId = Field(..., description="Reference to users collection")
     type: str = Field(..., description="e.g., 'achievement', 'reminder', 'social'")
     message: str = Field(..., max_length=200)
-    is_read: bool = Field(default=False)
+    read: bool = Field(default=False)
+    read_at: Optional[datetime] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
     class Config:
@@ -485,7 +486,7 @@ class NotificationModel(BaseModel):
                 "user_id": "507f1f77bcf86cd799439011",
                 "type": "achievement",
                 "message": "Congratulations! You've reduced your carbon footprint by 20% this week!",
-                "is_read": False,
+                "read": False,
                 "created_at": "2026-01-04T18:00:00Z"
             }
         }
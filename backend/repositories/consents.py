@@ -0,0 +1,14 @@
+"""
+Consent Data Access
+Reads consents as ConsentRecord
+"""
+from typing import Optional
+
+from database import CONSENTS_COLLECTION
+from repositories.records import ConsentRecord
+
+
+async def find_consent(db, user_id: str) -> Optional[ConsentRecord]:
+    """The user's consent, or None if they have not submitted one"""
+    doc = await db[CONSENTS_COLLECTION].find_one({"user_id": user_id}, ConsentRecord.PROJECTION)
+    return ConsentRecord.from_document(doc) if doc else None
@@ -0,0 +1,18 @@
+"""
+Daily Log Data Access
+Reads daily logs as DailyLogRecord with only the fields each route needs
+"""
+from typing import Dict, List, Optional
+
+from database import DAILY_LOGS_COLLECTION
+from repositories.records import DailyLogRecord
+
+
+async def find_history(db, user_id: str, date_filter: Optional[Dict], limit: int) -> List[DailyLogRecord]:
+    """A user's logs, newest first, optionally within a date range"""
+    query = {"user_id": user_id}
+    if date_filter:
+        query["date"] = date_filter
+
+    cursor = db[DAILY_LOGS_COLLECTION].find(query, DailyLogRecord.HISTORY_PROJECTION).sort("date", -1).limit(limit)
+    return [DailyLogRecord.from_document(doc) async for doc in cursor]
@@ -0,0 +1,197 @@
+"""
+Data Access Records
+Compact read-side records for the hot data paths
+
+Routes used to pass whole Motor documents around and build Pydantic
+responses that FastAPI then validated a second time. A record instead:
+- is loaded with only the fields its routes need (the PROJECTION constants)
+- keeps them in __slots__, so there is no per-instance __dict__
+- serializes straight to the JSON-ready dict of the route's response
+  model; routes return it in a JSONResponse, which FastAPI sends without
+  re-validating
+
+The Pydantic models in schemas/ still describe the responses in /docs.
+"""
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+def _json_value(value: Any) -> Any:
+    """datetime as ISO 8601, as Pydantic serializes it"""
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+class UserRecord:
+    """A user without credentials (schemas.UserResponse)"""
+    __slots__ = ("id", "email", "name", "age", "gender", "country", "city", "created_at", "is_active")
+
+    PROJECTION = {
+        "email": 1, "name": 1, "age": 1, "gender": 1, "country": 1, "city": 1, "created_at": 1, "is_active": 1
+    }
+    NAME_PROJECTION = {"name": 1}
+
+    def __init__(self, id: str, name: str, email: Optional[str] = None, age: Optional[int] = None,
+                 gender: Optional[str] = None, country: Optional[str] = None, city: Optional[str] = None,
+                 created_at: Optional[datetime] = None, is_active: bool = True):
+        self.id = id
+        self.email = email
+        self.name = name
+        self.age = age
+        self.gender = gender
+        self.country = country
+        self.city = city
+        self.created_at = created_at
+        self.is_active = is_active
+
+    @classmethod
+    def from_document(cls, doc: Dict) -> "UserRecord":
+        return cls(
+            id=str(doc["_id"]),
+            name=doc.get("name", "Unknown User"),
+            email=doc.get("email"),
+            age=doc.get("age"),
+            gender=doc.get("gender"),
+            country=doc.get("country"),
+            city=doc.get("city"),
+            created_at=doc.get("created_at"),
+            is_active=doc.get("is_active", True)
+        )
+
+    def to_response(self) -> Dict:
+        return {
+            "id": self.id,
+            "email": self.email,
+            "name": self.name,
+            "age": self.age,
+            "gender": self.gender,
+            "country": self.country,
+            "city": self.city,
+            "created_at": _json_value(self.created_at),
+            "is_active": self.is_active
+        }
+
+
+class DailyLogRecord:
+    """Emission totals of one daily log (schemas.HistoryEntry)"""
+    __slots__ = (
+        "id", "date", "total_emissions", "transport_emissions",
+        "electricity_emissions", "food_emissions", "lifestyle_emissions"
+    )
+
+    # Activity entries (transportation, food, lifestyle) are not needed for history
+    HISTORY_PROJECTION = {
+        "date": 1, "total_emissions": 1, "transport_emissions": 1,
+        "electricity_emissions": 1, "food_emissions": 1, "lifestyle_emissions": 1
+    }
+
+    def __init__(self, id: str, date: str, total_emissions: float, transport_emissions: float,
+                 electricity_emissions: float, food_emissions: float, lifestyle_emissions: float):
+        self.id = id
+        self.date = date
+        self.total_emissions = total_emissions
+        self.transport_emissions = transport_emissions
+        self.electricity_emissions = electricity_emissions
+        self.food_emissions = food_emissions
+        self.lifestyle_emissions = lifestyle_emissions
+
+    @classmethod
+    def from_document(cls, doc: Dict) -> "DailyLogRecord":
+        return cls(
+            id=str(doc["_id"]),
+            date=doc["date"],
+            total_emissions=doc.get("total_emissions", 0.0),
+            transport_emissions=doc.get("transport_emissions", 0.0),
+            electricity_emissions=doc.get("electricity_emissions", 0.0),
+            food_emissions=doc.get("food_emissions", 0.0),
+            lifestyle_emissions=doc.get("lifestyle_emissions", 0.0)
+        )
+
+    def to_history_entry(self) -> Dict:
+        return {
+            "date": self.date,
+            "total_emissions": self.total_emissions,
+            "transport_emissions": self.transport_emissions,
+            "electricity_emissions": self.electricity_emissions,
+            "food_emissions": self.food_emissions,
+            "lifestyle_emissions": self.lifestyle_emissions
+        }
+
+
+class FootprintRecord:
+    """One day of a user's chart data (carbon_footprints)"""
+    __slots__ = (
+        "date", "total_emissions", "transport_emissions", "energy_emissions",
+        "food_emissions", "water_emissions", "shopping_emissions", "created_at"
+    )
+
+    CHART_PROJECTION = {
+        "_id": 0, "date": 1, "total_emissions": 1, "transport_emissions": 1, "energy_emissions": 1,
+        "food_emissions": 1, "breakdown.water": 1, "breakdown.shopping": 1, "created_at": 1
+    }
+
+    def __init__(self, date: datetime, total_emissions: float, transport_emissions: float,
+                 energy_emissions: float, food_emissions: float, water_emissions: float,
+                 shopping_emissions: float, created_at: datetime):
+        self.date = date
+        self.total_emissions = total_emissions
+        self.transport_emissions = transport_emissions
+        self.energy_emissions = energy_emissions
+        self.food_emissions = food_emissions
+        self.water_emissions = water_emissions
+        self.shopping_emissions = shopping_emissions
+        self.created_at = created_at
+
+    @classmethod
+    def from_document(cls, doc: Dict) -> "FootprintRecord":
+        breakdown = doc.get("breakdown") or {}
+        return cls(
+            date=doc["date"],
+            total_emissions=doc.get("total_emissions", 0.0),
+            transport_emissions=doc.get("transport_emissions", 0.0),
+            energy_emissions=doc.get("energy_emissions", 0.0),
+            food_emissions=doc.get("food_emissions", 0.0),
+            water_emissions=breakdown.get("water", 0.0),
+            shopping_emissions=breakdown.get("shopping", 0.0),
+            created_at=doc.get("created_at", datetime.min)
+        )
+
+
+class ConsentRecord:
+    """A user's consent choices (schemas.ConsentResponse)"""
+    __slots__ = ("id", "user_id", "data_collection", "data_usage", "analytics", "consent_timestamp")
+
+    PROJECTION = {"user_id": 1, "data_collection": 1, "data_usage": 1, "analytics": 1, "consent_timestamp": 1}
+
+    def __init__(self, id: str, user_id: str, data_collection: bool, data_usage: bool,
+                 analytics: bool, consent_timestamp: Optional[datetime]):
+        self.id = id
+        self.user_id = user_id
+        self.data_collection = data_collection
+        self.data_usage = data_usage
+        self.analytics = analytics
+        self.consent_timestamp = consent_timestamp
+
+    @classmethod
+    def from_document(cls, doc: Dict) -> "ConsentRecord":
+        return cls(
+            id=str(doc["_id"]),
+            user_id=doc["user_id"],
+            data_collection=doc.get("data_collection", False),
+            data_usage=doc.get("data_usage", False),
+            analytics=doc.get("analytics", False),
+            consent_timestamp=doc.get("consent_timestamp")
+        )
+
+    @property
+    def allows_data_submission(self) -> bool:
+        return bool(self.data_collection and self.data_usage)
+
+    def to_response(self) -> Dict:
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "data_collection": self.data_collection,
+            "data_usage": self.data_usage,
+            "analytics": self.analytics,
+            "consent_timestamp": _json_value(self.consent_timestamp)
+        }
@@ -0,0 +1,25 @@
+"""
+User Data Access
+Reads users as UserRecord with only the fields each route needs
+"""
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+
+from database import USERS_COLLECTION
+from repositories.records import UserRecord
+
+
+async def find_user(db, user_id: ObjectId) -> Optional[UserRecord]:
+    """A user's profile fields, or None if the user does not exist"""
+    doc = await db[USERS_COLLECTION].find_one({"_id": user_id}, UserRecord.PROJECTION)
+    return UserRecord.from_document(doc) if doc else None
+
+
+async def find_user_names(db, user_ids: List[str]) -> Dict[str, str]:
+    """Display names by user id (leaderboards)"""
+    users = await db[USERS_COLLECTION].find(
+        {"_id": {"$in": [ObjectId(user_id) for user_id in user_ids]}},
+        UserRecord.NAME_PROJECTION
+    ).to_list(length=len(user_ids))
+    return {str(user["_id"]): user["name"] for user in users}
@@ -3,7 +3,9 @@ Consent Routes
 Handles user consent submission and retrieval
 """
 from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.responses import JSONResponse
 from database import get_database, CONSENTS_COLLECTION
+from repositories.consents import find_consent
 from schemas import ConsentRequest, ConsentResponse
 from routes.auth import get_current_user
 from datetime import datetime
@@ -62,7 +64,7 @@ async def get_consent(current_user=Depends(get_current_user)):
     db = get_database()
     user_id = str(current_user["_id"])
     
-    consent = await db[CONSENTS_COLLECTION].find_one({"user_id": user_id})
+    consent = await find_consent(db, user_id)
     
     if not consent:
         raise HTTPException(
@@ -70,14 +72,7 @@ async def get_consent(current_user=Depends(get_current_user)):
             detail="Consent not found. Please submit consent first."
         )
     
-    return ConsentResponse(
-        id=str(consent["_id"]),
-        user_id=user_id,
-        data_collection=consent["data_collection"],
-        data_usage=consent["data_usage"],
-        analytics=consent["analytics"],
-        consent_timestamp=consent["consent_timestamp"]
-    )
+    return JSONResponse(consent.to_response())
 
 async def check_user_consent(current_user = Depends(get_current_user)):
     """
@@ -88,7 +83,7 @@ async def check_user_consent(current_user = Depends(get_current_user)):
     db = get_database()
     user_id = str(current_user["_id"])
     
-    consent = await db[CONSENTS_COLLECTION].find_one({"user_id": user_id})
+    consent = await find_consent(db, user_id)
     
     if not consent:
         raise HTTPException(
@@ -96,7 +91,7 @@ async def check_user_consent(current_user = Depends(get_current_user)):
             detail="You must provide consent before submitting data"
         )
     
-    if not (consent.get("data_collection") and consent.get("data_usage")):
+    if not consent.allows_data_submission:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Data collection and usage consent required"
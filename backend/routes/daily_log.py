@@ -8,8 +8,8 @@ from schemas import DailyLogRequest, DailyLogResponse
 from routes.auth import get_current_user
 from routes.consent import check_user_consent
 from services.emission_service import calculate_total_emissions
+from services.projector import project_inline
 from datetime import datetime
-from bson import ObjectId
 
 router = APIRouter(prefix="/daily-log", tags=["Daily Log"])
 
@@ -24,7 +24,7 @@ async def create_daily_log(
     - Requires user consent
     - Calculates emissions for all categories
     - Stores detailed breakdown
-    - Creates/updates carbon footprint entry for charts
+    - Carbon footprint entry for charts is derived by the projector
     """
     print(f"🔍 Create daily log called")
     print(f"   User: {current_user.get('email') if current_user else 'None'}")
@@ -36,7 +36,6 @@ async def create_daily_log(
     
     db = get_database()
     user_id = str(current_user["_id"])
-    user_oid = ObjectId(user_id)
     
     # Check if log already exists for this date
     existing_log = await db[DAILY_LOGS_COLLECTION].find_one({
@@ -80,6 +79,7 @@ async def create_daily_log(
             {"_id": existing_log["_id"]},
             {"$set": log_doc}
         )
+        log_doc["_id"] = existing_log["_id"]
         log_id = str(existing_log["_id"])
     else:
         # Insert new log
@@ -87,42 +87,10 @@ async def create_daily_log(
         result = await db[DAILY_LOGS_COLLECTION].insert_one(log_doc)
         log_id = str(result.inserted_id)
     
-    # Parse date string to datetime for carbon_footprints
-    log_date = datetime.strptime(log_data.date, '%Y-%m-%d')
-    
-    # Create/update carbon footprint entry for charts
-    footprint_doc = {
-        "user_id": user_oid,
-        "date": log_date,
-        "daily_log_id": ObjectId(log_id),
-        "total_emissions": emissions_result["total_emissions"],
-        "transport_emissions": emissions_result["transport_emissions"],
-        "energy_emissions": emissions_result["electricity_emissions"],
-        "food_emissions": emissions_result["food_emissions"],
-        "breakdown": {
-            "transport": emissions_result["transport_emissions"],
-            "electricity": emissions_result["electricity_emissions"],
-            "food": emissions_result["food_emissions"],
-            "water": 0.0,  # Not tracked yet
-            "shopping": emissions_result["lifestyle_emissions"]
-        },
-        "comparison_to_average": -25.0,  # TODO: Calculate actual comparison
-        "created_at": datetime.utcnow()
-    }
-    
-    # Check if footprint exists for this date
-    existing_footprint = await db["carbon_footprints"].find_one({
-        "user_id": user_oid,
-        "date": log_date
-    })
-    
-    if existing_footprint:
-        await db["carbon_footprints"].update_one(
-            {"_id": existing_footprint["_id"]},
-            {"$set": footprint_doc}
-        )
-    else:
-        await db["carbon_footprints"].insert_one(footprint_doc)
+    # carbon_footprints, user_stats and the logging calendar are derived
+    # from daily_logs by the projector (services/projector.py), or right
+    # here when there is no change stream to follow
+    await project_inline(db, log_doc)
     
     return DailyLogResponse(
         id=log_id,
@@ -3,11 +3,16 @@ History Routes
 Provides date-wise emission history for the user
 """
 from fastapi import APIRouter, HTTPException, status, Depends, Query
-from database import get_database, DAILY_LOGS_COLLECTION
-from schemas import HistoryEntry, HistoryResponse
+from fastapi.responses import JSONResponse
+from database import get_database
+from db_utils.read_routing import ANALYTICS
+from repositories.daily_logs import find_history
+from schemas import HistoryResponse, CalendarResponse
 from routes.auth import get_current_user
+from services.calendar_service import get_calendar
 from typing import Optional
 from datetime import datetime, timedelta
+import base64
 
 router = APIRouter(prefix="/history", tags=["History"])
 
@@ -29,54 +34,64 @@ async def get_history(
     Returns:
         List of daily emission records sorted by date (newest first)
     """
-    db = get_database()
+    db = get_database(ANALYTICS)
     user_id = str(current_user["_id"])
     
-    # Build query
-    query = {"user_id": user_id}
+    # Build date filter if provided
+    date_filter = {}
+    
+    if start_date:
+        try:
+            datetime.strptime(start_date, '%Y-%m-%d')
+            date_filter["$gte"] = start_date
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid start_date format. Use YYYY-MM-DD"
+            )
+    
+    if end_date:
+        try:
+            datetime.strptime(end_date, '%Y-%m-%d')
+            date_filter["$lte"] = end_date
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid end_date format. Use YYYY-MM-DD"
+            )
     
-    # Add date filters if provided
-    if start_date or end_date:
-        date_filter = {}
-        
-        if start_date:
-            try:
-                datetime.strptime(start_date, '%Y-%m-%d')
-                date_filter["$gte"] = start_date
-            except ValueError:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Invalid start_date format. Use YYYY-MM-DD"
-                )
-        
-        if end_date:
-            try:
-                datetime.strptime(end_date, '%Y-%m-%d')
-                date_filter["$lte"] = end_date
-            except ValueError:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Invalid end_date format. Use YYYY-MM-DD"
-                )
-        
-        query["date"] = date_filter
+    # Fetch logs from database (emission totals only)
+    logs = await find_history(db, user_id, date_filter, limit)
     
-    # Fetch logs from database
-    logs = await db[DAILY_LOGS_COLLECTION].find(query).sort("date", -1).limit(limit).to_list(length=limit)
+    # Serialize records directly; shape matches HistoryResponse
+    return JSONResponse({
+        "entries": [log.to_history_entry() for log in logs],
+        "total_days": len(logs)
+    })
+
+@router.get("/calendar", response_model=CalendarResponse)
+async def get_history_calendar(
+    current_user=Depends(get_current_user),
+    year: Optional[int] = Query(None, ge=2000, le=2100, description="Calendar year (default: current year)")
+):
+    """
+    Get the logged-days calendar for a year
+    
+    Returns a bitmap of logged days, an intensity bucket per day for
+    heatmaps, and the user's current and longest logging streaks.
+    """
+    db = get_database()
+    user_id = str(current_user["_id"])
+    year = year or datetime.utcnow().year
     
-    # Convert to history entries
-    entries = []
-    for log in logs:
-        entries.append(HistoryEntry(
-            date=log["date"],
-            total_emissions=log.get("total_emissions", 0.0),
-            transport_emissions=log.get("transport_emissions", 0.0),
-            electricity_emissions=log.get("electricity_emissions", 0.0),
-            food_emissions=log.get("food_emissions", 0.0),
-            lifestyle_emissions=log.get("lifestyle_emissions", 0.0)
-        ))
+    calendar = await get_calendar(db, user_id, current_user["created_at"].date(), year)
     
-    return HistoryResponse(
-        entries=entries,
-        total_days=len(entries)
+    return CalendarResponse(
+        year=year,
+        start_date=f"{year}-01-01",
+        bitmap=base64.b64encode(calendar["bitmap"]).decode(),
+        levels=calendar["levels"],
+        logged_days=calendar["logged_days"],
+        current_streak=calendar["current_streak"],
+        longest_streak=calendar["longest_streak"]
     )
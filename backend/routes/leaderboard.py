@@ -3,9 +3,13 @@ Leaderboard Routes
 Provides ranking of users based on lowest carbon emissions
 """
 from fastapi import APIRouter, HTTPException, status, Depends, Query
-from database import get_database, DAILY_LOGS_COLLECTION, USERS_COLLECTION
-from schemas import LeaderboardEntry, LeaderboardResponse
+from fastapi.responses import JSONResponse
+from database import get_database, DAILY_LOGS_COLLECTION
+from db_utils.read_routing import ANALYTICS
+from repositories.users import find_user_names
+from schemas import LeaderboardResponse
 from routes.auth import get_current_user
+from services.stats_service import get_all_time_leaders, get_all_time_rank
 from datetime import datetime, timedelta
 
 router = APIRouter(prefix="/leaderboard", tags=["Leaderboard"])
@@ -26,7 +30,7 @@ async def get_leaderboard(
     Returns:
         Leaderboard with top users ranked by lowest average daily emissions
     """
-    db = get_database()
+    db = get_database(ANALYTICS)
     current_user_id = str(current_user["_id"])
     
     # Calculate date range based on period
@@ -78,18 +82,15 @@ async def get_leaderboard(
         }
     ])
     
-    # Execute aggregation
-    results = await db[DAILY_LOGS_COLLECTION].aggregate(pipeline).to_list(length=limit)
+    if start_date:
+        # Execute aggregation
+        results = await db[DAILY_LOGS_COLLECTION].aggregate(pipeline).to_list(length=limit)
+    else:
+        # All-time averages are maintained per user by the daily log projector
+        results = await get_all_time_leaders(db, limit)
     
     # Fetch user names
-    user_ids = [result["user_id"] for result in results]
-    from bson import ObjectId
-    users = await db[USERS_COLLECTION].find({
-        "_id": {"$in": [ObjectId(uid) for uid in user_ids]}
-    }).to_list(length=len(user_ids))
-    
-    # Create user name mapping
-    user_names = {str(user["_id"]): user["name"] for user in users}
+    user_names = await find_user_names(db, [result["user_id"] for result in results])
     
     # Build leaderboard entries
     entries = []
@@ -98,13 +99,12 @@ async def get_leaderboard(
     
     for idx, result in enumerate(results, start=1):
         user_id = result["user_id"]
-        entry = LeaderboardEntry(
-            rank=idx,
-            user_name=user_names.get(user_id, "Unknown User"),
-            total_emissions=round(result["total_emissions"], 3),
-            average_daily_emissions=round(result["average_daily_emissions"], 3)
-        )
-        entries.append(entry)
+        entries.append({
+            "rank": idx,
+            "user_name": user_names.get(user_id, "Unknown User"),
+            "total_emissions": round(result["total_emissions"], 3),
+            "average_daily_emissions": round(result["average_daily_emissions"], 3)
+        })
         
         # Track current user's rank
         if user_id == current_user_id:
@@ -112,7 +112,9 @@ async def get_leaderboard(
             user_emissions = round(result["average_daily_emissions"], 3)
     
     # If current user is not in top results, find their rank
-    if user_rank is None:
+    if user_rank is None and not start_date:
+        user_rank, user_emissions = await get_all_time_rank(db, current_user_id)
+    elif user_rank is None:
         # Count users with lower emissions than current user
         current_user_pipeline = [
             {
@@ -164,8 +166,9 @@ async def get_leaderboard(
             
             user_rank = count_result[0]["count"] + 1 if count_result else 1
     
-    return LeaderboardResponse(
-        entries=entries,
-        user_rank=user_rank,
-        user_emissions=user_emissions
-    )
+    # Shape matches LeaderboardResponse
+    return JSONResponse({
+        "entries": entries,
+        "user_rank": user_rank,
+        "user_emissions": user_emissions
+    })
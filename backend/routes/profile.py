@@ -3,9 +3,14 @@ Profile Routes
 Handles user profile retrieval and updates
 """
 from fastapi import APIRouter, HTTPException, status, Depends
-from database import get_database, USERS_COLLECTION, DAILY_LOGS_COLLECTION, CONSENTS_COLLECTION
+from fastapi.responses import JSONResponse
+from database import get_database, USERS_COLLECTION
+from repositories.consents import find_consent
+from repositories.records import UserRecord
+from repositories.users import find_user
 from schemas import ProfileResponse, ProfileUpdateRequest, UserResponse
 from routes.auth import get_current_user
+from services.stats_service import get_user_stats
 from datetime import datetime
 from bson import ObjectId
 
@@ -21,22 +26,22 @@ async def get_profile(current_user=Depends(get_current_user)):
         - Total logs count
         - Total emissions
         - Average daily emissions
+        - First log date
         - Consent status
     """
     db = get_database()
     user_id = str(current_user["_id"])
     
-    # Get user's logs
-    logs = await db[DAILY_LOGS_COLLECTION].find({"user_id": user_id}).to_list(length=1000)
+    # Get user's precomputed log statistics
+    stats = await get_user_stats(db, user_id)
     
     # Calculate statistics
-    total_logs = len(logs)
-    total_emissions = sum(log.get("total_emissions", 0) for log in logs)
+    total_logs = stats.get("total_logs", 0)
+    total_emissions = stats.get("total_emissions", 0.0)
     average_daily_emissions = total_emissions / total_logs if total_logs > 0 else 0.0
     
     # Check consent status
-    consent = await db[CONSENTS_COLLECTION].find_one({"user_id": user_id})
-    has_consent = consent is not None
+    has_consent = await find_consent(db, user_id) is not None
     
     # Check if onboarding is completed (has country and city at minimum)
     onboarding_completed = bool(
@@ -45,27 +50,19 @@ async def get_profile(current_user=Depends(get_current_user)):
     )
     
     # Build user response
-    user_response = UserResponse(
-        id=user_id,
-        email=current_user["email"],
-        name=current_user["name"],
-        age=current_user.get("age"),
-        gender=current_user.get("gender"),
-        country=current_user.get("country"),
-        city=current_user.get("city"),
-        created_at=current_user["created_at"],
-        is_active=current_user.get("is_active", True)
-    )
+    user = UserRecord.from_document(current_user).to_response()
     
-    return ProfileResponse(
-        user=user_response,
-        total_logs=total_logs,
-        total_emissions=round(total_emissions, 3),
-        average_daily_emissions=round(average_daily_emissions, 3),
-        member_since=current_user["created_at"],
-        has_consent=has_consent,
-        onboarding_completed=onboarding_completed
-    )
+    # Shape matches ProfileResponse
+    return JSONResponse({
+        "user": user,
+        "total_logs": total_logs,
+        "total_emissions": round(total_emissions, 3),
+        "average_daily_emissions": round(average_daily_emissions, 3),
+        "member_since": user["created_at"],
+        "first_log_date": stats.get("first_log_date"),
+        "has_consent": has_consent,
+        "onboarding_completed": onboarding_completed
+    })
 
 @router.put("", response_model=UserResponse)
 async def update_profile(
@@ -116,16 +113,6 @@ async def update_profile(
     )
     
     # Fetch updated user
-    updated_user = await db[USERS_COLLECTION].find_one({"_id": user_id})
+    updated_user = await find_user(db, user_id)
     
-    return UserResponse(
-        id=str(updated_user["_id"]),
-        email=updated_user["email"],
-        name=updated_user["name"],
-        age=updated_user.get("age"),
-        gender=updated_user.get("gender"),
-        country=updated_user.get("country"),
-        city=updated_user.get("city"),
-        created_at=updated_user["created_at"],
-        is_active=updated_user.get("is_active", True)
-    )
+    return JSONResponse(updated_user.to_response())
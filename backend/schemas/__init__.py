@@ -169,6 +169,16 @@ class HistoryResponse(BaseModel):
     entries: List[HistoryEntry]
     total_days: int
 
+class CalendarResponse(BaseModel):
+    """Schema for logging calendar (heatmap) response"""
+    year: int
+    start_date: str  # Jan 1 of the year; bit/index 0
+    bitmap: str  # Base64 bitset, bit i (byte i // 8, bit i % 8) set if start_date + i was logged
+    levels: List[int]  # Intensity bucket per day: 0 = not logged, 1 = low, 2 = medium, 3 = high
+    logged_days: int
+    current_streak: int
+    longest_streak: int
+
 # ============ Leaderboard Schemas ============
 
 class LeaderboardEntry(BaseModel):
@@ -221,5 +231,6 @@ class ProfileResponse(BaseModel):
     total_emissions: float
     average_daily_emissions: float
     member_since: datetime
+    first_log_date: Optional[str] = None  # Date of the user's first daily log (YYYY-MM-DD)
     has_consent: bool
     onboarding_completed: bool = False  # Whether user has completed onboarding
@@ -0,0 +1,256 @@
+"""
+Logging Calendar Service
+Keeps a compact per-user record of which days were logged
+
+Document shape (collection: log_calendars, _id = user id string):
+    start_date: first day covered (signup date, or an earlier backfilled log)
+    days:       BSON binary bitset, bit i set if start_date + i was logged
+                (byte i // 8, bit i % 8)
+    levels:     BSON binary, 2 bits per day with the intensity bucket
+                (0 = not logged, 1 = low, 2 = medium, 3 = high)
+
+Streaks are computed with integer bit operations on the bitset instead of
+scanning daily_logs.
+"""
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+from bson import Binary
+from pymongo import DeleteOne, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from database import LOG_CALENDARS_COLLECTION, DAILY_LOGS_COLLECTION
+
+MAX_RETRIES = 5
+
+# Daily total emissions (kg CO₂) upper bounds for intensity buckets 1 and 2
+LOW_INTENSITY_MAX = 5.0
+MEDIUM_INTENSITY_MAX = 15.0
+
+
+def intensity_bucket(total_emissions: float) -> int:
+    """Map a day's total emissions to an intensity bucket (1-3)"""
+    if total_emissions < LOW_INTENSITY_MAX:
+        return 1
+    if total_emissions < MEDIUM_INTENSITY_MAX:
+        return 2
+    return 3
+
+
+def _to_int(data: Optional[bytes]) -> int:
+    return int.from_bytes(data or b"", "little")
+
+
+def _to_bytes(value: int) -> bytes:
+    return value.to_bytes((value.bit_length() + 7) // 8, "little")
+
+
+def set_day(days: int, levels: int, index: int, level: int) -> Tuple[int, int]:
+    """Mark day `index` as logged with the given intensity level"""
+    days |= 1 << index
+    levels = (levels & ~(0b11 << (2 * index))) | (level << (2 * index))
+    return days, levels
+
+
+def run_ending_at(days: int, index: int) -> int:
+    """Number of consecutive set bits ending at (and including) bit `index`"""
+    if index < 0:
+        return 0
+    mask = (1 << (index + 1)) - 1
+    gaps = ~days & mask
+    if gaps == 0:
+        return index + 1
+    return index + 1 - gaps.bit_length()
+
+
+def longest_run(days: int) -> int:
+    """Length of the longest run of set bits"""
+    length = 0
+    while days:
+        days &= days << 1
+        length += 1
+    return length
+
+
+def current_streak(days: int, today_index: int) -> int:
+    """Streak ending today, or ending yesterday if today is not logged yet"""
+    if days >> today_index & 1:
+        return run_ending_at(days, today_index)
+    return run_ending_at(days, today_index - 1)
+
+
+def slice_bits(value: int, offset: int, count: int, width: int = 1) -> int:
+    """Extract `count` entries of `width` bits starting at entry `offset`"""
+    if offset >= 0:
+        value >>= offset * width
+    else:
+        value <<= -offset * width
+    return value & ((1 << (count * width)) - 1)
+
+
+async def record_log_day(db, user_id: str, signup_date: date, log_date: str, total_emissions: float) -> None:
+    """
+    Set the calendar bit and intensity for one logged day
+
+    Binary fields cannot be updated in place, so this is a read-modify-write
+    guarded by a version check. A user without a calendar gets it backfilled
+    from daily_logs first, so earlier days and streaks are kept.
+    """
+    day = date.fromisoformat(log_date)
+    level = intensity_bucket(total_emissions)
+
+    for _ in range(MAX_RETRIES):
+        current = await db[LOG_CALENDARS_COLLECTION].find_one({"_id": user_id})
+        if current is None:
+            current = await _rebuild_calendar(db, user_id, signup_date)
+        version = current.get("version", 0) if current else 0
+        start = date.fromisoformat(current["start_date"]) if current else min(signup_date, day)
+        days = _to_int(current.get("days")) if current else 0
+        levels = _to_int(current.get("levels")) if current else 0
+
+        # Rebase when a log predates the first covered day
+        if day < start:
+            shift = (start - day).days
+            days <<= shift
+            levels <<= 2 * shift
+            start = day
+
+        days, levels = set_day(days, levels, (day - start).days, level)
+
+        try:
+            result = await db[LOG_CALENDARS_COLLECTION].update_one(
+                {"_id": user_id, "version": version} if current else {"_id": user_id, "version": {"$exists": False}},
+                {
+                    "$set": {
+                        "start_date": start.isoformat(),
+                        "days": Binary(_to_bytes(days)),
+                        "levels": Binary(_to_bytes(levels)),
+                        "version": version + 1,
+                        "updated_at": datetime.utcnow()
+                    }
+                },
+                upsert=current is None
+            )
+        except DuplicateKeyError:
+            # Calendar was created concurrently
+            continue
+        if result.matched_count or result.upserted_id is not None:
+            return
+
+
+def _calendar_fields(logs: List[dict], signup_date: Optional[date]) -> Dict:
+    """start_date, days and levels of a calendar covering `logs`"""
+    start = min(
+        ([signup_date] if signup_date else []) + [date.fromisoformat(log["date"]) for log in logs]
+    )
+    days = levels = 0
+    for log in logs:
+        index = (date.fromisoformat(log["date"]) - start).days
+        days, levels = set_day(days, levels, index, intensity_bucket(log.get("total_emissions", 0.0)))
+    return {
+        "start_date": start.isoformat(),
+        "days": Binary(_to_bytes(days)),
+        "levels": Binary(_to_bytes(levels)),
+        "updated_at": datetime.utcnow()
+    }
+
+
+async def project_calendars(db, user_ids: List[str], signup_dates: Dict[str, date]) -> None:
+    """
+    Recompute the calendars of a batch of users from daily_logs
+
+    Called by the daily log projector for every user whose logs changed;
+    users left without logs lose their calendar. One query and one
+    bulk_write per batch, and idempotent like the other projections.
+    """
+    if not user_ids:
+        return
+
+    # app/ logs (carbon_footprint, no total_emissions) share the collection
+    logs = await db[DAILY_LOGS_COLLECTION].find(
+        {"user_id": {"$in": user_ids}, "total_emissions": {"$exists": True}},
+        {"user_id": 1, "date": 1, "total_emissions": 1, "_id": 0}
+    ).to_list(length=None)
+    by_user = defaultdict(list)
+    for log in logs:
+        by_user[log["user_id"]].append(log)
+
+    updates = []
+    for user_id in user_ids:
+        if not by_user.get(user_id):
+            updates.append(DeleteOne({"_id": user_id}))
+            continue
+        updates.append(UpdateOne(
+            {"_id": user_id},
+            # The version bump invalidates concurrent record_log_day reads
+            {"$set": _calendar_fields(by_user[user_id], signup_dates.get(user_id)), "$inc": {"version": 1}},
+            upsert=True
+        ))
+    await db[LOG_CALENDARS_COLLECTION].bulk_write(updates, ordered=False)
+
+
+async def _rebuild_calendar(db, user_id: str, signup_date: date) -> Optional[dict]:
+    """One-time backfill from daily_logs for users logged before calendars existed"""
+    # app/ logs (carbon_footprint, no total_emissions) share the collection
+    logs = await db[DAILY_LOGS_COLLECTION].find(
+        {"user_id": user_id, "total_emissions": {"$exists": True}},
+        {"date": 1, "total_emissions": 1, "_id": 0}
+    ).to_list(length=None)
+
+    if not logs:
+        return None
+
+    calendar = dict(_calendar_fields(logs, signup_date), version=1)
+    try:
+        await db[LOG_CALENDARS_COLLECTION].update_one(
+            {"_id": user_id, "version": {"$exists": False}},
+            {"$set": calendar},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        # A concurrent log write created the calendar first
+        return await db[LOG_CALENDARS_COLLECTION].find_one({"_id": user_id})
+    return calendar
+
+
+async def get_calendar(db, user_id: str, signup_date: date, year: int) -> Dict:
+    """
+    Get the logged-days bitmap and intensity buckets for one calendar year
+
+    Returns:
+        Dictionary with the year's bitmap (bytes, bit i = Jan 1 + i), levels
+        per day, logged day count, and current/longest streak overall
+    """
+    calendar = await db[LOG_CALENDARS_COLLECTION].find_one({"_id": user_id})
+    if calendar is None:
+        calendar = await _rebuild_calendar(db, user_id, signup_date)
+
+    year_start = date(year, 1, 1)
+    days_in_year = (date(year + 1, 1, 1) - year_start).days
+
+    if calendar is None:
+        return {
+            "bitmap": bytes((days_in_year + 7) // 8),
+            "levels": [0] * days_in_year,
+            "logged_days": 0,
+            "current_streak": 0,
+            "longest_streak": 0
+        }
+
+    start = date.fromisoformat(calendar["start_date"])
+    days = _to_int(calendar.get("days"))
+    levels = _to_int(calendar.get("levels"))
+
+    offset = (year_start - start).days
+    year_days = slice_bits(days, offset, days_in_year)
+    year_levels = slice_bits(levels, offset, days_in_year, width=2)
+    today_index = (datetime.utcnow().date() - start).days
+
+    return {
+        "bitmap": year_days.to_bytes((days_in_year + 7) // 8, "little"),
+        "levels": [(year_levels >> (2 * i)) & 0b11 for i in range(days_in_year)],
+        "logged_days": bin(year_days).count("1"),
+        "current_streak": current_streak(days, today_index),
+        "longest_streak": longest_run(days)
+    }
@@ -10,17 +10,19 @@ from typing import List, Dict, Any
 import base64
 from io import BytesIO
 
+from repositories.records import FootprintRecord
+
 
 class ChartService:
     """Service for generating carbon emission charts"""
     
     @staticmethod
-    def generate_monthly_trend_chart(daily_emissions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def generate_monthly_trend_chart(daily_emissions: List[FootprintRecord]) -> Dict[str, Any]:
         """
         Generate a line chart showing monthly emissions trend
         
         Args:
-            daily_emissions: List of carbon footprint documents
+            daily_emissions: Carbon footprint records
             
         Returns:
             Chart data in JSON format for frontend
@@ -42,19 +44,19 @@ class ChartService:
             }
         
         # Sort by date
-        sorted_emissions = sorted(daily_emissions, key=lambda x: x['date'])
+        sorted_emissions = sorted(daily_emissions, key=lambda x: x.date)
         
         # Extract dates and total emissions
         dates = []
         totals = []
         
         for emission in sorted_emissions:
-            date = emission['date']
+            date = emission.date
             if isinstance(date, datetime):
                 dates.append(date.strftime('%b %d'))
             else:
                 dates.append(str(date))
-            totals.append(round(emission.get('total_emissions', 0), 2))
+            totals.append(round(emission.total_emissions, 2))
         
         return {
             "type": "line",
@@ -104,12 +106,12 @@ class ChartService:
         }
     
     @staticmethod
-    def generate_category_breakdown_chart(daily_emissions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def generate_category_breakdown_chart(daily_emissions: List[FootprintRecord]) -> Dict[str, Any]:
         """
         Generate a pie/doughnut chart showing emissions by category
         
         Args:
-            daily_emissions: List of carbon footprint documents
+            daily_emissions: Carbon footprint records
             
         Returns:
             Chart data in JSON format for frontend
@@ -137,14 +139,11 @@ class ChartService:
         }
         
         for emission in daily_emissions:
-            category_totals["Transport"] += emission.get('transport_emissions', 0)
-            category_totals["Energy"] += emission.get('energy_emissions', 0)
-            category_totals["Food"] += emission.get('food_emissions', 0)
-            # Add water and shopping if they exist in the data
-            if 'breakdown' in emission:
-                breakdown = emission['breakdown']
-                category_totals["Water"] += breakdown.get('water', 0)
-                category_totals["Shopping"] += breakdown.get('shopping', 0)
+            category_totals["Transport"] += emission.transport_emissions
+            category_totals["Energy"] += emission.energy_emissions
+            category_totals["Food"] += emission.food_emissions
+            category_totals["Water"] += emission.water_emissions
+            category_totals["Shopping"] += emission.shopping_emissions
         
         # Filter out zero values and round
         labels = []
@@ -191,12 +190,12 @@ class ChartService:
         }
     
     @staticmethod
-    def generate_weekly_comparison_chart(daily_emissions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def generate_weekly_comparison_chart(daily_emissions: List[FootprintRecord]) -> Dict[str, Any]:
         """
         Generate a bar chart comparing emissions across days of the week
         
         Args:
-            daily_emissions: List of carbon footprint documents
+            daily_emissions: Carbon footprint records
             
         Returns:
             Chart data in JSON format for frontend
@@ -216,10 +215,10 @@ class ChartService:
         day_totals = {day: [] for day in days}
         
         for emission in daily_emissions:
-            date = emission['date']
+            date = emission.date
             if isinstance(date, datetime):
                 day_name = days[date.weekday()]
-                day_totals[day_name].append(emission.get('total_emissions', 0))
+                day_totals[day_name].append(emission.total_emissions)
         
         # Calculate averages
         labels = []
@@ -266,12 +265,12 @@ class ChartService:
         }
     
     @staticmethod
-    def generate_all_charts(daily_emissions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def generate_all_charts(daily_emissions: List[FootprintRecord]) -> Dict[str, Any]:
         """
         Generate all charts for the dashboard
         
         Args:
-            daily_emissions: List of carbon footprint documents
+            daily_emissions: Carbon footprint records
             
         Returns:
             Dictionary containing all chart data
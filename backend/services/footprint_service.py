@@ -0,0 +1,125 @@
+"""
+Carbon Footprint Service
+Stores and reads the per-day footprint entries used by the charts
+
+Document shape (collection: carbon_footprints):
+    {"user_id": ObjectId, "date": datetime (midnight UTC), "total_emissions": float,
+     "transport_emissions": ..., "breakdown": {...}, "daily_log_id": ObjectId, ...}
+
+Two storage modes, selected with CARBON_FOOTPRINTS_MODE:
+    document    (default) one regular document per user per day, upserted
+                on the unique (user_id, date) index
+    timeseries  native time-series collection with metaField user_id and
+                timeField date; MongoDB groups each user's days into
+                compressed buckets. Time-series collections have no unique
+                indexes and (before 7.0) no updates on measurements, so a
+                re-logged day is written as delete + insert and reads keep
+                the newest entry per day. Requires MongoDB 7.0+.
+
+Entries are derived from daily_logs by the projector (services/projector.py).
+
+Convert existing data with jobs/migrate_carbon_footprints_timeseries.
+"""
+from datetime import datetime
+from typing import Dict, List
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from database import CARBON_FOOTPRINTS_COLLECTION, CARBON_FOOTPRINTS_TIMESERIES
+from repositories.records import FootprintRecord
+
+TIMESERIES_OPTIONS = {
+    "timeField": "date",
+    "metaField": "user_id",
+    # One point per user per day: "hours" gives buckets spanning up to 30 days
+    "granularity": "hours",
+}
+
+
+async def ensure_footprints_collection(db) -> None:
+    """
+    Create carbon_footprints as a time-series collection in timeseries mode
+
+    Must run before anything writes to the collection, otherwise the first
+    insert creates a regular collection.
+    """
+    if not CARBON_FOOTPRINTS_TIMESERIES:
+        return
+    existing = await db.list_collections(filter={"name": CARBON_FOOTPRINTS_COLLECTION}).to_list(length=1)
+    if not existing:
+        await db.create_collection(CARBON_FOOTPRINTS_COLLECTION, timeseries=TIMESERIES_OPTIONS)
+    elif existing[0].get("type") != "timeseries":
+        print(
+            f"⚠️  CARBON_FOOTPRINTS_MODE=timeseries but '{CARBON_FOOTPRINTS_COLLECTION}' is a regular "
+            "collection; run jobs.migrate_carbon_footprints_timeseries"
+        )
+
+
+def footprint_from_log(log: Dict) -> Dict:
+    """Footprint entry for charts derived from a daily_logs document"""
+    return {
+        "user_id": ObjectId(log["user_id"]),
+        "date": datetime.strptime(log["date"], '%Y-%m-%d'),
+        "daily_log_id": log["_id"],
+        "total_emissions": log["total_emissions"],
+        "transport_emissions": log.get("transport_emissions", 0.0),
+        "energy_emissions": log.get("electricity_emissions", 0.0),
+        "food_emissions": log.get("food_emissions", 0.0),
+        "breakdown": {
+            "transport": log.get("transport_emissions", 0.0),
+            "electricity": log.get("electricity_emissions", 0.0),
+            "food": log.get("food_emissions", 0.0),
+            "water": 0.0,  # Not tracked yet
+            "shopping": log.get("lifestyle_emissions", 0.0)
+        },
+        "comparison_to_average": -25.0,  # TODO: Calculate actual comparison
+        "created_at": log.get("updated_at") or log.get("created_at") or datetime.utcnow()
+    }
+
+
+async def project_footprints(db, logs: List[Dict], deleted_log_ids: List[ObjectId]) -> None:
+    """
+    Write the footprint entries for a batch of changed daily logs
+
+    Each entry replaces any previous one for the same user and day; entries
+    of deleted logs are removed. Idempotent, so a replayed batch is harmless.
+    """
+    collection = db[CARBON_FOOTPRINTS_COLLECTION]
+    footprints = [footprint_from_log(log) for log in logs]
+
+    if deleted_log_ids:
+        await collection.delete_many({"daily_log_id": {"$in": deleted_log_ids}})
+    if not footprints:
+        return
+
+    if CARBON_FOOTPRINTS_TIMESERIES:
+        await collection.delete_many({
+            "$or": [{"user_id": doc["user_id"], "date": doc["date"]} for doc in footprints]
+        })
+        await collection.insert_many(footprints, ordered=False)
+    else:
+        await collection.bulk_write(
+            [
+                UpdateOne({"user_id": doc["user_id"], "date": doc["date"]}, {"$set": doc}, upsert=True)
+                for doc in footprints
+            ],
+            ordered=False
+        )
+
+
+async def find_footprints(db, user_id: ObjectId, start: datetime, end: datetime) -> List[FootprintRecord]:
+    """Footprint entries for a user within [start, end], oldest first, one per day"""
+    cursor = db[CARBON_FOOTPRINTS_COLLECTION].find(
+        {"user_id": user_id, "date": {"$gte": start, "$lte": end}},
+        FootprintRecord.CHART_PROJECTION
+    ).sort("date", 1)
+
+    # A concurrent re-log in timeseries mode can briefly leave two entries for a day
+    latest: Dict[datetime, FootprintRecord] = {}
+    async for doc in cursor:
+        footprint = FootprintRecord.from_document(doc)
+        current = latest.get(footprint.date)
+        if current is None or footprint.created_at >= current.created_at:
+            latest[footprint.date] = footprint
+    return list(latest.values())
@@ -0,0 +1,261 @@
+"""
+Daily Log Projector
+Derives carbon_footprints, user_stats and log_calendars from daily_logs
+by following a change stream, so the log write path only writes the log
+
+Changes are read in batches (up to BATCH_SIZE events, or whatever arrived
+within MAX_AWAIT_MS) and collapsed per log. For every batch:
+- footprint entries of inserted/updated logs are (re)written and those of
+  deleted logs removed (services/footprint_service.project_footprints)
+- stats of every affected user are recomputed from daily_logs
+  (services/stats_service.project_user_stats)
+- calendars of every affected user are recomputed from daily_logs
+  (services/calendar_service.project_calendars)
+
+Every step recomputes or overwrites, so replaying events is harmless: the
+resume token is stored in projector_state only after a batch is applied,
+and after a crash the batch is simply applied again (at-least-once).
+If the stored token has fallen off the oplog, or on the first run, the
+derived collections are rebuilt from daily_logs.
+
+Change streams require a replica set (a single-node replica set is fine).
+Runs embedded in the API (DAILY_LOG_PROJECTOR=embedded, see main.lifespan)
+or as its own process (python -m jobs.daily_log_projector). Without a
+replica set, or with DAILY_LOG_PROJECTOR=inline, the API projects each log
+inline as it is written instead (project_inline); run
+`python -m jobs.daily_log_projector --rebuild` once to cover logs written
+while nothing was projecting.
+"""
+import asyncio
+import os
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+from pymongo.errors import OperationFailure, PyMongoError
+
+from database import (
+    USERS_COLLECTION,
+    DAILY_LOGS_COLLECTION,
+    CARBON_FOOTPRINTS_COLLECTION,
+    PROJECTOR_STATE_COLLECTION
+)
+from services.calendar_service import project_calendars
+from services.footprint_service import project_footprints
+from services.stats_service import project_user_stats
+
+PROJECTOR_ID = "daily_logs"
+BATCH_SIZE = int(os.getenv("DAILY_LOG_PROJECTOR_BATCH_SIZE", "500"))
+MAX_AWAIT_MS = 1000
+RETRY_DELAY_SECONDS = 5
+
+# Resume token no longer in the oplog / token unusable
+RESUME_FAILED_CODES = (280, 286)
+# $changeStream on a standalone server
+NOT_REPLICA_SET_CODE = 40573
+
+# Set when the API projects logs on write instead of following the stream
+_inline = False
+
+
+def _is_projected(log: Optional[dict]) -> bool:
+    """Only logs written by routes/daily_log are projected; the app/ tree shares the collection"""
+    return log is not None and "total_emissions" in log
+
+
+async def _signup_dates(db, user_ids: List[str]) -> Dict[str, date]:
+    users = await db[USERS_COLLECTION].find(
+        {"_id": {"$in": [ObjectId(user_id) for user_id in user_ids]}},
+        {"created_at": 1}
+    ).to_list(length=None)
+    return _created_dates(users)
+
+
+def _created_dates(users: List[dict]) -> Dict[str, date]:
+    return {str(user["_id"]): user["created_at"].date() for user in users if user.get("created_at")}
+
+
+async def project_logs(db, logs: List[dict], deleted_log_ids: List[ObjectId]) -> None:
+    """Apply one batch of changed and deleted daily logs to the derived collections"""
+    # Deleted logs only carry their _id; their users are found through the footprints
+    deleted_users = set()
+    if deleted_log_ids:
+        footprints = await db[CARBON_FOOTPRINTS_COLLECTION].find(
+            {"daily_log_id": {"$in": deleted_log_ids}},
+            {"user_id": 1}
+        ).to_list(length=None)
+        deleted_users = {str(footprint["user_id"]) for footprint in footprints}
+
+    await project_footprints(db, logs, deleted_log_ids)
+
+    user_ids = sorted({log["user_id"] for log in logs} | deleted_users)
+    await project_user_stats(db, user_ids)
+    await project_calendars(db, user_ids, await _signup_dates(db, user_ids))
+
+
+async def supports_change_streams(db) -> bool:
+    """True on replica set members and mongos, where daily_logs can be watched"""
+    hello = await db.command("hello")
+    return "setName" in hello or hello.get("msg") == "isdbgrid"
+
+
+def enable_inline_projection() -> None:
+    """Make project_inline project every written log (no change stream is followed)"""
+    global _inline
+    _inline = True
+
+
+async def project_inline(db, log: dict) -> None:
+    """Project a log just written by routes/daily_log, if projecting inline"""
+    if _inline:
+        await project_logs(db, [log], [])
+
+
+async def project_changes(db, changes: List[dict]) -> None:
+    """Collapse change events per log (last one wins) and project them"""
+    latest: Dict[ObjectId, dict] = {}
+    for change in changes:
+        latest[change["documentKey"]["_id"]] = change
+
+    logs, deleted_log_ids = [], []
+    for log_id, change in latest.items():
+        # An update whose lookup found nothing was followed by a delete
+        document = change.get("fullDocument")
+        if change["operationType"] == "delete" or document is None:
+            deleted_log_ids.append(log_id)
+        elif _is_projected(document):
+            logs.append(document)
+
+    await project_logs(db, logs, deleted_log_ids)
+
+
+async def _save_resume_token(db, token) -> None:
+    await db[PROJECTOR_STATE_COLLECTION].update_one(
+        {"_id": PROJECTOR_ID},
+        {"$set": {"resume_token": token, "updated_at": datetime.utcnow()}},
+        upsert=True
+    )
+
+
+async def rebuild(db) -> Dict[str, int]:
+    """
+    Recompute every derived document from daily_logs
+
+    The change stream position is recorded before the rebuild starts, so
+    logs written meanwhile are projected again afterwards. On a standalone
+    server there is no stream position to record.
+    """
+    summary = {"logs": 0, "orphans": 0, "users": 0}
+    start_token = None
+    if await supports_change_streams(db):
+        async with db[DAILY_LOGS_COLLECTION].watch() as stream:
+            start_token = stream.resume_token
+
+    last_id = None
+    while True:
+        query = {"total_emissions": {"$exists": True}}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        logs = await db[DAILY_LOGS_COLLECTION].find(query).sort("_id", 1).limit(BATCH_SIZE).to_list(length=BATCH_SIZE)
+        if not logs:
+            break
+        last_id = logs[-1]["_id"]
+        await project_footprints(db, logs, [])
+        summary["logs"] += len(logs)
+
+    # Footprints whose log is gone
+    last_id = None
+    while True:
+        query = {"_id": {"$gt": last_id}} if last_id is not None else {}
+        footprints = await db[CARBON_FOOTPRINTS_COLLECTION].find(
+            query, {"daily_log_id": 1}
+        ).sort("_id", 1).limit(BATCH_SIZE).to_list(length=BATCH_SIZE)
+        if not footprints:
+            break
+        last_id = footprints[-1]["_id"]
+        log_ids = [footprint["daily_log_id"] for footprint in footprints]
+        existing = set(await db[DAILY_LOGS_COLLECTION].distinct("_id", {"_id": {"$in": log_ids}}))
+        orphans = [log_id for log_id in log_ids if log_id not in existing]
+        if orphans:
+            await db[CARBON_FOOTPRINTS_COLLECTION].delete_many({"daily_log_id": {"$in": orphans}})
+            summary["orphans"] += len(orphans)
+
+    last_id = None
+    while True:
+        query = {"_id": {"$gt": last_id}} if last_id is not None else {}
+        users = await db[USERS_COLLECTION].find(
+            query, {"created_at": 1}
+        ).sort("_id", 1).limit(BATCH_SIZE).to_list(length=BATCH_SIZE)
+        if not users:
+            break
+        last_id = users[-1]["_id"]
+        user_ids = [str(user["_id"]) for user in users]
+        await project_user_stats(db, user_ids)
+        await project_calendars(db, user_ids, _created_dates(users))
+        summary["users"] += len(users)
+
+    if start_token is not None:
+        await _save_resume_token(db, start_token)
+    print(
+        f"✅ Rebuilt projections: {summary['logs']} footprints, {summary['orphans']} orphaned footprints removed, "
+        f"{summary['users']} user stats and calendars"
+    )
+    return summary
+
+
+async def _follow(db) -> None:
+    """Apply change batches from the stored resume token until the stream ends"""
+    state = await db[PROJECTOR_STATE_COLLECTION].find_one({"_id": PROJECTOR_ID})
+    if state is None:
+        print("🔧 No projector state, rebuilding derived collections from daily_logs")
+        await rebuild(db)
+        state = await db[PROJECTOR_STATE_COLLECTION].find_one({"_id": PROJECTOR_ID})
+
+    saved_token = state["resume_token"]
+    async with db[DAILY_LOGS_COLLECTION].watch(
+        full_document="updateLookup",
+        resume_after=saved_token,
+        max_await_time_ms=MAX_AWAIT_MS,
+        batch_size=BATCH_SIZE
+    ) as stream:
+        while stream.alive:
+            changes = []
+            while len(changes) < BATCH_SIZE:
+                change = await stream.try_next()
+                if change is None:
+                    break
+                changes.append(change)
+
+            if changes:
+                await project_changes(db, changes)
+            # Also advances on an idle stream (postBatchResumeToken)
+            if stream.resume_token is not None and stream.resume_token != saved_token:
+                saved_token = stream.resume_token
+                await _save_resume_token(db, saved_token)
+
+
+async def run_projector(db) -> None:
+    """
+    Follow daily_logs until cancelled, retrying after transient errors
+
+    Raises RuntimeError on a standalone server, where there is no change
+    stream to follow.
+    """
+    print("🔁 Daily log projector started")
+    while True:
+        try:
+            await _follow(db)
+        except OperationFailure as e:
+            if e.code == NOT_REPLICA_SET_CODE:
+                raise RuntimeError(
+                    "Daily log projector needs a replica set (change streams); "
+                    "use DAILY_LOG_PROJECTOR=inline on a standalone server"
+                ) from e
+            if e.code in RESUME_FAILED_CODES:
+                print(f"⚠️  Projector resume token is no longer usable ({e}), rebuilding")
+                await db[PROJECTOR_STATE_COLLECTION].delete_one({"_id": PROJECTOR_ID})
+                continue
+            print(f"❌ Daily log projector failed: {e}")
+        except PyMongoError as e:
+            print(f"❌ Daily log projector failed: {e}")
+        await asyncio.sleep(RETRY_DELAY_SECONDS)
@@ -0,0 +1,160 @@
+"""
+User Statistics Service
+Maintains the per-user stats document used by the profile page
+
+Document shape (collection: user_stats, _id = user id string):
+    {"total_logs": int, "total_emissions": float, "first_log_date": "YYYY-MM-DD",
+     "average_daily_emissions": float}
+
+Stats are projected from daily_logs by the daily log projector
+(services/projector.py), so profile reads and the all-time leaderboard
+never have to scan daily_logs.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from database import USER_STATS_COLLECTION, DAILY_LOGS_COLLECTION
+
+
+async def project_user_stats(db, user_ids: List[str]) -> None:
+    """
+    Recompute stats for a batch of users from daily_logs and store them
+    
+    Called by the daily log projector for every user whose logs changed.
+    Recomputing (instead of applying deltas) keeps the projection
+    idempotent, so replaying change events after a crash is harmless.
+    """
+    if not user_ids:
+        return
+    
+    rows = await db[DAILY_LOGS_COLLECTION].aggregate([
+        # app/ logs (carbon_footprint, no total_emissions) share the collection
+        {"$match": {"user_id": {"$in": user_ids}, "total_emissions": {"$exists": True}}},
+        {
+            "$group": {
+                "_id": "$user_id",
+                "total_logs": {"$sum": 1},
+                "total_emissions": {"$sum": "$total_emissions"},
+                "first_log_date": {"$min": "$date"}
+            }
+        }
+    ]).to_list(length=None)
+    totals = {row["_id"]: row for row in rows}
+    
+    now = datetime.utcnow()
+    updates = []
+    for user_id in user_ids:
+        row = totals.get(user_id)
+        if row is None:
+            updates.append(UpdateOne(
+                {"_id": user_id},
+                {
+                    "$set": {"total_logs": 0, "total_emissions": 0.0, "first_log_date": None, "updated_at": now},
+                    "$unset": {"average_daily_emissions": ""}
+                },
+                upsert=True
+            ))
+        else:
+            updates.append(UpdateOne(
+                {"_id": user_id},
+                {"$set": {
+                    "total_logs": row["total_logs"],
+                    "total_emissions": row["total_emissions"],
+                    "average_daily_emissions": row["total_emissions"] / row["total_logs"],
+                    "first_log_date": row["first_log_date"],
+                    "updated_at": now
+                }},
+                upsert=True
+            ))
+    
+    await db[USER_STATS_COLLECTION].bulk_write(updates, ordered=False)
+
+
+async def rebuild_user_stats(db, user_id: str) -> Dict:
+    """
+    Recompute a user's stats from daily_logs and store them
+    
+    Used as a one-time backfill for users whose stats document predates
+    the counters.
+    """
+    result = await db[DAILY_LOGS_COLLECTION].aggregate([
+        {"$match": {"user_id": user_id, "total_emissions": {"$exists": True}}},
+        {
+            "$group": {
+                "_id": None,
+                "total_logs": {"$sum": 1},
+                "total_emissions": {"$sum": "$total_emissions"},
+                "first_log_date": {"$min": "$date"}
+            }
+        }
+    ]).to_list(length=1)
+    
+    stats = {
+        "total_logs": result[0]["total_logs"] if result else 0,
+        "total_emissions": result[0]["total_emissions"] if result else 0.0,
+        "first_log_date": result[0]["first_log_date"] if result else None,
+        "updated_at": datetime.utcnow()
+    }
+    if result:
+        stats["average_daily_emissions"] = stats["total_emissions"] / stats["total_logs"]
+    
+    await db[USER_STATS_COLLECTION].update_one(
+        {"_id": user_id},
+        {"$set": stats},
+        upsert=True
+    )
+    return stats
+
+
+async def get_user_stats(db, user_id: str) -> Dict:
+    """
+    Get the user's stats document, backfilling it on first access
+    
+    Returns:
+        Dictionary with total_logs, total_emissions and first_log_date
+    """
+    stats = await db[USER_STATS_COLLECTION].find_one({"_id": user_id})
+    if stats is None:
+        stats = await rebuild_user_stats(db, user_id)
+    return stats
+
+
+async def get_all_time_leaders(db, limit: int) -> List[Dict]:
+    """
+    Users with the lowest all-time average daily emissions
+    
+    Returns:
+        Rows shaped like the period leaderboard aggregation results
+    """
+    stats = await db[USER_STATS_COLLECTION].find(
+        {"average_daily_emissions": {"$exists": True}}
+    ).sort("average_daily_emissions", 1).limit(limit).to_list(length=limit)
+    
+    return [
+        {
+            "user_id": row["_id"],
+            "total_emissions": row["total_emissions"],
+            "log_count": row["total_logs"],
+            "average_daily_emissions": row["average_daily_emissions"]
+        }
+        for row in stats
+    ]
+
+
+async def get_all_time_rank(db, user_id: str) -> Tuple[Optional[int], Optional[float]]:
+    """
+    A user's all-time rank and average daily emissions
+    
+    Returns:
+        (rank, average) or (None, None) if the user has no logs
+    """
+    stats = await db[USER_STATS_COLLECTION].find_one({"_id": user_id})
+    if not stats or "average_daily_emissions" not in stats:
+        return None, None
+    
+    lower = await db[USER_STATS_COLLECTION].count_documents(
+        {"average_daily_emissions": {"$lt": stats["average_daily_emissions"]}}
+    )
+    return lower + 1, round(stats["average_daily_emissions"], 3)
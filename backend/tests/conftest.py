@@ -0,0 +1,43 @@
+"""
+Shared fixtures for the database tests
+
+The tests run against a real mongod and are skipped when none is
+reachable.
+
+Environment:
+    TEST_MONGODB_URL   mongod to test against (default: MONGODB_URL or
+                       mongodb://localhost:27017)
+"""
+import os
+
+import pytest
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+MONGODB_URL = os.getenv("TEST_MONGODB_URL", os.getenv("MONGODB_URL", "mongodb://localhost:27017"))
+
+
+def _hello(url: str) -> dict:
+    client = MongoClient(url, serverSelectionTimeoutMS=1000)
+    try:
+        return client.admin.command("hello")
+    finally:
+        client.close()
+
+
+@pytest.fixture(scope="session")
+def mongodb_url() -> str:
+    """URL of a reachable mongod, or skip"""
+    try:
+        _hello(MONGODB_URL)
+    except PyMongoError as e:
+        pytest.skip(f"no mongod at {MONGODB_URL}: {e}")
+    return MONGODB_URL
+
+
+@pytest.fixture(scope="session")
+def replica_set_url(mongodb_url: str) -> str:
+    """URL of a replica set (a single-node one is enough), or skip"""
+    if "setName" not in _hello(mongodb_url):
+        pytest.skip(f"{mongodb_url} is not a replica set member (change streams unavailable)")
+    return mongodb_url
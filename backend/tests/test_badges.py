@@ -0,0 +1,51 @@
+"""
+Badge progress deltas applied by app/badges.apply_event
+"""
+from app.badges import BADGE_RULES, BadgeEvent, apply_event
+
+
+def log(progress: dict, day: str, modes=()) -> dict:
+    return apply_event(progress, BadgeEvent.log_saved, {"date": day, "transport_modes": list(modes)})
+
+
+def test_log_saved_counts_days_and_public_transport():
+    progress = log({}, "2026-01-01", ["Bus", "Car (Gasoline)", "Train"])
+    assert progress == {
+        "logged_days": 1,
+        "public_transport_trips": 2,
+        "current_streak": 1,
+        "last_log_date": "2026-01-01",
+        "longest_streak": 1
+    }
+
+
+def test_streak_continues_resets_and_ignores_backfills():
+    progress = {}
+    for day in ("2026-01-01", "2026-01-02", "2026-01-03"):
+        progress = log(progress, day)
+    assert (progress["current_streak"], progress["longest_streak"]) == (3, 3)
+
+    progress = log(progress, "2026-01-06")
+    assert (progress["current_streak"], progress["longest_streak"]) == (1, 3)
+
+    backfilled = log(progress, "2026-01-05")
+    assert backfilled["logged_days"] == progress["logged_days"] + 1
+    assert (backfilled["current_streak"], backfilled["last_log_date"]) == (1, "2026-01-06")
+
+
+def test_counter_events_and_input_is_not_mutated():
+    progress = {"communities_joined": 2}
+    joined = apply_event(progress, BadgeEvent.community_joined, {})
+    assert progress == {"communities_joined": 2}
+    assert joined["communities_joined"] == 3
+    assert BADGE_RULES["Team Player"](joined)
+
+    assert apply_event({}, BadgeEvent.community_created, {})["communities_created"] == 1
+    assert apply_event({}, BadgeEvent.recommendation_completed, {})["recommendations_completed"] == 1
+
+
+def test_week_warrior_needs_seven_consecutive_days():
+    progress = {}
+    for day in range(1, 8):
+        progress = log(progress, f"2026-01-{day:02d}")
+        assert BADGE_RULES["Week Warrior"](progress) == (day == 7)
@@ -0,0 +1,81 @@
+"""
+Bit helpers behind log_calendars: day/level bitsets, streaks and slicing
+"""
+from datetime import date
+
+from services.calendar_service import (
+    _calendar_fields,
+    _to_bytes,
+    _to_int,
+    current_streak,
+    intensity_bucket,
+    longest_run,
+    run_ending_at,
+    set_day,
+    slice_bits
+)
+
+
+def bits(*indexes: int) -> int:
+    value = 0
+    for index in indexes:
+        value |= 1 << index
+    return value
+
+
+def test_intensity_buckets():
+    assert [intensity_bucket(total) for total in (0.0, 4.99, 5.0, 14.99, 15.0, 80.0)] == [1, 1, 2, 2, 3, 3]
+
+
+def test_set_day_marks_the_day_and_replaces_its_level():
+    days, levels = set_day(0, 0, 3, 2)
+    assert days == bits(3)
+    assert slice_bits(levels, 3, 1, width=2) == 2
+
+    days, levels = set_day(days, levels, 3, 1)
+    assert days == bits(3)
+    assert slice_bits(levels, 3, 1, width=2) == 1
+    assert levels >> 8 == 0
+
+
+def test_bytes_round_trip():
+    value = bits(0, 9, 70)
+    assert _to_int(_to_bytes(value)) == value
+    assert _to_bytes(0) == b""
+    assert _to_int(None) == 0
+
+
+def test_run_ending_at():
+    days = bits(0, 1, 2, 5, 6)
+    assert run_ending_at(days, 2) == 3
+    assert run_ending_at(days, 6) == 2
+    assert run_ending_at(days, 4) == 0
+    assert run_ending_at(days, -1) == 0
+
+
+def test_longest_run():
+    assert longest_run(0) == 0
+    assert longest_run(bits(0, 1, 2, 5, 6)) == 3
+    assert longest_run(bits(*range(10, 110))) == 100
+
+
+def test_current_streak_counts_from_yesterday_until_today_is_logged():
+    days = bits(3, 4, 5)
+    assert current_streak(days, 5) == 3
+    assert current_streak(days, 6) == 3
+    assert current_streak(days, 7) == 0
+
+
+def test_slice_bits_with_negative_offset_pads_with_zeros():
+    days = bits(0, 1)
+    assert slice_bits(days, -2, 4) == bits(2, 3)
+    assert slice_bits(days, 1, 4) == bits(0)
+
+
+def test_calendar_fields_start_at_the_earliest_of_signup_and_logs():
+    logs = [{"date": "2026-01-01", "total_emissions": 20.0}, {"date": "2026-01-04", "total_emissions": 1.0}]
+    fields = _calendar_fields(logs, date(2026, 1, 3))
+    assert fields["start_date"] == "2026-01-01"
+    assert _to_int(fields["days"]) == bits(0, 3)
+    levels = _to_int(fields["levels"])
+    assert (slice_bits(levels, 0, 1, width=2), slice_bits(levels, 3, 1, width=2)) == (3, 1)
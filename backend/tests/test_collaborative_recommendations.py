@@ -0,0 +1,45 @@
+"""
+Item-item scoring in jobs/collaborative_recommendations
+"""
+import numpy as np
+
+from jobs.collaborative_recommendations import AdoptionMatrix, item_similarity, most_adopted, top_k_for_user
+
+
+def build(rows) -> AdoptionMatrix:
+    matrix = AdoptionMatrix(["a", "b", "c", "d"])
+    for user_id, adopted in rows:
+        matrix.add_user(user_id, adopted)
+    return matrix
+
+
+def test_add_user_ignores_unknown_and_duplicate_items():
+    matrix = build([("u1", ["b", "a", "b", "zzz"])])
+    assert matrix.indices == [0, 1]
+    assert matrix.adoptions == 2
+
+
+def test_top_k_excludes_adopted_items_and_orders_by_score():
+    matrix = build([("u1", ["a", "b"]), ("u2", ["a", "b", "c"]), ("u3", ["a", "c"]), ("u4", ["d"])])
+    similarity = item_similarity(matrix)
+    assert np.all(np.diag(similarity) == 0)
+
+    ranked = top_k_for_user(similarity, np.array([0]), top_k=5)
+    assert [idx for idx, _ in ranked] == [1, 2]
+    assert ranked[0][1] > 0
+
+    assert top_k_for_user(similarity, np.array([0]), top_k=1) == ranked[:1]
+
+
+def test_top_k_without_adoptions_or_co_occurrence_is_empty():
+    matrix = build([("u1", ["a"]), ("u2", ["d"])])
+    similarity = item_similarity(matrix)
+    assert top_k_for_user(similarity, np.array([], dtype=np.int32), top_k=5) == []
+    assert top_k_for_user(similarity, np.array([3]), top_k=5) == []
+
+
+def test_most_adopted_orders_by_count_and_skips_unadopted_items():
+    matrix = build([("u1", ["c", "a"]), ("u2", ["c"]), ("u3", ["b", "c", "a"])])
+    assert most_adopted(matrix, top_k=5) == [(2, 3.0), (0, 2.0), (1, 1.0)]
+    assert most_adopted(matrix, top_k=1) == [(2, 3.0)]
+    assert most_adopted(build([]), top_k=5) == []
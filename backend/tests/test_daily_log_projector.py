@@ -0,0 +1,182 @@
+"""
+The daily log projector keeps carbon_footprints, user_stats and
+log_calendars in step with daily_logs: through a change stream on a
+replica set, and inline on write otherwise
+
+Start a single-node replica set for the change-stream tests:
+    mongod --replSet rs0 --dbpath /tmp/rs0 --fork --logpath /tmp/rs0.log
+    mongosh --eval 'rs.initiate()'
+"""
+import asyncio
+import time
+from datetime import date, datetime
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from database import (
+    USERS_COLLECTION,
+    DAILY_LOGS_COLLECTION,
+    CARBON_FOOTPRINTS_COLLECTION,
+    USER_STATS_COLLECTION,
+    LOG_CALENDARS_COLLECTION,
+    PROJECTOR_STATE_COLLECTION
+)
+from services import projector
+from services.footprint_service import ensure_footprints_collection
+
+TEST_DATABASE_NAME = "planetzero_projector_test"
+SIGNUP = datetime(2026, 1, 1)
+WAIT_SECONDS = 15
+
+
+def log_document(user_id: str, day: str, total: float) -> dict:
+    """Daily log shaped like the ones written by routes/daily_log"""
+    return {
+        "user_id": user_id,
+        "date": day,
+        "transport_emissions": total,
+        "electricity_emissions": 0.0,
+        "food_emissions": 0.0,
+        "lifestyle_emissions": 0.0,
+        "total_emissions": total,
+        "created_at": SIGNUP,
+        "updated_at": SIGNUP
+    }
+
+
+async def eventually(check) -> None:
+    """Wait until the async predicate holds"""
+    deadline = time.monotonic() + WAIT_SECONDS
+    while not await check():
+        assert time.monotonic() < deadline, "projection did not catch up"
+        await asyncio.sleep(0.1)
+
+
+def logged(calendar: dict, day: str) -> bool:
+    index = (date.fromisoformat(day) - date.fromisoformat(calendar["start_date"])).days
+    return bool(int.from_bytes(calendar["days"], "little") >> index & 1)
+
+
+async def setup(client: AsyncIOMotorClient):
+    await client.drop_database(TEST_DATABASE_NAME)
+    db = client[TEST_DATABASE_NAME]
+    await ensure_footprints_collection(db)
+    user_id = (await db[USERS_COLLECTION].insert_one({"name": "Test User", "created_at": SIGNUP})).inserted_id
+    return db, str(user_id)
+
+
+def run_with_database(url: str, scenario) -> None:
+    async def run():
+        client = AsyncIOMotorClient(url)
+        try:
+            db, user_id = await setup(client)
+            await scenario(db, user_id)
+        finally:
+            await client.drop_database(TEST_DATABASE_NAME)
+            client.close()
+
+    asyncio.run(run())
+
+
+def test_change_stream_projects_inserts_updates_and_deletes(replica_set_url):
+    async def scenario(db, user_id):
+        task = asyncio.create_task(projector.run_projector(db))
+        try:
+            await eventually(lambda: db[PROJECTOR_STATE_COLLECTION].find_one({"_id": projector.PROJECTOR_ID}))
+
+            log_id = (await db[DAILY_LOGS_COLLECTION].insert_one(log_document(user_id, "2026-01-10", 4.0))).inserted_id
+            await eventually(lambda: db[CARBON_FOOTPRINTS_COLLECTION].find_one({"daily_log_id": log_id}))
+            stats = await db[USER_STATS_COLLECTION].find_one({"_id": user_id})
+            assert (stats["total_logs"], stats["total_emissions"]) == (1, 4.0)
+            assert logged(await db[LOG_CALENDARS_COLLECTION].find_one({"_id": user_id}), "2026-01-10")
+
+            await db[DAILY_LOGS_COLLECTION].update_one({"_id": log_id}, {"$set": {"total_emissions": 9.0}})
+
+            async def updated():
+                footprint = await db[CARBON_FOOTPRINTS_COLLECTION].find_one({"daily_log_id": log_id})
+                return footprint is not None and footprint["total_emissions"] == 9.0
+            await eventually(updated)
+            stats = await db[USER_STATS_COLLECTION].find_one({"_id": user_id})
+            assert (stats["total_logs"], stats["total_emissions"], stats["average_daily_emissions"]) == (1, 9.0, 9.0)
+
+            await db[DAILY_LOGS_COLLECTION].delete_one({"_id": log_id})
+
+            async def deleted():
+                return await db[CARBON_FOOTPRINTS_COLLECTION].count_documents({"daily_log_id": log_id}) == 0
+            await eventually(deleted)
+            stats = await db[USER_STATS_COLLECTION].find_one({"_id": user_id})
+            assert stats["total_logs"] == 0
+            assert "average_daily_emissions" not in stats
+            assert await db[LOG_CALENDARS_COLLECTION].find_one({"_id": user_id}) is None
+        finally:
+            task.cancel()
+
+    run_with_database(replica_set_url, scenario)
+
+
+def test_restart_resumes_from_the_stored_token(replica_set_url, capsys):
+    async def scenario(db, user_id):
+        task = asyncio.create_task(projector.run_projector(db))
+        await eventually(lambda: db[PROJECTOR_STATE_COLLECTION].find_one({"_id": projector.PROJECTOR_ID}))
+        await db[DAILY_LOGS_COLLECTION].insert_one(log_document(user_id, "2026-01-10", 4.0))
+
+        async def projected():
+            calendar = await db[LOG_CALENDARS_COLLECTION].find_one({"_id": user_id})
+            return calendar is not None and logged(calendar, "2026-01-10")
+        await eventually(projected)
+        task.cancel()
+        capsys.readouterr()
+
+        # Written while the projector is down
+        second_id = (await db[DAILY_LOGS_COLLECTION].insert_one(log_document(user_id, "2026-01-11", 6.0))).inserted_id
+
+        task = asyncio.create_task(projector.run_projector(db))
+        try:
+            await eventually(lambda: db[CARBON_FOOTPRINTS_COLLECTION].find_one({"daily_log_id": second_id}))
+            stats = await db[USER_STATS_COLLECTION].find_one({"_id": user_id})
+            assert (stats["total_logs"], stats["total_emissions"]) == (2, 10.0)
+            assert logged(await db[LOG_CALENDARS_COLLECTION].find_one({"_id": user_id}), "2026-01-11")
+        finally:
+            task.cancel()
+        assert "Rebuilt projections" not in capsys.readouterr().out
+
+    run_with_database(replica_set_url, scenario)
+
+
+def test_missing_state_rebuilds_from_daily_logs(replica_set_url):
+    async def scenario(db, user_id):
+        # Logs written before the projector ever ran
+        await db[DAILY_LOGS_COLLECTION].insert_many([
+            log_document(user_id, "2026-01-10", 4.0),
+            log_document(user_id, "2026-01-11", 6.0)
+        ])
+        task = asyncio.create_task(projector.run_projector(db))
+        try:
+            async def rebuilt():
+                return await db[CARBON_FOOTPRINTS_COLLECTION].count_documents({}) == 2
+            await eventually(rebuilt)
+            await eventually(lambda: db[PROJECTOR_STATE_COLLECTION].find_one({"_id": projector.PROJECTOR_ID}))
+            stats = await db[USER_STATS_COLLECTION].find_one({"_id": user_id})
+            assert (stats["total_logs"], stats["total_emissions"]) == (2, 10.0)
+        finally:
+            task.cancel()
+
+    run_with_database(replica_set_url, scenario)
+
+
+def test_inline_projection_without_change_streams(mongodb_url, monkeypatch):
+    monkeypatch.setattr(projector, "_inline", False)
+    projector.enable_inline_projection()
+
+    async def scenario(db, user_id):
+        log = log_document(user_id, "2026-01-10", 4.0)
+        log["_id"] = (await db[DAILY_LOGS_COLLECTION].insert_one(log)).inserted_id
+        await projector.project_inline(db, log)
+
+        assert await db[CARBON_FOOTPRINTS_COLLECTION].find_one({"daily_log_id": log["_id"]})
+        stats = await db[USER_STATS_COLLECTION].find_one({"_id": user_id})
+        assert (stats["total_logs"], stats["total_emissions"]) == (1, 4.0)
+        assert logged(await db[LOG_CALENDARS_COLLECTION].find_one({"_id": user_id}), "2026-01-10")
+
+    run_with_database(mongodb_url, scenario)
@@ -0,0 +1,21 @@
+"""
+Every query shape in db_utils/index_advisor must be backed by a declared
+index: no COLLSCAN, no in-memory SORT and no high examined/returned ratio
+"""
+import asyncio
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from db_utils.index_advisor import check
+
+
+def test_query_shapes_are_index_backed(mongodb_url):
+    async def run():
+        client = AsyncIOMotorClient(mongodb_url)
+        try:
+            return await check(client)
+        finally:
+            client.close()
+
+    flagged = asyncio.run(run())
+    assert not flagged, "\n".join(f"{name}: {', '.join(reasons)}" for name, reasons in flagged)
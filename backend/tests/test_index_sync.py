@@ -0,0 +1,49 @@
+"""
+Declared vs live index comparison in db_utils/index_sync.differences
+"""
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+
+from db_utils.index_sync import differences
+
+
+def declared(keys, **options) -> dict:
+    return IndexModel(keys, name="idx", **options).document
+
+
+def test_matching_index_has_no_differences():
+    model = declared([("user_id", ASCENDING), ("date", DESCENDING)], unique=True)
+    existing = {"key": [("user_id", 1), ("date", -1.0)], "unique": True, "v": 2}
+    assert differences(model, existing) == []
+
+
+def test_key_and_option_changes_are_reported():
+    model = declared([("user_id", ASCENDING), ("date", DESCENDING)], unique=True)
+    existing = {"key": [("user_id", 1), ("date", 1)]}
+    assert differences(model, existing) == [
+        "keys [('user_id', 1), ('date', 1)] -> [('user_id', 1), ('date', -1)]",
+        "unique False -> True"
+    ]
+
+
+def test_ttl_and_partial_filter_changes_are_reported():
+    model = declared([("read_at", ASCENDING)], expireAfterSeconds=60, partialFilterExpression={"read": True})
+    existing = {"key": [("read_at", 1)], "expireAfterSeconds": 30, "partialFilterExpression": {"read": True}}
+    assert differences(model, existing) == ["expireAfterSeconds 30 -> 60"]
+
+
+def test_text_index_compares_weights_not_stored_keys():
+    model = declared([("name", TEXT), ("description", TEXT)])
+    existing = {"key": [("_fts", "text"), ("_ftsx", 1)], "weights": {"name": 1, "description": 1}}
+    assert differences(model, existing) == []
+
+    existing["weights"] = {"name": 1}
+    assert differences(model, existing) == ["weights {'name': 1} -> {'name': 1, 'description': 1}"]
+
+
+def test_collation_compares_declared_fields_only():
+    model = declared([("name", ASCENDING)], collation={"locale": "en", "strength": 2})
+    existing = {"key": [("name", 1)], "collation": {"locale": "en", "strength": 2, "caseLevel": False}}
+    assert differences(model, existing) == []
+
+    del existing["collation"]
+    assert differences(model, existing) == ["collation None -> {'locale': 'en', 'strength': 2}"]
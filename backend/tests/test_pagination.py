@@ -0,0 +1,43 @@
+"""
+Keyset pagination cursors in app/pagination
+"""
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from app.pagination import decode_cursor, encode_cursor, keyset_filter
+
+
+@pytest.mark.parametrize("value", [datetime(2026, 3, 1, 12, 30, 5, 123000), "2026-03-01", 42, 3.5, None])
+def test_cursor_round_trip(value):
+    object_id = ObjectId()
+    cursor = encode_cursor(value, object_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (value, object_id)
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", encode_cursor(1, ObjectId())[:-4], ""])
+def test_invalid_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+def test_keyset_filter_descending_and_ascending():
+    object_id = ObjectId()
+    cursor = encode_cursor("2026-03-01", object_id)
+
+    assert keyset_filter("date", cursor) == {
+        "$or": [
+            {"date": {"$lt": "2026-03-01"}},
+            {"date": "2026-03-01", "_id": {"$lt": object_id}}
+        ]
+    }
+    assert keyset_filter("date", cursor, descending=False) == {
+        "$or": [
+            {"date": {"$gt": "2026-03-01"}},
+            {"date": "2026-03-01", "_id": {"$gt": object_id}}
+        ]
+    }
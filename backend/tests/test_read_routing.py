@@ -0,0 +1,47 @@
+"""
+Analytics read profile built from the environment by db_utils/read_routing
+"""
+import pytest
+from pymongo.read_preferences import Primary, Secondary, SecondaryPreferred
+
+from db_utils.read_routing import ANALYTICS, MIN_MAX_STALENESS_SECONDS, read_profiles
+
+ENVIRONMENT = ("ANALYTICS_READ_PREFERENCE", "ANALYTICS_MAX_STALENESS_SECONDS", "ANALYTICS_READ_CONCERN")
+
+
+@pytest.fixture(autouse=True)
+def clean_environment(monkeypatch):
+    for name in ENVIRONMENT:
+        monkeypatch.delenv(name, raising=False)
+
+
+def test_defaults_to_secondary_preferred_local_with_minimum_staleness():
+    options = read_profiles()[ANALYTICS]
+    assert options["read_preference"] == SecondaryPreferred(max_staleness=MIN_MAX_STALENESS_SECONDS)
+    assert options["read_concern"].level == "local"
+
+
+def test_staleness_is_raised_to_the_driver_minimum(monkeypatch):
+    monkeypatch.setenv("ANALYTICS_READ_PREFERENCE", "secondary")
+    monkeypatch.setenv("ANALYTICS_MAX_STALENESS_SECONDS", "30")
+    assert read_profiles()[ANALYTICS]["read_preference"] == Secondary(max_staleness=MIN_MAX_STALENESS_SECONDS)
+
+
+@pytest.mark.parametrize("staleness", ["0", ""])
+def test_zero_or_empty_staleness_means_no_limit(monkeypatch, staleness):
+    monkeypatch.setenv("ANALYTICS_MAX_STALENESS_SECONDS", staleness)
+    assert read_profiles()[ANALYTICS]["read_preference"].max_staleness == -1
+
+
+def test_primary_ignores_staleness_and_read_concern_is_configurable(monkeypatch):
+    monkeypatch.setenv("ANALYTICS_READ_PREFERENCE", "primary")
+    monkeypatch.setenv("ANALYTICS_READ_CONCERN", "majority")
+    options = read_profiles()[ANALYTICS]
+    assert options["read_preference"] == Primary()
+    assert options["read_concern"].level == "majority"
+
+
+def test_unknown_read_preference_is_rejected(monkeypatch):
+    monkeypatch.setenv("ANALYTICS_READ_PREFERENCE", "fastest")
+    with pytest.raises(ValueError):
+        read_profiles()
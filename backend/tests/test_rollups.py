@@ -0,0 +1,23 @@
+"""
+Community rollup deltas built by app/rollups
+"""
+from app.rollups import _rollup_update, period_for_date
+
+
+def test_period_for_date_is_the_month():
+    assert period_for_date("2026-03-31") == "2026-03"
+
+
+def test_rollup_update_adds_deltas_and_recomputes_the_average():
+    update = _rollup_update("c1", "2026-03", -4.5, -1)
+    document = update._doc
+
+    assert update._filter == {"community_id": "c1", "period": "2026-03"}
+    assert update._upsert is True
+    added = document[0]["$set"]
+    assert added["total_emissions"] == {"$add": [{"$ifNull": ["$total_emissions", 0]}, -4.5]}
+    assert added["log_count"] == {"$add": [{"$ifNull": ["$log_count", 0]}, -1]}
+    # Second stage sees the new totals; an empty rollup drops its average
+    average = document[1]["$set"]["average_emissions"]["$cond"]
+    assert average[0] == {"$gt": ["$log_count", 0]}
+    assert average[2] == "$$REMOVE"